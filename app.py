@@ -1,11 +1,26 @@
 import streamlit as st
 import requests
-import pandas as pd
 from datetime import datetime, timedelta
 import json
-from io import BytesIO
-import base64
-import plotly.express as px
+import contextlib
+import functools
+import hashlib
+import importlib
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict, deque
+from operator import attrgetter
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib.parse import quote
+# pandas and plotly are imported on first use through lazy_import() so the login and
+# message pages don't pay for them after a server restart
 
 # Streamlit Page Config
 st.set_page_config(
@@ -15,8 +30,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for professional enterprise UI
-st.markdown("""
+# Custom CSS for professional enterprise UI (injected by main() once a user is logged in)
+APP_CSS = """
 <style>
     /* Sidebar Styling */
     [data-testid="stSidebar"] {
@@ -143,11 +158,52 @@ st.markdown("""
         padding: 12px 16px;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
 
 # API Base URL
 API_URL = "http://localhost:4000/api"
 
+# On-disk response cache for read-heavy collections (warm starts after a restart)
+DISK_CACHE_ENABLED = os.environ.get("TASKFLOW_DISK_CACHE", "1") != "0"
+DISK_CACHE_DIR = os.environ.get("TASKFLOW_CACHE_DIR", os.path.join('data', 'cache'))
+DISK_CACHE_MAX_BYTES = int(os.environ.get("TASKFLOW_CACHE_MAX_BYTES", 20 * 1024 * 1024))
+DISK_CACHE_VERSION = 1  # bump when the entry layout changes; older entries are ignored
+DISK_CACHED_ENDPOINTS = ("/users", "/tasks", "/dashboard/summary", "/dashboard/view")
+DISK_CACHE_SCAN_EVERY = 50  # puts between directory scans while the tracked size stays under the cap
+
+# In-memory copies of GET responses, revalidated with If-None-Match on every call
+RESPONSE_CACHE_MAX_ENTRIES = 256
+# response headers kept with a cached body, so a 304 or a stale answer can still report them
+KEPT_RESPONSE_HEADERS = ("X-Audit-Next-Before",)
+
+# Record sets parsed from list responses, shared by every session that got the same version
+RECORD_SETS_MAX_ENTRIES = 32
+
+# Backend resilience: GETs are retried with jittered backoff, repeated failures open a
+# circuit breaker, and each page render gets a time budget for its API calls. While the
+# circuit is open or the budget is spent, GETs are answered from the last good copy.
+API_TIMEOUT = (3.05, 10)         # connect, read (seconds)
+GET_RETRIES = 2                  # extra attempts for idempotent GETs
+RETRY_BACKOFF_BASE = 0.25        # seconds, doubled per attempt with full jitter
+RETRY_BACKOFF_MAX = 2.0
+RETRYABLE_STATUSES = (502, 503, 504)
+BREAKER_FAILURE_THRESHOLD = 3    # consecutive failed calls that open the circuit
+BREAKER_COOLDOWN = 15            # seconds the circuit stays open before one probe call
+PAGE_TIME_BUDGET = float(os.environ.get("TASKFLOW_PAGE_BUDGET", 8))
+
+# Local outbox: task status changes, messages and small file uploads are written here
+# first and replayed in order, so changes made while the backend is down are not lost
+OUTBOX_DIR = os.environ.get("TASKFLOW_OUTBOX_DIR", os.path.join('data', 'outbox'))
+OUTBOX_MAX_FILE_BYTES = 2 * 1024 * 1024  # larger uploads are sent directly, never queued
+OUTBOX_FLUSH_INTERVAL = 5                # seconds between automatic replay attempts
+
+# Request/page latency metrics kept in process (see the admin Performance page)
+METRICS_MAX_SAMPLES = 2000
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Built Plotly figures reused across reruns while their inputs are unchanged
+FIGURE_CACHE_MAX_ENTRIES = 128
+
 # Session State Initialization
 if 'token' not in st.session_state:
     st.session_state.token = None
@@ -157,21 +213,588 @@ if 'page' not in st.session_state:
     st.session_state.page = 'dashboard'
 
 # Helper Functions
+def _accept_encoding():
+    """Advertise brotli only when a decoder is installed; urllib3 decodes gzip natively"""
+    try:
+        import brotli  # noqa: F401
+        return "br, gzip"
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+            return "br, gzip"
+        except ImportError:
+            return "gzip"
+
+# Connection timing: urllib3 opens sockets in _new_conn, which resolves the host and connects in
+# one call (create_connection), so the pools below time both together as the "dns_connect" phase
+# and leave it for api_call in a thread-local. Resolving separately would look the name up twice.
+_request_phase = threading.local()
+
+class _TimedHTTPConnection(HTTPConnection):
+    def _new_conn(self):
+        start = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            _request_phase.dns_connect = time.perf_counter() - start
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def _new_conn(self):
+        start = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            _request_phase.dns_connect = time.perf_counter() - start
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools record how long opening a new connection (DNS lookup + connect) took"""
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+@st.cache_resource
+def http_session():
+    """Shared keep-alive session that negotiates compressed, compact responses"""
+    session = requests.Session()
+    adapter = TimedHTTPAdapter()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({
+        "Accept-Encoding": _accept_encoding(),
+        "X-Response-Mode": "compact",
+    })
+    return session
+
 def get_headers():
     return {"Authorization": f"Bearer {st.session_state.token}"} if st.session_state.token else {}
 
-def api_call(method, endpoint, data=None):
-    """Make API calls with proper error handling"""
+# Metrics
+class _Histogram:
+    """Cumulative latency histogram in Prometheus layout"""
+    __slots__ = ("buckets", "count", "total")
+
+    def __init__(self):
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+
+@st.cache_resource
+def _metrics():
+    """Process-wide metrics store: bounded raw samples plus per-label counters and histograms"""
+    return {
+        "lock": threading.Lock(),
+        "requests": deque(maxlen=METRICS_MAX_SAMPLES),
+        "pages": deque(maxlen=METRICS_MAX_SAMPLES),
+        "request_counts": {},      # (method, endpoint, status) -> count
+        "request_latency": {},     # (method, endpoint) -> _Histogram
+        "page_latency": {},        # page -> _Histogram
+        "imports": {},             # module -> seconds taken by its first import
+        "started": time.time(),
+    }
+
+def normalize_endpoint(endpoint):
+    """Collapse ids and query strings so metrics labels stay low-cardinality"""
+    path = endpoint.split('?', 1)[0]
+    return re.sub(r'/[A-Za-z0-9_-]{16,}(?=/|$)', '/:id', path)
+
+def record_request(method, endpoint, status, timings):
+    metrics = _metrics()
+    endpoint = normalize_endpoint(endpoint)
+    sample = dict(timings, method=method, endpoint=endpoint, status=str(status), at=time.time())
+    with metrics["lock"]:
+        metrics["requests"].append(sample)
+        key = (method, endpoint, str(status))
+        metrics["request_counts"][key] = metrics["request_counts"].get(key, 0) + 1
+        hist = metrics["request_latency"].setdefault((method, endpoint), _Histogram())
+        hist.observe(timings["total"])
+
+def record_page_render(page, seconds):
+    metrics = _metrics()
+    with metrics["lock"]:
+        metrics["pages"].append({"page": page, "seconds": seconds, "at": time.time()})
+        metrics["page_latency"].setdefault(page, _Histogram()).observe(seconds)
+
+def lazy_import(module_name):
+    """Import a heavy module on first use and record how long that first import took"""
+    module = sys.modules.get(module_name)
+    if module is None:
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        metrics = _metrics()
+        with metrics["lock"]:
+            metrics["imports"][module_name] = time.perf_counter() - start
+    return module
+
+def timed_page(page):
+    """Decorator recording how long a *_page function takes to render; the render also
+    gets PAGE_TIME_BUDGET seconds for its API calls"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                with page_budget():
+                    return fn(*args, **kwargs)
+            finally:
+                record_page_render(page, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+def _percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+def _prom_label_value(value):
+    """Escape a label value as the text exposition format requires: backslash, quote, newline"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _prom_labels(**labels):
+    return ",".join(f'{k}="{_prom_label_value(v)}"' for k, v in labels.items())
+
+def metrics_prometheus_text():
+    """Render counters and histograms in the Prometheus text exposition format"""
+    metrics = _metrics()
+    lines = []
+
+    def histogram(name, help_text, series):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for labels, hist in series:
+            for bound, count in zip(LATENCY_BUCKETS, hist.buckets):
+                lines.append(f'{name}_bucket{{{_prom_labels(**labels, le=bound)}}} {count}')
+            lines.append(f'{name}_bucket{{{_prom_labels(**labels, le="+Inf")}}} {hist.count}')
+            lines.append(f"{name}_sum{{{_prom_labels(**labels)}}} {hist.total:.6f}")
+            lines.append(f"{name}_count{{{_prom_labels(**labels)}}} {hist.count}")
+
+    with metrics["lock"]:
+        lines.append("# HELP taskflow_api_requests_total API calls made by the frontend")
+        lines.append("# TYPE taskflow_api_requests_total counter")
+        for (method, endpoint, status), count in sorted(metrics["request_counts"].items()):
+            lines.append(f"taskflow_api_requests_total{{{_prom_labels(method=method, endpoint=endpoint, status=status)}}} {count}")
+        histogram("taskflow_api_request_seconds", "End-to-end API call latency",
+                  [({"method": m, "endpoint": e}, h) for (m, e), h in sorted(metrics["request_latency"].items())])
+        histogram("taskflow_page_render_seconds", "Page render time",
+                  [({"page": p}, h) for p, h in sorted(metrics["page_latency"].items())])
+        lines.append("# HELP taskflow_import_seconds Time taken by the first import of a lazily loaded module")
+        lines.append("# TYPE taskflow_import_seconds gauge")
+        for module, seconds in sorted(metrics["imports"].items()):
+            lines.append(f"taskflow_import_seconds{{{_prom_labels(module=module)}}} {seconds:.6f}")
+    figures = _figure_cache()
+    with figures["lock"]:
+        lines.append("# HELP taskflow_figure_cache_total Chart figure cache lookups")
+        lines.append("# TYPE taskflow_figure_cache_total counter")
+        lines.append(f'taskflow_figure_cache_total{{result="hit"}} {figures["hits"]}')
+        lines.append(f'taskflow_figure_cache_total{{result="miss"}} {figures["misses"]}')
+    breaker = _breaker()
+    with breaker["lock"]:
+        lines.append("# HELP taskflow_circuit_open Whether the backend circuit breaker is open (1) or half open (0.5)")
+        lines.append("# TYPE taskflow_circuit_open gauge")
+        openness = {"closed": 0, "half_open": 0.5, "open": 1}[breaker["state"]]
+        lines.append(f"taskflow_circuit_open {openness}")
+        lines.append("# HELP taskflow_api_resilience_total GET retries, calls refused by the open circuit and stale answers served")
+        lines.append("# TYPE taskflow_api_resilience_total counter")
+        for event in ("retries", "short_circuited", "stale_served"):
+            lines.append(f'taskflow_api_resilience_total{{event="{event}"}} {breaker[event]}')
+    return "\n".join(lines) + "\n"
+
+@st.cache_resource
+def _response_cache():
+    """Process-wide LRU of (user id, endpoint) -> {etag, body, headers} holding already-parsed GET responses"""
+    return {"entries": OrderedDict(), "lock": threading.Lock()}
+
+def _response_cache_key(endpoint):
+    user = st.session_state.user or {}
+    return (user.get('id', ''), endpoint)
+
+def response_cache_get(endpoint):
+    cache = _response_cache()
+    key = _response_cache_key(endpoint)
+    with cache["lock"]:
+        entry = cache["entries"].get(key)
+        if entry is not None:
+            cache["entries"].move_to_end(key)
+        return entry
+
+def response_cache_put(endpoint, etag, body, headers=None):
+    if not etag:
+        return
+    cache = _response_cache()
+    key = _response_cache_key(endpoint)
+    with cache["lock"]:
+        cache["entries"][key] = {"etag": etag, "body": body, "headers": headers or {}}
+        cache["entries"].move_to_end(key)
+        while len(cache["entries"]) > RESPONSE_CACHE_MAX_ENTRIES:
+            cache["entries"].popitem(last=False)
+
+def _disk_cache_path(endpoint):
+    """Cache file for endpoint, scoped to the logged-in user so responses never leak across accounts"""
+    user = st.session_state.user or {}
+    key = hashlib.sha256(f"{user.get('id', '')}|{endpoint}".encode('utf-8')).hexdigest()
+    return os.path.join(DISK_CACHE_DIR, f"{key}.json")
+
+def disk_cache_get(endpoint):
+    """Return the cached {etag, body} entry for endpoint, or None when missing or stale-format"""
+    if not DISK_CACHE_ENABLED or endpoint not in DISK_CACHED_ENDPOINTS:
+        return None
+    path = _disk_cache_path(endpoint)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if entry.get('v') != DISK_CACHE_VERSION or not entry.get('etag'):
+        return None
+    try:
+        os.utime(path)  # mark as recently used for eviction
+    except OSError:
+        pass
+    return entry
+
+def disk_cache_put(endpoint, etag, body):
+    """Store a response body with its ETag, then evict least recently used entries over the size cap"""
+    if not DISK_CACHE_ENABLED or endpoint not in DISK_CACHED_ENDPOINTS or not etag:
+        return
+    path = _disk_cache_path(endpoint)
+    entry = {"v": DISK_CACHE_VERSION, "endpoint": endpoint, "etag": etag,
+             "storedAt": int(time.time() * 1000), "body": body}
+    try:
+        os.makedirs(DISK_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, separators=(',', ':'))
+        try:
+            replaced = os.path.getsize(path)
+        except OSError:
+            replaced = 0
+        os.replace(tmp_path, path)  # atomic, so concurrent sessions never read a half-written entry
+        _disk_cache_note_put(os.path.getsize(path) - replaced)
+    except OSError:
+        pass
+
+@st.cache_resource
+def _disk_cache_usage():
+    """Process-wide running size of the cache directory, so puts only scan it now and then"""
+    return {"lock": threading.Lock(), "bytes": None, "puts": 0}
+
+def _disk_cache_note_put(delta):
+    """Count a put; scan and evict when the tracked size crosses the cap, on the first put and
+    every DISK_CACHE_SCAN_EVERY puts (other processes write to the same directory)"""
+    usage = _disk_cache_usage()
+    with usage["lock"]:
+        usage["puts"] += 1
+        if usage["bytes"] is not None:
+            usage["bytes"] += delta
+        if usage["bytes"] is not None and usage["bytes"] <= DISK_CACHE_MAX_BYTES \
+                and usage["puts"] % DISK_CACHE_SCAN_EVERY:
+            return
+        usage["bytes"] = _disk_cache_evict()
+
+def disk_cache_forget_user():
+    """Remove the logged-in user's cache files, e.g. on logout"""
+    for endpoint in DISK_CACHED_ENDPOINTS:
+        path = _disk_cache_path(endpoint)
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            continue
+        usage = _disk_cache_usage()
+        with usage["lock"]:
+            if usage["bytes"] is not None:
+                usage["bytes"] -= size
+
+def _disk_cache_evict():
+    """Drop least recently used entries until the directory is under the cap; returns its size"""
+    entries = []
+    total = 0
+    for item in os.scandir(DISK_CACHE_DIR):
+        if item.is_file() and item.name.endswith('.json'):
+            stat = item.stat()
+            entries.append((stat.st_mtime, stat.st_size, item.path))
+            total += stat.st_size
+    for _, size, path in sorted(entries):
+        if total <= DISK_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+    return total
+
+# Typed Records
+# /tasks, /users and /audit lists are turned into __slots__ records once per response:
+# missing fields (compact responses drop nulls) get their defaults and the repeated
+# status/role/action strings are interned. Sessions that fetched the same version of a
+# list (same ETag) share one record set instead of each holding its own dicts.
+class TaskRecord:
+    __slots__ = ("id", "title", "description", "assigneeId", "status", "priority",
+                 "dueDate", "createdBy", "createdAt", "updatedAt")
+
+    def __init__(self, raw):
+        self.id = raw['id']
+        self.title = raw.get('title') or 'Untitled'
+        self.description = raw.get('description') or ''
+        self.assigneeId = raw.get('assigneeId')
+        self.status = sys.intern(raw.get('status') or 'TODO')
+        self.priority = raw.get('priority') or 3
+        self.dueDate = raw.get('dueDate')
+        self.createdBy = raw.get('createdBy')
+        self.createdAt = raw.get('createdAt') or 0
+        self.updatedAt = raw.get('updatedAt') or self.createdAt
+
+class UserRecord:
+    __slots__ = ("id", "email", "fullName", "role", "createdAt")
+
+    def __init__(self, raw):
+        self.id = raw['id']
+        self.email = raw.get('email') or ''
+        self.fullName = raw.get('fullName') or ''
+        self.role = sys.intern(raw.get('role') or 'EMPLOYEE')
+        self.createdAt = raw.get('createdAt') or 0
+
+class AuditRecord:
+    __slots__ = ("id", "action", "by", "target", "at")
+
+    def __init__(self, raw):
+        self.id = raw.get('id')
+        self.action = sys.intern(raw.get('action') or '')
+        self.by = raw.get('by')
+        self.target = raw.get('target')
+        self.at = raw.get('at') or 0
+
+@st.cache_resource
+def _record_sets():
+    """Process-wide LRU of (endpoint, ETag, record class) -> record list"""
+    return {"entries": OrderedDict(), "lock": threading.Lock()}
+
+def to_records(items, record_cls, endpoint=None, etag=None):
+    """Records for a parsed list body (the caches keep bodies as parsed JSON); with an ETag the
+    list is built once per (endpoint, ETag, record class) and shared"""
+    if not isinstance(items, list):
+        return items
+    if not etag:
+        return [record_cls(item) for item in items]
+    store = _record_sets()
+    key = (endpoint, etag, record_cls)
+    with store["lock"]:
+        records = store["entries"].get(key)
+        if records is not None:
+            store["entries"].move_to_end(key)
+            return records
+    records = [record_cls(item) for item in items]
+    with store["lock"]:
+        store["entries"][key] = records
+        while len(store["entries"]) > RECORD_SETS_MAX_ENTRIES:
+            store["entries"].popitem(last=False)
+    return records
+
+# Backend Resilience
+@st.cache_resource
+def _breaker():
+    """Process-wide circuit breaker; every session talks to the same backend"""
+    return {"lock": threading.Lock(), "state": "closed", "failures": 0, "opened_at": 0.0,
+            "probing": False, "retries": 0, "short_circuited": 0, "stale_served": 0}
+
+def breaker_allow():
+    """Whether a call may go to the backend. Once the cooldown has passed an open circuit
+    lets a single probe through; its outcome closes or re-opens it."""
+    breaker = _breaker()
+    with breaker["lock"]:
+        if breaker["state"] == "closed":
+            return True
+        if breaker["state"] == "open" and time.time() - breaker["opened_at"] >= BREAKER_COOLDOWN:
+            breaker["state"] = "half_open"
+        if breaker["state"] == "half_open" and not breaker["probing"]:
+            breaker["probing"] = True
+            return True
+        breaker["short_circuited"] += 1
+        return False
+
+def breaker_record(ok):
+    """Count a call that reached (ok) or failed to reach the backend"""
+    breaker = _breaker()
+    with breaker["lock"]:
+        breaker["probing"] = False
+        if ok:
+            breaker["state"], breaker["failures"] = "closed", 0
+            return
+        breaker["failures"] += 1
+        if breaker["state"] == "half_open" or breaker["failures"] >= BREAKER_FAILURE_THRESHOLD:
+            breaker["state"], breaker["opened_at"] = "open", time.time()
+
+def breaker_succeeded(status):
+    """The one rule for calls the backend answered: 2xx and 304 succeed, 4xx too (the backend
+    is up, it just refused the request) unless it answers the half-open probe, which has to
+    show the backend serves again before the circuit closes. Anything else is a failure."""
+    if 200 <= status < 300 or status == 304:
+        return True
+    if 400 <= status < 500:
+        # only the probe gets through while the circuit is half open
+        return _breaker()["state"] != "half_open"
+    return False
+
+def _breaker_count(field):
+    breaker = _breaker()
+    with breaker["lock"]:
+        breaker[field] += 1
+
+# Page runs execute on the script thread, so the budget and the notices already shown
+# live in a thread-local that timed_page sets up and clears
+_page_run = threading.local()
+
+def begin_page_budget():
+    """Start the API time budget for a page render; False when one is already running"""
+    if getattr(_page_run, "deadline", None) is not None:
+        return False
+    _page_run.deadline = time.perf_counter() + PAGE_TIME_BUDGET
+    _page_run.notices = set()
+    return True
+
+def end_page_budget():
+    _page_run.deadline = None
+    _page_run.notices = None
+
+@contextlib.contextmanager
+def page_budget():
+    """The API time budget for what runs inside: a page, or a fragment / sidebar section
+    rerun on its own. Inside a page render the page's budget keeps applying."""
+    owns_budget = begin_page_budget()
+    try:
+        yield
+    finally:
+        if owns_budget:
+            end_page_budget()
+
+def _budget_left():
+    deadline = getattr(_page_run, "deadline", None)
+    return None if deadline is None else deadline - time.perf_counter()
+
+def _budget_timeout():
+    """API_TIMEOUT, cut to half of what is left of the budget so a hung backend still leaves
+    time for retries (a read timeout bounds the gap between bytes, not a large response's
+    total download)"""
+    left = _budget_left()
+    return API_TIMEOUT if left is None else tuple(max(0.5, min(t, left / 2)) for t in API_TIMEOUT)
+
+def _notify_once(kind, text):
+    """st.error / st.warning, shown once per page render however many calls hit it"""
+    notices = getattr(_page_run, "notices", None)
+    if notices is not None:
+        if (kind, text) in notices:
+            return
+        notices.add((kind, text))
+    getattr(st, kind)(text)
+
+def _serve_stale(cached, message, records=None, headers=None, endpoint=None):
+    """Answer a GET from the last good copy when the backend can't be asked"""
+    if not cached:
+        _notify_once("error", message)
+        return None
+    if headers is not None:
+        headers.update(cached.get('headers', {}))
+    _breaker_count("stale_served")
+    _notify_once("warning", "The backend is slow or unavailable; showing the last data received.")
+    return to_records(cached['body'], records, endpoint, cached['etag']) if records else cached['body']
+
+def api_call(method, endpoint, data=None, records=None, headers=None):
+    """Make API calls with proper error handling.
+
+    GETs are retried with jittered backoff on connection errors, timeouts and 502-504
+    while the page's time budget lasts. When the circuit breaker is open, the budget is
+    spent or the retries run out, they return the last good cached copy if there is one.
+    Other methods are never retried. GET results may be shared with other reruns and
+    sessions through the response cache, so callers must treat them as read-only.
+    With records (a record class), a list body is returned as records of that class.
+    With headers (a dict), a GET fills it with the KEPT_RESPONSE_HEADERS the answer carried.
+    """
+    cached = None
+    if method == "GET":
+        cached = response_cache_get(endpoint) or disk_cache_get(endpoint)
+    retries = GET_RETRIES if method == "GET" else 0
+    attempt = 0
+    while True:
+        left = _budget_left()
+        if method == "GET" and left is not None and left <= 0:
+            return _serve_stale(cached, "Page took too long waiting for the backend; try again shortly", records,
+                                headers, endpoint)
+        if not breaker_allow():
+            record_request(method, endpoint, "circuit_open", {"dns_connect": 0.0, "ttfb": 0.0, "download": 0.0,
+                                                                  "parse": 0.0, "total": 0.0})
+            if method == "GET":
+                return _serve_stale(cached, "Backend is not responding; retrying automatically in a few seconds",
+                                    records, headers, endpoint)
+            _notify_once("error", "Backend is not responding; try again in a few seconds")
+            return None
+        outcome, result = _api_attempt(method, endpoint, data, cached, _budget_timeout(), records, headers)
+        if outcome != "retry" or attempt >= retries:
+            break
+        attempt += 1
+        _breaker_count("retries")
+        delay = random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** attempt))
+        left = _budget_left()
+        time.sleep(delay if left is None else max(0.0, min(delay, left)))
+
+    if outcome == "ok":
+        return result
+    if outcome == "retry" and method == "GET":
+        return _serve_stale(cached, result, records, headers, endpoint)
+    _notify_once("error", result)
+    return None
+
+def _api_attempt(method, endpoint, data, cached, timeout, records=None, kept=None):
+    """One HTTP round trip. Returns ("ok", body), ("retry", message) for failures worth
+    retrying (and counted by the circuit breaker) or ("error", message)."""
     url = f"{API_URL}{endpoint}"
+    headers = get_headers()
+    timings = {"dns_connect": 0.0, "ttfb": 0.0, "download": 0.0, "parse": 0.0, "total": 0.0}
+    status = "error"
+    _request_phase.dns_connect = 0.0
+    start = time.perf_counter()
     try:
         if method == "GET":
-            response = requests.get(url, headers=get_headers(), timeout=10)
+            if cached:
+                headers["If-None-Match"] = cached['etag']
+            response = http_session().get(url, headers=headers, timeout=timeout)
         elif method == "POST":
-            response = requests.post(url, json=data, headers=get_headers(), timeout=10)
+            response = http_session().post(url, json=data, headers=headers, timeout=timeout)
         elif method == "PATCH":
-            response = requests.patch(url, json=data, headers=get_headers(), timeout=10)
+            response = http_session().patch(url, json=data, headers=headers, timeout=timeout)
         elif method == "DELETE":
-            response = requests.delete(url, headers=get_headers(), timeout=10)
+            response = http_session().delete(url, headers=headers, timeout=timeout)
+        status = response.status_code
+        timings["dns_connect"] = _request_phase.dns_connect
+        timings["ttfb"] = response.elapsed.total_seconds()
+        timings["download"] = max(0.0, time.perf_counter() - start - timings["ttfb"])
+        breaker_record(breaker_succeeded(status))
+        if status in RETRYABLE_STATUSES:
+            return "retry", f"API Error: backend answered {status}"
+
+        # Not Modified: the cached copy is still current, reuse it without parsing
+        if response.status_code == 304 and cached:
+            response_cache_put(endpoint, cached['etag'], cached['body'], cached.get('headers'))
+            body = to_records(cached['body'], records, endpoint, cached['etag']) if records else cached['body']
+            if kept is not None:
+                kept.update(cached.get('headers', {}))
+            return "ok", body
 
         # If backend returns a client/server error with JSON body, raise so callers see it
         if 400 <= response.status_code < 600:
@@ -180,24 +803,327 @@ def api_call(method, endpoint, data=None):
 
         # No Content
         if response.status_code == 204:
-            return None
+            return "ok", None
 
         # Try parsing JSON, fall back to plain text when response isn't JSON
+        parse_start = time.perf_counter()
         try:
-            return response.json()
+            body = response.json()
         except ValueError:
             text = response.text
-            return text if text else None
+            return "ok", text if text else None
+        finally:
+            timings["parse"] = time.perf_counter() - parse_start
+        if method == "GET":
+            etag = response.headers.get('ETag')
+            disk_cache_put(endpoint, etag, body)
+            # the caches keep the parsed JSON; each caller gets records of its own class from
+            # the (endpoint, ETag) records memo
+            found = {name: response.headers[name] for name in KEPT_RESPONSE_HEADERS if name in response.headers}
+            response_cache_put(endpoint, etag, body, found)
+            if records:
+                body = to_records(body, records, endpoint, etag)
+            if kept is not None:
+                kept.update(found)
+        return "ok", body
     except requests.exceptions.ConnectionError:
-        st.error("Cannot connect to backend. Make sure the server is running on http://localhost:4000")
-        return None
+        status = "connection_error"
+        breaker_record(False)
+        return "retry", "Cannot connect to backend. Make sure the server is running on http://localhost:4000"
     except requests.exceptions.Timeout:
-        st.error("API request timed out (check backend status)")
-        return None
+        status = "timeout"
+        breaker_record(False)
+        return "retry", "API request timed out (check backend status)"
+    except requests.exceptions.HTTPError as e:
+        return "error", f"API Error: {str(e)[:120]}"
+    except requests.exceptions.RequestException as e:
+        # the response broke off before it was complete
+        breaker_record(False)
+        return "retry", f"API Error: {str(e)[:120]}"
     except Exception as e:
-        # Show a brief error to the user but log full exception to console for debugging
-        st.error(f"API Error: {str(e)[:120]}")
-        return None
+        # api_call shows the user a brief error
+        if status == "error":
+            breaker_record(True)  # never leave a half-open probe marked as running
+        return "error", f"API Error: {str(e)[:120]}"
+    finally:
+        timings["total"] = time.perf_counter() - start
+        record_request(method, endpoint, status, timings)
+
+# Local Outbox
+# One JSON file per user holds queued mutations ({key, method, endpoint, data, label}) and
+# the ones the backend refused on replay. Every mutation is queued before it is sent and
+# carries its key as Idempotency-Key, so a replay after a lost response is answered from
+# the backend's record instead of being applied twice.
+@st.cache_resource
+def _outboxes():
+    """Per-outbox-file locks (sessions of one user share a file) and last flush times"""
+    return {"lock": threading.Lock(), "locks": {}, "last_flush": {}}
+
+def _outbox_lock(path):
+    outboxes = _outboxes()
+    with outboxes["lock"]:
+        return outboxes["locks"].setdefault(path, threading.Lock())
+
+def _outbox_path():
+    user = st.session_state.user or {}
+    key = hashlib.sha256(str(user.get('id', '')).encode('utf-8')).hexdigest()[:32]
+    return os.path.join(OUTBOX_DIR, f"{key}.json")
+
+def _outbox_load(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+    return {"ops": state.get("ops", []), "failed": state.get("failed", [])}
+
+def _outbox_save(path, state):
+    try:
+        if not state["ops"] and not state["failed"]:
+            if os.path.exists(path):
+                os.remove(path)
+            return
+        os.makedirs(OUTBOX_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+def outbox_state():
+    path = _outbox_path()
+    with _outbox_lock(path):
+        return _outbox_load(path)
+
+def _send_queued(op):
+    """One delivery attempt: ("sent" | "conflict" | "rejected", body), or ("retry", None)
+    while the backend can't take it yet"""
+    if not breaker_allow():
+        return "retry", None
+    headers = get_headers()
+    headers["Idempotency-Key"] = op["key"]
+    status = "error"
+    start = time.perf_counter()
+    try:
+        response = http_session().request(op["method"], f"{API_URL}{op['endpoint']}", json=op["data"],
+                                          headers=headers, timeout=_budget_timeout())
+        status = response.status_code
+    except requests.exceptions.RequestException:
+        breaker_record(False)
+        return "retry", None
+    finally:
+        elapsed = time.perf_counter() - start
+        record_request(op["method"], op["endpoint"], status,
+                       {"dns_connect": 0.0, "ttfb": elapsed, "download": 0.0, "parse": 0.0, "total": elapsed})
+    breaker_record(breaker_succeeded(status))
+    if status in RETRYABLE_STATUSES or status == 401:
+        return "retry", None  # a 401 waits for the user to sign in again
+    try:
+        body = response.json()
+    except ValueError:
+        body = None
+    if status == 409:
+        return "conflict", body
+    if status >= 400:
+        return "rejected", body
+    return "sent", body
+
+def _rebase_queued(ops, sent, body):
+    """Later PATCHes queued against the same version of a record as `sent` were made on top
+    of it, not against someone else's edit; move them onto the version it produced so they
+    don't come back as conflicts."""
+    base = (sent["data"] or {}).get("baseUpdatedAt")
+    if sent["method"] != "PATCH" or base is None or not isinstance(body, dict) or "updatedAt" not in body:
+        return
+    for op in ops:
+        if op["method"] == "PATCH" and op["endpoint"] == sent["endpoint"] and \
+                (op["data"] or {}).get("baseUpdatedAt") == base:
+            op["data"]["baseUpdatedAt"] = body["updatedAt"]
+
+def flush_outbox(force=False):
+    """Replay queued mutations oldest first, stopping at the first the backend can't take yet
+    or when the time budget is spent. Returns {key: (outcome, body)} for the ops that left the queue."""
+    path = _outbox_path()
+    outboxes = _outboxes()
+    done = {}
+    with page_budget(), _outbox_lock(path):
+        now = time.time()
+        if not force and now - outboxes["last_flush"].get(path, 0) < OUTBOX_FLUSH_INTERVAL:
+            return done
+        outboxes["last_flush"][path] = now
+        state = _outbox_load(path)
+        while state["ops"]:
+            left = _budget_left()
+            if left is not None and left <= 0:
+                break
+            op = state["ops"][0]
+            outcome, body = _send_queued(op)
+            if outcome == "retry":
+                break
+            state["ops"].pop(0)
+            done[op["key"]] = (outcome, body)
+            if outcome == "sent":
+                _rebase_queued(state["ops"], op, body)
+            if outcome != "sent":
+                error = body.get('error', '') if isinstance(body, dict) else ''
+                state["failed"].append({"key": op["key"], "label": op["label"], "outcome": outcome,
+                                        "error": error, "queuedAt": op["queuedAt"]})
+            _outbox_save(path, state)  # after every op, so a crash mid-flush loses nothing
+    return done
+
+def submit_mutation(method, endpoint, data, label):
+    """Queue a change and try to deliver the queue. Returns (outcome, body) with outcome
+    "sent", "queued" (kept for later), "conflict" or "rejected"."""
+    op = {"key": str(uuid.uuid4()), "method": method, "endpoint": endpoint, "data": data,
+          "label": label, "queuedAt": int(time.time() * 1000)}
+    path = _outbox_path()
+    with _outbox_lock(path):
+        state = _outbox_load(path)
+        state["ops"].append(op)
+        _outbox_save(path, state)
+    outcome, body = flush_outbox(force=True).get(op["key"], ("queued", None))
+    if outcome in ("conflict", "rejected"):
+        # the caller reports it right away, so it needn't wait in the failed list
+        with _outbox_lock(path):
+            state = _outbox_load(path)
+            state["failed"] = [f for f in state["failed"] if f["key"] != op["key"]]
+            _outbox_save(path, state)
+    return outcome, body
+
+def dismiss_outbox_failures():
+    path = _outbox_path()
+    with _outbox_lock(path):
+        state = _outbox_load(path)
+        state["failed"] = []
+        _outbox_save(path, state)
+
+def outbox_status():
+    """Sidebar note about changes still waiting to sync, or refused when they were replayed"""
+    state = outbox_state()
+    if state["ops"]:
+        st.caption(f"{len(state['ops'])} change{'s' if len(state['ops']) != 1 else ''} waiting to sync")
+        st.button("Sync now", key="outbox_sync", use_container_width=True,
+                  on_click=flush_outbox, kwargs={"force": True})
+    if state["failed"]:
+        with st.expander(f"{len(state['failed'])} change(s) not applied", expanded=True):
+            for failed in state["failed"]:
+                reason = "changed by someone else" if failed["outcome"] == "conflict" else failed["error"] or "refused"
+                st.caption(f"{failed['label']}: {reason}")
+            st.button("Dismiss", key="outbox_dismiss", on_click=dismiss_outbox_failures)
+
+# User Name Lookup
+USER_NAME_TTL = 300  # seconds before a cached id -> name entry is refetched
+
+@st.cache_resource
+def _user_name_cache():
+    """Process-wide id -> (display name, fetched_at) map shared by all sessions"""
+    return {"names": {}, "lock": threading.Lock()}
+
+def resolve_user_names(ids):
+    """Map user ids to display names, fetching all cache misses in a single batch call"""
+    cache = _user_name_cache()
+    wanted = {i for i in ids if i}
+    now = time.time()
+    with cache["lock"]:
+        missing = [i for i in wanted
+                   if i not in cache["names"] or now - cache["names"][i][1] > USER_NAME_TTL]
+    if missing:
+        found = api_call("POST", "/users/lookup", {"ids": sorted(missing)})
+        if isinstance(found, list):
+            found_names = {u.get('id'): u.get('fullName') for u in found}
+            with cache["lock"]:
+                # ids that are not users (tasks, files, messages) are cached as None so they are not refetched
+                for i in missing:
+                    cache["names"][i] = (found_names.get(i), now)
+    with cache["lock"]:
+        return {i: cache["names"][i][0] for i in wanted
+                if i in cache["names"] and cache["names"][i][0]}
+
+def display_name(user_id, names, default=''):
+    """Return the resolved name for user_id, falling back to the raw id"""
+    if not user_id:
+        return default
+    return names.get(user_id, user_id)
+
+# Page Data Transforms (pure functions; bench/transforms.py times them offline)
+def status_counts_from_summary(summary):
+    """Convert the summary's byStatus array into a {status: count} dict"""
+    by_status = {}
+    if isinstance(summary.get('byStatus'), list):
+        for item in summary['byStatus']:
+            by_status[item['status']] = item['cnt']
+    return by_status
+
+def count_by(records, field):
+    """Count records per value of field, e.g. tasks per status or users per role"""
+    return dict(Counter(map(attrgetter(field), records)))
+
+def task_table_rows(tasks, names):
+    return [
+        {
+            "Title": t.title,
+            "Assignee": display_name(t.assigneeId, names, 'Unassigned'),
+            "Status": t.status,
+            "Priority": f"{t.priority}/5",
+            "Created": datetime.fromtimestamp(t.createdAt/1000).strftime('%Y-%m-%d'),
+        }
+        for t in tasks
+    ]
+
+def file_table_rows(files):
+    return [
+        {
+            "Filename": f['name'],
+            "Versions": f.get('versions', 1),
+            "Uploaded": datetime.fromtimestamp(f['createdAt']/1000).strftime('%Y-%m-%d %H:%M'),
+        }
+        for f in files
+    ]
+
+def audit_table_rows(logs, names):
+    return [
+        {
+            "Action": log.action,
+            "By": display_name(log.by, names),
+            "Target": display_name(log.target, names, 'N/A'),
+            "Timestamp": datetime.fromtimestamp(log.at/1000).strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        for log in logs
+    ]
+
+# Chart Figures
+@st.cache_resource
+def _figure_cache():
+    """Process-wide LRU of built Plotly figures keyed by chart type plus a hash of its inputs"""
+    return {"entries": OrderedDict(), "lock": threading.Lock(), "hits": 0, "misses": 0}
+
+def _figure_key(kind, rows, columns, options):
+    payload = json.dumps([kind, list(map(list, rows)), list(columns), options], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+def cached_figure(kind, rows, columns, textposition=None, **options):
+    """Build px.<kind> over rows (a list of tuples named by columns), reusing the figure when the inputs are unchanged"""
+    cache = _figure_cache()
+    key = _figure_key(kind, rows, columns, dict(options, textposition=textposition))
+    with cache["lock"]:
+        fig = cache["entries"].get(key)
+        if fig is not None:
+            cache["entries"].move_to_end(key)
+            cache["hits"] += 1
+            return fig
+        cache["misses"] += 1
+    pd = lazy_import("pandas")
+    px = lazy_import("plotly.express")
+    fig = getattr(px, kind)(pd.DataFrame(rows, columns=columns), **options)
+    if textposition:
+        fig.update_traces(textposition=textposition)
+    with cache["lock"]:
+        cache["entries"][key] = fig
+        cache["entries"].move_to_end(key)
+        while len(cache["entries"]) > FIGURE_CACHE_MAX_ENTRIES:
+            cache["entries"].popitem(last=False)
+    return fig
 
 def get_role_badge(role):
     """Return HTML badge for role"""
@@ -267,7 +1193,7 @@ def login_page():
                     # Try to create user via backend first and handle 403/connection failures by saving a local pending request
                     # Note: signup endpoint does NOT require auth (allow new employees to self-register)
                     try:
-                        resp = requests.post(f"{API_URL}/users/signup", json=payload, timeout=10, headers={})
+                        resp = http_session().post(f"{API_URL}/users/signup", json=payload, timeout=10, headers={})
                         if resp.status_code in (200, 201):
                             st.success("Account created successfully. You can now login.")
                         elif resp.status_code == 403:
@@ -329,31 +1255,22 @@ def login_page():
                         st.error(f"Unexpected error: {str(e)[:150]}")
 
 # DASHBOARD PAGE - Role Based Views
+@timed_page("dashboard")
 def dashboard_page():
     user = st.session_state.user
     role = user.get('role', 'EMPLOYEE')
     
     st.markdown(f"### Welcome, {user.get('fullName', 'User')}! {get_role_badge(role)}", unsafe_allow_html=True)
     
-    # Fetch data
-    tasks = api_call("GET", "/tasks")
-    summary = api_call("GET", "/dashboard/summary")
-    
-    # Only fetch employees for ADMIN and MANAGER roles
-    employees = None
-    if role in ['ADMIN', 'MANAGER']:
-        employees = api_call("GET", "/users")
-    
-    if not (summary and tasks):
+    # One request: the backend precomputes what this role's dashboard shows
+    view = api_call("GET", "/dashboard/view")
+    if not (view and view.get('totalTasks')):
         st.warning("No data available")
         return
     
     # Convert byStatus array to dict
-    total = summary.get('totalTasks', 0)
-    by_status = {}
-    if isinstance(summary.get('byStatus'), list):
-        for item in summary['byStatus']:
-            by_status[item['status']] = item['cnt']
+    total = view.get('totalTasks', 0)
+    by_status = status_counts_from_summary(view)
     
     # ADMIN DASHBOARD
     if role == 'ADMIN':
@@ -363,7 +1280,7 @@ def dashboard_page():
         with col1:
             st.metric("Total Tasks", total)
         with col2:
-            st.metric("Total Users", summary.get('users', 0))
+            st.metric("Total Users", view.get('users', 0))
         with col3:
             st.metric("Completed", by_status.get('DONE', 0))
         with col4:
@@ -376,19 +1293,19 @@ def dashboard_page():
         
         with col1:
             st.markdown("**Task Status Distribution (Pie Chart)**")
-            df_status = pd.DataFrame(list(by_status.items()), columns=['Status', 'Count'])
-            fig = px.pie(df_status, values='Count', names='Status',
-                        color_discrete_map={'TODO': '#FFB84D', 'IN_PROGRESS': '#6C5CE7', 'DONE': '#00B894'},
-                        title='Task Status Breakdown')
+            fig = cached_figure("pie", list(by_status.items()), ['Status', 'Count'],
+                                values='Count', names='Status',
+                                color_discrete_map={'TODO': '#FFB84D', 'IN_PROGRESS': '#6C5CE7', 'DONE': '#00B894'},
+                                title='Task Status Breakdown')
             st.plotly_chart(fig, use_container_width=True)
         
         with col2:
             st.markdown("**Task Status Distribution (Bar Chart)**")
-            df_status = pd.DataFrame(list(by_status.items()), columns=['Status', 'Count'])
-            fig = px.bar(df_status, x='Status', y='Count',
-                        color='Status',
-                        color_discrete_map={'TODO': '#FFB84D', 'IN_PROGRESS': '#6C5CE7', 'DONE': '#00B894'},
-                        title='Task Count by Status')
+            fig = cached_figure("bar", list(by_status.items()), ['Status', 'Count'],
+                                x='Status', y='Count',
+                                color='Status',
+                                color_discrete_map={'TODO': '#FFB84D', 'IN_PROGRESS': '#6C5CE7', 'DONE': '#00B894'},
+                                title='Task Count by Status')
             st.plotly_chart(fig, use_container_width=True)
         
         st.divider()
@@ -396,27 +1313,22 @@ def dashboard_page():
         
         with col3:
             st.markdown("**Employee Count (Pie Chart)**")
-            if employees:
-                role_counts = {}
-                for emp in employees:
-                    role_counts[emp.get('role', 'UNKNOWN')] = role_counts.get(emp.get('role', 'UNKNOWN'), 0) + 1
-                df_roles = pd.DataFrame(list(role_counts.items()), columns=['Role', 'Count'])
-                fig = px.pie(df_roles, values='Count', names='Role',
-                             color_discrete_map={'ADMIN': '#ff6b6b', 'MANAGER': '#4ecdc4', 'EMPLOYEE': '#95e1d3'},
-                             title='Team Composition')
+            role_counts = {item['role']: item['cnt'] for item in view.get('byRole', [])}
+            if role_counts:
+                fig = cached_figure("pie", list(role_counts.items()), ['Role', 'Count'],
+                                    values='Count', names='Role',
+                                    color_discrete_map={'ADMIN': '#ff6b6b', 'MANAGER': '#4ecdc4', 'EMPLOYEE': '#95e1d3'},
+                                    title='Team Composition')
                 st.plotly_chart(fig, use_container_width=True)
         
         with col4:
             st.markdown("**Employee Count (Bar Chart)**")
-            if employees:
-                role_counts = {}
-                for emp in employees:
-                    role_counts[emp.get('role', 'UNKNOWN')] = role_counts.get(emp.get('role', 'UNKNOWN'), 0) + 1
-                df_roles = pd.DataFrame(list(role_counts.items()), columns=['Role', 'Count'])
-                fig = px.bar(df_roles, x='Role', y='Count',
-                            color='Role',
-                            color_discrete_map={'ADMIN': '#ff6b6b', 'MANAGER': '#4ecdc4', 'EMPLOYEE': '#95e1d3'},
-                            title='Users by Role')
+            if role_counts:
+                fig = cached_figure("bar", list(role_counts.items()), ['Role', 'Count'],
+                                    x='Role', y='Count',
+                                    color='Role',
+                                    color_discrete_map={'ADMIN': '#ff6b6b', 'MANAGER': '#4ecdc4', 'EMPLOYEE': '#95e1d3'},
+                                    title='Users by Role')
                 st.plotly_chart(fig, use_container_width=True)
     
     # MANAGER DASHBOARD
@@ -441,51 +1353,47 @@ def dashboard_page():
         
         with col1:
             st.markdown("**Task Distribution (Pie Chart)**")
-            df_status = pd.DataFrame(list(by_status.items()), columns=['Status', 'Count'])
-            fig = px.pie(df_status, values='Count', names='Status',
-                        color_discrete_map={'TODO': '#FFB84D', 'IN_PROGRESS': '#6C5CE7', 'DONE': '#00B894'},
-                        title='Workload Distribution')
+            fig = cached_figure("pie", list(by_status.items()), ['Status', 'Count'],
+                                values='Count', names='Status',
+                                color_discrete_map={'TODO': '#FFB84D', 'IN_PROGRESS': '#6C5CE7', 'DONE': '#00B894'},
+                                title='Workload Distribution')
             st.plotly_chart(fig, use_container_width=True)
         
         with col2:
             st.markdown("**Task Distribution (Bar Chart)**")
-            df_status = pd.DataFrame(list(by_status.items()), columns=['Status', 'Count'])
-            fig = px.bar(df_status, x='Status', y='Count',
-                        color='Status',
-                        color_discrete_map={'TODO': '#FFB84D', 'IN_PROGRESS': '#6C5CE7', 'DONE': '#00B894'},
-                        title='Tasks by Status')
+            fig = cached_figure("bar", list(by_status.items()), ['Status', 'Count'],
+                                x='Status', y='Count',
+                                color='Status',
+                                color_discrete_map={'TODO': '#FFB84D', 'IN_PROGRESS': '#6C5CE7', 'DONE': '#00B894'},
+                                title='Tasks by Status')
             st.plotly_chart(fig, use_container_width=True)
         
         # Row 2: Priority Levels
         st.divider()
         col3, col4 = st.columns(2)
+        priority_counts = {item['priority']: item['cnt'] for item in view.get('byPriority', [])}
         
         with col3:
             st.markdown("**Priority Levels (Pie Chart)**")
-            if tasks:
-                priority_counts = {}
-                for task in tasks:
-                    priority = task.get('priority', 3)
-                    priority_counts[priority] = priority_counts.get(priority, 0) + 1
-                df_priority = pd.DataFrame(list(priority_counts.items()), columns=['Priority', 'Count'])
-                fig = px.pie(df_priority, values='Count', names='Priority',
-                            color_discrete_sequence=['#FF6B6B', '#FF8E72', '#FFB84D', '#A29BFE', '#6C5CE7'],
-                            title='Priority Breakdown')
+            if priority_counts:
+                fig = cached_figure("pie", list(priority_counts.items()), ['Priority', 'Count'],
+                                    values='Count', names='Priority',
+                                    color_discrete_sequence=['#FF6B6B', '#FF8E72', '#FFB84D', '#A29BFE', '#6C5CE7'],
+                                    title='Priority Breakdown')
                 st.plotly_chart(fig, use_container_width=True)
         
         with col4:
             st.markdown("**Priority Levels (Bar Chart)**")
-            if tasks:
-                priority_counts = {}
-                for task in tasks:
-                    priority = task.get('priority', 3)
-                    priority_counts[priority] = priority_counts.get(priority, 0) + 1
-                df_priority = pd.DataFrame(list(priority_counts.items()), columns=['Priority', 'Count'])
-                fig = px.bar(df_priority, x='Priority', y='Count',
-                            color='Priority',
-                            color_discrete_sequence=['#FF6B6B', '#FF8E72', '#FFB84D', '#A29BFE', '#6C5CE7'],
-                            title='Tasks by Priority')
+            if priority_counts:
+                fig = cached_figure("bar", list(priority_counts.items()), ['Priority', 'Count'],
+                                    x='Priority', y='Count',
+                                    color='Priority',
+                                    color_discrete_sequence=['#FF6B6B', '#FF8E72', '#FFB84D', '#A29BFE', '#6C5CE7'],
+                                    title='Tasks by Priority')
                 st.plotly_chart(fig, use_container_width=True)
+
+        st.divider()
+        workload_view()
     
     # EMPLOYEE DASHBOARD
     else:
@@ -506,62 +1414,132 @@ def dashboard_page():
         
         with col4:
             st.markdown("**My Tasks by Status (Pie)**")
-            df_status = pd.DataFrame(list(by_status.items()), columns=['Status', 'Count'])
-            fig = px.pie(df_status, values='Count', names='Status',
-                        color_discrete_map={'TODO': '#FFB84D', 'IN_PROGRESS': '#6C5CE7', 'DONE': '#00B894'},
-                        title='Task Status Distribution')
+            fig = cached_figure("pie", list(by_status.items()), ['Status', 'Count'],
+                                values='Count', names='Status',
+                                color_discrete_map={'TODO': '#FFB84D', 'IN_PROGRESS': '#6C5CE7', 'DONE': '#00B894'},
+                                title='Task Status Distribution')
             st.plotly_chart(fig, use_container_width=True)
         
         with col5:
             st.markdown("**My Tasks by Status (Bar)**")
-            df_status = pd.DataFrame(list(by_status.items()), columns=['Status', 'Count'])
-            fig = px.bar(df_status, x='Status', y='Count',
-                        color='Status',
-                        color_discrete_map={'TODO': '#FFB84D', 'IN_PROGRESS': '#6C5CE7', 'DONE': '#00B894'},
-                        text='Count',
-                        title='Task Count by Status')
-            fig.update_traces(textposition='auto')
+            fig = cached_figure("bar", list(by_status.items()), ['Status', 'Count'],
+                                x='Status', y='Count',
+                                color='Status',
+                                color_discrete_map={'TODO': '#FFB84D', 'IN_PROGRESS': '#6C5CE7', 'DONE': '#00B894'},
+                                text='Count',
+                                title='Task Count by Status',
+                                textposition='auto')
             st.plotly_chart(fig, use_container_width=True)
     
+    st.divider()
+    due_dates_view()
+
     st.divider()
     st.markdown("#### Recent Tasks")
     
-    if tasks:
-        for task in tasks[:10]:
-            status_icon = {"TODO": "[TODO]", "IN_PROGRESS": "[IN PROGRESS]", "DONE": "[DONE]"}.get(task['status'], "[UNKNOWN]")
-            
-            col1, col2, col3, col4 = st.columns([2, 1, 1, 2])
-            
-            with col1:
-                st.markdown(f"**{task['title']}**")
-                st.caption(task.get('description', ''))
-            with col2:
-                st.markdown(f"{status_icon}")
-            with col3:
-                st.caption(f"Priority: {task['priority']}/5")
-            with col4:
-                if task['status'] != 'DONE':
-                    col_a, col_b = st.columns(2)
-                    with col_a:
-                        if st.button("Start", key=f"start-{task['id']}", use_container_width=True):
-                            api_call("PATCH", f"/tasks/{task['id']}", {"status": "IN_PROGRESS"})
-                            st.rerun()
-                    with col_b:
-                        if st.button("Done", key=f"done-{task['id']}", use_container_width=True):
-                            api_call("PATCH", f"/tasks/{task['id']}", {"status": "DONE"})
-                            st.rerun()
-                else:
-                    st.markdown("Completed")
-            st.divider()
+    recent = view.get('recentTasks', [])
+    if recent:
+        recent_tasks_fragment(to_records(recent, TaskRecord))
+
+DUE_LIST_LIMIT = 10
+
+def due_dates_view():
+    """Overdue and due-this-week lists, read from the backend's due-date index"""
+    due = api_call("GET", f"/dashboard/due?limit={DUE_LIST_LIMIT}")
+    if not due:
+        return
+    overdue = due.get('overdue', {})
+    upcoming = due.get('dueThisWeek', {})
+    names = resolve_user_names(t.get('assigneeId') for t in overdue.get('tasks', []) + upcoming.get('tasks', []))
+
+    def task_line(task):
+        due_on = datetime.fromtimestamp(task['dueDate'] / 1000).strftime('%Y-%m-%d')
+        assignee = display_name(task.get('assigneeId'), names, 'Unassigned')
+        return f"- **{task.get('title', 'Untitled')}** · {assignee} · due {due_on}"
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown(f"#### Overdue ({overdue.get('count', 0)})")
+        if overdue.get('tasks'):
+            st.markdown("\n".join(task_line(t) for t in overdue['tasks']))
+            if overdue.get('count', 0) > len(overdue['tasks']):
+                st.caption(f"Showing the {len(overdue['tasks'])} longest overdue")
+        else:
+            st.caption("Nothing overdue")
+    with col2:
+        st.markdown(f"#### Due This Week ({upcoming.get('count', 0)})")
+        if upcoming.get('tasks'):
+            st.markdown("\n".join(task_line(t) for t in upcoming['tasks']))
+            if upcoming.get('count', 0) > len(upcoming['tasks']):
+                st.caption(f"Showing the {len(upcoming['tasks'])} due soonest")
+        else:
+            st.caption("Nothing due in the next 7 days")
+
+# Interactive sections below are fragments: a click inside one reruns only that
+# section, not the whole page with its API calls and charts. Buttons act through
+# on_click callbacks, which run before the fragment redraws with the new state.
+def _set_task_status(task, status):
+    """PATCH a task through the outbox and keep the new copy locally so the card updates
+    without refetching; while the change is queued the card shows it optimistically"""
+    outcome, updated = submit_mutation("PATCH", f"/tasks/{task.id}",
+                                       {"status": status, "baseUpdatedAt": task.updatedAt},
+                                       f"Set '{task.title}' to {status}")
+    overrides = st.session_state.setdefault('task_overrides', {})
+    if outcome == "sent" and isinstance(updated, dict):
+        overrides[task.id] = TaskRecord(updated)
+    elif outcome == "queued":
+        local = TaskRecord({field: getattr(task, field) for field in TaskRecord.__slots__})
+        local.status = status
+        overrides[task.id] = local
+        st.toast("Backend unreachable: the change is saved and will sync automatically")
+    elif outcome == "conflict":
+        overrides.pop(task.id, None)
+        st.toast("This task was changed by someone else; reload to see the latest version")
+    else:
+        st.toast(f"Change refused: {(updated or {}).get('error', 'unknown error')}")
+
+@st.fragment
+@page_budget()
+def recent_tasks_fragment(tasks):
+    overrides = st.session_state.get('task_overrides', {})
+    for task in tasks:
+        local = overrides.get(task.id)
+        if local and local.updatedAt >= task.updatedAt:
+            task = local
+        status_icon = {"TODO": "[TODO]", "IN_PROGRESS": "[IN PROGRESS]", "DONE": "[DONE]"}.get(task.status, "[UNKNOWN]")
+        
+        col1, col2, col3, col4 = st.columns([2, 1, 1, 2])
+        
+        with col1:
+            st.markdown(f"**{task.title}**")
+            st.caption(task.description)
+        with col2:
+            st.markdown(f"{status_icon}")
+        with col3:
+            st.caption(f"Priority: {task.priority}/5")
+        with col4:
+            if task.status != 'DONE':
+                col_a, col_b = st.columns(2)
+                with col_a:
+                    st.button("Start", key=f"start-{task.id}", use_container_width=True,
+                              on_click=_set_task_status, args=(task, "IN_PROGRESS"))
+                with col_b:
+                    st.button("Done", key=f"done-{task.id}", use_container_width=True,
+                              on_click=_set_task_status, args=(task, "DONE"))
+            else:
+                st.markdown("Completed")
+        st.divider()
 
 # TASKS PAGE
+@timed_page("tasks")
 def tasks_page():
+    pd = lazy_import("pandas")
     st.markdown("### Task Management")
     
     tab1, tab2 = st.tabs(["All Tasks", "Create Task"])
     
     with tab1:
-        tasks = api_call("GET", "/tasks")
+        tasks = api_call("GET", "/tasks", records=TaskRecord)
         
         if tasks:
             # Filter options
@@ -569,18 +1547,11 @@ def tasks_page():
             with col1:
                 status_filter = st.multiselect("Filter by Status", ["TODO", "IN_PROGRESS", "DONE"], default=["TODO", "IN_PROGRESS"])
             
-            filtered_tasks = [t for t in tasks if t['status'] in status_filter]
+            filtered_tasks = [t for t in tasks if t.status in status_filter]
             
             if filtered_tasks:
-                df = pd.DataFrame([
-                    {
-                        "Title": t['title'],
-                        "Status": t['status'],
-                        "Priority": f"{t['priority']}/5",
-                        "Created": datetime.fromtimestamp(t['createdAt']/1000).strftime('%Y-%m-%d'),
-                    }
-                    for t in filtered_tasks
-                ])
+                names = resolve_user_names(t.assigneeId for t in filtered_tasks)
+                df = pd.DataFrame(task_table_rows(filtered_tasks, names))
                 st.dataframe(df, use_container_width=True)
             else:
                 st.info("No tasks found with selected filters")
@@ -609,7 +1580,9 @@ def tasks_page():
                 st.error("Task title is required")
 
 # FILES PAGE
+@timed_page("files")
 def files_page():
+    pd = lazy_import("pandas")
     st.markdown("### File Management")
     
     tab1, tab2 = st.tabs(["All Files", "Upload File"])
@@ -618,14 +1591,7 @@ def files_page():
         files = api_call("GET", "/files")
         
         if files:
-            df = pd.DataFrame([
-                {
-                    "Filename": f['name'],
-                    "Versions": f.get('versions', 1),
-                    "Uploaded": datetime.fromtimestamp(f['createdAt']/1000).strftime('%Y-%m-%d %H:%M'),
-                }
-                for f in files
-            ])
+            df = pd.DataFrame(file_table_rows(files))
             st.dataframe(df, use_container_width=True)
         else:
             st.info("No files uploaded yet")
@@ -640,18 +1606,27 @@ def files_page():
             if filename and uploaded_file:
                 import base64
                 file_content = base64.b64encode(uploaded_file.read()).decode()
+                payload = {"name": filename, "contentBase64": file_content}
                 
-                result = api_call("POST", "/files", {
-                    "name": filename,
-                    "contentBase64": file_content
-                })
-                if result:
-                    st.success("File uploaded successfully!")
-                    st.rerun()
+                if len(file_content) <= OUTBOX_MAX_FILE_BYTES:
+                    outcome, result = submit_mutation("POST", "/files", payload, f"Upload '{filename}'")
+                    if outcome == "sent":
+                        st.success("File uploaded successfully!")
+                        st.rerun()
+                    elif outcome == "queued":
+                        st.info("Backend unreachable: the upload is saved and will be sent automatically")
+                    else:
+                        st.error(f"Upload refused: {(result or {}).get('error', 'unknown error')}")
+                else:
+                    result = api_call("POST", "/files", payload)
+                    if result:
+                        st.success("File uploaded successfully!")
+                        st.rerun()
             else:
                 st.error("Filename and file are required")
 
 # MESSAGES PAGE - Enhanced Communication
+@timed_page("messages")
 def messages_page():
     st.markdown("### Team Communication")
     
@@ -662,11 +1637,12 @@ def messages_page():
         
         if messages:
             st.markdown(f"#### {len(messages)} Message(s) in Channel")
+            names = resolve_user_names(msg.get('userId') for msg in messages)
             for msg in reversed(messages):  # Show newest first
                 with st.container(border=True):
                     col1, col2 = st.columns([4, 1])
                     with col1:
-                        st.markdown(f"**{msg.get('userId', 'Unknown')}**")
+                        st.markdown(f"**{display_name(msg.get('userId'), names, 'Unknown')}**")
                         st.markdown(msg.get('text', ''))
                     with col2:
                         timestamp = datetime.fromtimestamp(msg.get('createdAt', 0)/1000)
@@ -676,24 +1652,32 @@ def messages_page():
     
     with tab2:
         st.markdown("#### Post a Message")
-        
+        message_composer_fragment()
+
+@st.fragment
+def message_composer_fragment():
+    # Sending reruns only the composer; the channel list refreshes on the next page load
+    with st.form("post-message", clear_on_submit=True, border=False):
         message_title = st.text_input("Message Title (optional)")
         message_text = st.text_area("Message Content", height=100, placeholder="Share updates with your team...")
-        
-        if st.button("Send Message", use_container_width=True, type="primary"):
-            if message_text.strip():
-                full_message = f"{message_title}: {message_text}" if message_title else message_text
-                result = api_call("POST", "/messages", {
-                    "taskId": "",
-                    "text": full_message
-                })
-                if result:
-                    st.success("Message sent to team!")
-                    st.rerun()
+        submitted = st.form_submit_button("Send Message", use_container_width=True, type="primary")
+    
+    if submitted:
+        if message_text.strip():
+            full_message = f"{message_title}: {message_text}" if message_title else message_text
+            outcome, result = submit_mutation("POST", "/messages", {"text": full_message},
+                                              f"Message '{full_message[:40]}'")
+            if outcome == "sent":
+                st.success("Message sent to team!")
+            elif outcome == "queued":
+                st.info("Backend unreachable: the message is saved and will be sent automatically")
             else:
-                st.error("Message cannot be empty")
+                st.error(f"Message not sent: {(result or {}).get('error', 'unknown error')}")
+        else:
+            st.error("Message cannot be empty")
 
 # REPORTS PAGE - Enhanced with multiple formats
+@timed_page("reports")
 def reports_page():
     st.markdown("### Reports & Analytics")
     
@@ -704,84 +1688,37 @@ def reports_page():
     
     with tab1:
         st.markdown("#### Export Task Reports")
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            if st.button("CSV Export", use_container_width=True, type="primary"):
-                try:
-                    response = requests.get(f"{API_URL}/reports/tasks?format=csv", headers=get_headers(), timeout=5)
-                    st.download_button(
-                        label="Download CSV",
-                        data=response.text,
-                        file_name=f"tasks_report_{datetime.now().strftime('%Y%m%d')}.csv",
-                        mime="text/csv"
-                    )
-                except Exception as e:
-                    st.error(f"Error: {str(e)}")
-        
-        with col2:
-            if st.button("JSON Export", use_container_width=True):
-                try:
-                    data = api_call("GET", "/reports/tasks")
-                    if data:
-                        st.download_button(
-                            label="Download JSON",
-                            data=json.dumps(data, indent=2),
-                            file_name=f"tasks_report_{datetime.now().strftime('%Y%m%d')}.json",
-                            mime="application/json"
-                        )
-                except Exception as e:
-                    st.error(f"Error: {str(e)}")
-        
-        with col3:
-            if st.button("Excel-Style", use_container_width=True):
-                try:
-                    data = api_call("GET", "/reports/tasks")
-                    if data and 'rows' in data:
-                        df = pd.DataFrame(data['rows'])
-                        csv_buffer = BytesIO()
-                        df.to_csv(csv_buffer, index=False)
-                        st.download_button(
-                            label="Download Excel",
-                            data=csv_buffer.getvalue(),
-                            file_name=f"tasks_report_{datetime.now().strftime('%Y%m%d')}.xlsx",
-                            mime="application/vnd.ms-excel"
-                        )
-                except Exception as e:
-                    st.error(f"Error: {str(e)}")
+        export_jobs_section(role)
     
     with tab2:
+        if role in ['ADMIN', 'MANAGER']:
+            trends_fragment()
+            st.divider()
         st.markdown("#### Task Statistics")
-        tasks = api_call("GET", "/tasks")
+        tasks = api_call("GET", "/tasks", records=TaskRecord)
         if tasks:
-            status_counts = {}
-            priority_counts = {}
-            
-            for task in tasks:
-                status = task.get('status', 'TODO')
-                priority = task.get('priority', 3)
-                status_counts[status] = status_counts.get(status, 0) + 1
-                priority_counts[priority] = priority_counts.get(priority, 0) + 1
+            status_counts = count_by(tasks, 'status')
+            priority_counts = count_by(tasks, 'priority')
             
             # Row 1: Status charts
             col1, col2 = st.columns(2)
             with col1:
                 st.markdown("**Task Status - Pie Chart**")
-                df_status = pd.DataFrame(list(status_counts.items()), columns=['Status', 'Count'])
-                fig = px.pie(df_status, values='Count', names='Status',
-                            color_discrete_map={'TODO': '#FFB84D', 'IN_PROGRESS': '#6C5CE7', 'DONE': '#00B894'},
-                            title='Status Overview')
+                fig = cached_figure("pie", list(status_counts.items()), ['Status', 'Count'],
+                                    values='Count', names='Status',
+                                    color_discrete_map={'TODO': '#FFB84D', 'IN_PROGRESS': '#6C5CE7', 'DONE': '#00B894'},
+                                    title='Status Overview')
                 st.plotly_chart(fig, use_container_width=True)
             
             with col2:
                 st.markdown("**Task Status - Bar Chart**")
-                df_status = pd.DataFrame(list(status_counts.items()), columns=['Status', 'Count'])
-                fig = px.bar(df_status, x='Status', y='Count',
-                            color='Status',
-                            color_discrete_map={'TODO': '#FFB84D', 'IN_PROGRESS': '#6C5CE7', 'DONE': '#00B894'},
-                            title='Count by Status',
-                            text='Count')
-                fig.update_traces(textposition='auto')
+                fig = cached_figure("bar", list(status_counts.items()), ['Status', 'Count'],
+                                    x='Status', y='Count',
+                                    color='Status',
+                                    color_discrete_map={'TODO': '#FFB84D', 'IN_PROGRESS': '#6C5CE7', 'DONE': '#00B894'},
+                                    title='Count by Status',
+                                    text='Count',
+                                    textposition='auto')
                 st.plotly_chart(fig, use_container_width=True)
             
             # Row 2: Priority charts
@@ -790,40 +1727,34 @@ def reports_page():
             
             with col3:
                 st.markdown("**Priority Distribution - Pie Chart**")
-                df_priority = pd.DataFrame(list(priority_counts.items()), columns=['Priority', 'Count'])
-                fig = px.pie(df_priority, values='Count', names='Priority',
-                            color_discrete_sequence=['#FF6B6B', '#FF8E72', '#FFB84D', '#A29BFE', '#6C5CE7'],
-                            title='Priority Breakdown')
+                fig = cached_figure("pie", list(priority_counts.items()), ['Priority', 'Count'],
+                                    values='Count', names='Priority',
+                                    color_discrete_sequence=['#FF6B6B', '#FF8E72', '#FFB84D', '#A29BFE', '#6C5CE7'],
+                                    title='Priority Breakdown')
                 st.plotly_chart(fig, use_container_width=True)
             
             with col4:
                 st.markdown("**Priority Distribution - Bar Chart**")
-                df_priority = pd.DataFrame(list(priority_counts.items()), columns=['Priority', 'Count'])
-                fig = px.bar(df_priority, x='Priority', y='Count',
-                            color='Priority',
-                            color_discrete_sequence=['#FF6B6B', '#FF8E72', '#FFB84D', '#A29BFE', '#6C5CE7'],
-                            title='Count by Priority',
-                            text='Count')
-                fig.update_traces(textposition='auto')
+                fig = cached_figure("bar", list(priority_counts.items()), ['Priority', 'Count'],
+                                    x='Priority', y='Count',
+                                    color='Priority',
+                                    color_discrete_sequence=['#FF6B6B', '#FF8E72', '#FFB84D', '#A29BFE', '#6C5CE7'],
+                                    title='Count by Priority',
+                                    text='Count',
+                                    textposition='auto')
                 st.plotly_chart(fig, use_container_width=True)
             
             # Row 3: Combined analysis
             st.divider()
             st.markdown("**Combined Task Overview - Sunburst Chart**")
             if tasks:
-                analysis_data = []
-                for task in tasks:
-                    analysis_data.append({
-                        'Status': task.get('status', 'TODO'),
-                        'Priority': f"Priority {task.get('priority', 3)}",
-                        'Count': 1
-                    })
-                df_analysis = pd.DataFrame(analysis_data)
-                df_agg = df_analysis.groupby(['Status', 'Priority']).size().reset_index(name='Count')
-                
-                fig = px.sunburst(df_agg, labels='Status', parents='', values='Count',
-                                color='Count', color_continuous_scale='Viridis',
-                                title='Task Distribution Overview')
+                pairs = Counter((task.status, task.priority) for task in tasks)
+                fig = cached_figure("sunburst", [(status, f"Priority {priority}", count)
+                                                 for (status, priority), count in sorted(pairs.items())],
+                                    ['Status', 'Priority', 'Count'],
+                                    path=['Status', 'Priority'], values='Count',
+                                    color='Count', color_continuous_scale='Viridis',
+                                    title='Task Distribution Overview')
                 st.plotly_chart(fig, use_container_width=True)
     
     with tab3:
@@ -834,10 +1765,7 @@ def reports_page():
                 col1, col2, col3 = st.columns(3)
                 
                 total = summary.get('totalTasks', 0)
-                by_status = {}
-                if isinstance(summary.get('byStatus'), list):
-                    for item in summary['byStatus']:
-                        by_status[item['status']] = item['cnt']
+                by_status = status_counts_from_summary(summary)
                 
                 completed = by_status.get('DONE', 0)
                 completion_rate = (completed / total * 100) if total > 0 else 0
@@ -857,10 +1785,11 @@ def reports_page():
                 
                 with col4:
                     st.markdown("**Completion Rate - Gauge Chart**")
-                    fig = px.indicator(mode="gauge+number+delta",
+                    go = lazy_import("plotly.graph_objects")
+                    fig = go.Figure(go.Indicator(mode="gauge+number+delta",
                                      value=completion_rate,
                                      title={'text': "Task Completion %"},
-                                     domain={'x': [0, 100], 'y': [0, 100]},
+                                     domain={'x': [0, 1], 'y': [0, 1]},
                                      gauge={'axis': {'range': [None, 100]},
                                            'bar': {'color': '#00B894'},
                                            'steps': [
@@ -870,22 +1799,20 @@ def reports_page():
                                            ],
                                            'threshold': {'line': {'color': 'red', 'width': 4},
                                                        'thickness': 0.75,
-                                                       'value': 90}})
+                                                       'value': 90}}))
                     st.plotly_chart(fig, use_container_width=True)
                 
                 with col5:
                     st.markdown("**Task Completion - Horizontal Bar**")
-                    completion_data = pd.DataFrame({
-                        'Category': ['Completed', 'Pending'],
-                        'Count': [completed, total - completed]
-                    })
-                    fig = px.bar(completion_data, y='Category', x='Count',
-                               orientation='h',
-                               color='Category',
-                               color_discrete_map={'Completed': '#00B894', 'Pending': '#FFB84D'},
-                               text='Count',
-                               title='Task Completion Status')
-                    fig.update_traces(textposition='auto')
+                    fig = cached_figure("bar", [('Completed', completed), ('Pending', total - completed)],
+                                        ['Category', 'Count'],
+                                        y='Category', x='Count',
+                                        orientation='h',
+                                        color='Category',
+                                        color_discrete_map={'Completed': '#00B894', 'Pending': '#FFB84D'},
+                                        text='Count',
+                                        title='Task Completion Status',
+                                        textposition='auto')
                     st.plotly_chart(fig, use_container_width=True)
                 
                 # Row 2: Status breakdown
@@ -895,24 +1822,222 @@ def reports_page():
                 
                 with col6:
                     st.markdown("**Status Distribution**")
-                    df_status = pd.DataFrame(list(by_status.items()), columns=['Status', 'Count'])
-                    fig = px.pie(df_status, values='Count', names='Status',
-                                color_discrete_map={'TODO': '#FFB84D', 'IN_PROGRESS': '#6C5CE7', 'DONE': '#00B894'},
-                                title='Task Status Pie')
+                    fig = cached_figure("pie", list(by_status.items()), ['Status', 'Count'],
+                                        values='Count', names='Status',
+                                        color_discrete_map={'TODO': '#FFB84D', 'IN_PROGRESS': '#6C5CE7', 'DONE': '#00B894'},
+                                        title='Task Status Pie')
                     st.plotly_chart(fig, use_container_width=True)
                 
                 with col7:
                     st.markdown("**Status Count - Donut Chart**")
-                    df_status = pd.DataFrame(list(by_status.items()), columns=['Status', 'Count'])
-                    fig = px.pie(df_status, values='Count', names='Status',
-                                color_discrete_map={'TODO': '#FFB84D', 'IN_PROGRESS': '#6C5CE7', 'DONE': '#00B894'},
-                                hole=0.4,
-                                title='Task Status Donut')
+                    fig = cached_figure("pie", list(by_status.items()), ['Status', 'Count'],
+                                        values='Count', names='Status',
+                                        color_discrete_map={'TODO': '#FFB84D', 'IN_PROGRESS': '#6C5CE7', 'DONE': '#00B894'},
+                                        hole=0.4,
+                                        title='Task Status Donut')
                     st.plotly_chart(fig, use_container_width=True)
         else:
             st.info("Performance metrics available for managers and admins")
 
+# Report exports run as backend jobs; the section checks on them while any is still working
+JOB_POLL_SECONDS = 2
+JOB_DOWNLOAD_TIMEOUT = 60
+JOB_ARTIFACTS_KEPT = 3  # downloaded artifacts held in the session for the download buttons
+EXPORTS = {
+    # label -> (job kind, format, download file extension, mime type, roles)
+    "CSV Export": ("tasks", "csv", "csv", "text/csv", ("ADMIN", "MANAGER", "EMPLOYEE")),
+    "JSON Export": ("tasks", "json", "json", "application/json", ("ADMIN", "MANAGER", "EMPLOYEE")),
+    "Excel-Style": ("tasks", "csv", "xlsx", "application/vnd.ms-excel", ("ADMIN", "MANAGER", "EMPLOYEE")),
+    "Audit Log CSV": ("audit", "csv", "csv", "text/csv", ("ADMIN",)),
+}
+
+# Button callbacks run before the fragment body and anything they draw is dropped, so their
+# problems are kept in export_errors ({job id or label: message}) for the body to show
+
+def _submit_export(label):
+    kind, fmt, ext, mime, _ = EXPORTS[label]
+    errors = st.session_state.setdefault('export_errors', {})
+    job = api_call("POST", "/jobs", {"kind": kind, "format": fmt})
+    if isinstance(job, dict) and job.get('id'):
+        errors.pop(label, None)
+        stem = job.get('fileName', f"{kind}_report.{fmt}").rsplit('.', 1)[0]
+        st.session_state.setdefault('export_jobs', {})[job['id']] = {"label": label, "file_name": f"{stem}.{ext}", "mime": mime}
+    else:
+        errors[label] = f"Could not start {label}; try again shortly"
+
+def _fetch_job_artifact(job_id):
+    """Download a finished job's file when asked to; the last few stay in the session"""
+    errors = st.session_state.setdefault('export_errors', {})
+    try:
+        response = http_session().get(f"{API_URL}/jobs/{job_id}/download", headers=get_headers(), timeout=JOB_DOWNLOAD_TIMEOUT)
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        errors[job_id] = f"Download failed: {str(e)[:120]}"
+        return
+    errors.pop(job_id, None)
+    artifacts = st.session_state.setdefault('job_artifacts', OrderedDict())
+    artifacts[job_id] = response.content
+    while len(artifacts) > JOB_ARTIFACTS_KEPT:
+        artifacts.popitem(last=False)
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+@page_budget()
+def export_jobs_section(role):
+    labels = [label for label, spec in EXPORTS.items() if role in spec[4]]
+    cols = st.columns(len(labels))
+    for col, label in zip(cols, labels):
+        with col:
+            st.button(label, key=f"export_{label}", use_container_width=True,
+                      type="primary" if label == "CSV Export" else "secondary",
+                      on_click=_submit_export, args=(label,))
+    errors = st.session_state.get('export_errors', {})
+    for label in labels:
+        if label in errors:
+            st.error(errors[label])
+
+    submitted = st.session_state.get('export_jobs', {})
+    jobs = st.session_state.get('export_jobs_seen', [])
+    # Ask the backend only while a job of this session is queued, running or not seen yet;
+    # otherwise the tick redraws the last list without a request
+    seen = {j.get('id'): j.get('status') for j in jobs}
+    if any(seen.get(job_id) in (None, 'queued', 'running') for job_id in submitted):
+        listed = api_call("GET", "/jobs")
+        if isinstance(listed, list):
+            jobs = [j for j in listed if j.get('id') in submitted]
+            st.session_state.export_jobs_seen = jobs
+            # jobs the backend no longer lists (expired) are not waited for
+            kept = {j['id'] for j in jobs}
+            st.session_state.export_jobs = {k: v for k, v in submitted.items() if k in kept}
+
+    artifacts = st.session_state.get('job_artifacts', {})
+    for job in jobs:
+        meta = submitted.get(job['id'])
+        if meta is None:
+            continue
+        status = job.get('status')
+        created = datetime.fromtimestamp(job.get('createdAt', 0) / 1000).strftime('%H:%M:%S')
+        st.markdown(f"**{meta['label']}** · started {created} · {status}")
+        if status in ('queued', 'running'):
+            st.progress(job.get('progress', 0))
+        elif status == 'failed':
+            st.error(f"Export failed: {job.get('error', 'unknown error')}")
+        elif status == 'done' and job['id'] in artifacts:
+            st.download_button(
+                label=f"Download {meta['file_name']} ({job.get('rows', 0)} rows)",
+                data=artifacts[job['id']],
+                file_name=meta['file_name'],
+                mime=meta['mime'],
+                key=f"download_{job['id']}"
+            )
+        elif status == 'done':
+            # the file is fetched only once asked for, not on every rerun of the section
+            st.button(f"Prepare {meta['file_name']} ({job.get('rows', 0)} rows)", key=f"fetch_{job['id']}",
+                      on_click=_fetch_job_artifact, args=(job['id'],))
+            if job['id'] in errors:
+                st.error(errors[job['id']])
+
+TREND_WINDOWS = [7, 30, 90, 365]
+
+@st.fragment
+@page_budget()
+def trends_fragment():
+    # Changing the window or grouping reruns only this section; the backend answers from daily rollups
+    pd = lazy_import("pandas")
+    st.markdown("#### Throughput Trends")
+    col1, col2 = st.columns(2)
+    with col1:
+        days = st.selectbox("Window", TREND_WINDOWS, index=1, format_func=lambda d: f"Last {d} days", key="trend_days")
+    with col2:
+        grouping = st.radio("Group by", ["Day", "Week"], horizontal=True, key="trend_grouping")
+
+    trends = api_call("GET", f"/reports/trends?days={days}")
+    if not trends:
+        st.info("No trend data available")
+        return
+
+    totals = trends.get('totals', {})
+    lead_time = totals.get('avgLeadTimeHours')
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Created", totals.get('created', 0))
+    with col2:
+        st.metric("Completed", totals.get('completed', 0))
+    with col3:
+        st.metric("Avg Lead Time", f"{lead_time:.1f} h" if lead_time is not None else "N/A")
+
+    periods = trends.get('days', []) if grouping == "Day" else trends.get('weeks', [])
+    period_key = 'date' if grouping == "Day" else 'week'
+    fig = cached_figure("line", [(p[period_key], p.get('created', 0), p.get('completed', 0)) for p in periods],
+                        [grouping, 'Created', 'Completed'],
+                        x=grouping, y=['Created', 'Completed'],
+                        markers=True,
+                        color_discrete_map={'Created': '#6C5CE7', 'Completed': '#00B894'},
+                        title=f'Tasks Created vs Completed per {grouping}')
+    st.plotly_chart(fig, use_container_width=True)
+
+    fig = cached_figure("bar", [(p[period_key], p['avgLeadTimeHours']) for p in periods if p.get('avgLeadTimeHours') is not None],
+                        [grouping, 'Hours'],
+                        x=grouping, y='Hours',
+                        color_discrete_sequence=['#FFB84D'],
+                        title='Average Lead Time to Done (hours)')
+    st.plotly_chart(fig, use_container_width=True)
+
+    assignees = trends.get('assignees', [])
+    if assignees:
+        names = resolve_user_names(a['assigneeId'] for a in assignees)
+        df = pd.DataFrame([
+            {
+                "Assignee": display_name(a['assigneeId'], names) if a['assigneeId'] != 'unassigned' else 'Unassigned',
+                "Created": a['created'],
+                "Completed": a['completed'],
+                "Avg Lead Time (h)": round(a['avgLeadTimeHours'], 1) if a.get('avgLeadTimeHours') is not None else None,
+            }
+            for a in sorted(assignees, key=lambda a: -a['completed'])
+        ])
+        st.dataframe(df, use_container_width=True, hide_index=True)
+
+def workload_view():
+    """Open work per assignee, rendered from the backend's workload counters in one small response"""
+    pd = lazy_import("pandas")
+    st.markdown("#### Workload by Assignee")
+    workload = api_call("GET", "/dashboard/workload")
+    assignees = (workload or {}).get('assignees', [])
+    if not assignees:
+        st.info("No open tasks assigned")
+        return
+
+    rows = [
+        {
+            "Assignee": a.get('fullName') or ('Unassigned' if a['assigneeId'] == 'unassigned' else a['assigneeId']),
+            "Open": a.get('open', 0),
+            "To Do": a.get('todo', 0),
+            "In Progress": a.get('inProgress', 0),
+            "Overdue": a.get('overdue', 0),
+            "Due This Week": a.get('dueThisWeek', 0),
+            "Avg Age (days)": a.get('avgAgeDays', 0),
+        }
+        for a in assignees
+    ]
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Open Tasks", sum(r["Open"] for r in rows))
+    with col2:
+        st.metric("Overdue", sum(r["Overdue"] for r in rows))
+    with col3:
+        st.metric("Assignees with Open Work", len(rows))
+
+    top = rows[:20]
+    fig = cached_figure("bar", [(r["Assignee"], r["To Do"], r["In Progress"], r["Overdue"]) for r in top],
+                        ['Assignee', 'To Do', 'In Progress', 'Overdue'],
+                        x='Assignee', y=['To Do', 'In Progress', 'Overdue'],
+                        barmode='group',
+                        color_discrete_map={'To Do': '#FFB84D', 'In Progress': '#6C5CE7', 'Overdue': '#FF6B6B'},
+                        title='Open Tasks per Assignee')
+    st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+
 # EMPLOYEES PAGE (Admin & Manager)
+@timed_page("employees")
 def employees_page():
     user = st.session_state.user
     role = user.get('role', 'EMPLOYEE')
@@ -932,10 +2057,14 @@ def employees_page():
     else:
         st.markdown("### Team Management")
     
-    tab1, tab2 = st.tabs(["All Employees", "Add Employee"])
+    tab1, tab2, tab3 = st.tabs(["All Employees", "Add Employee", "Workload"])
     
+    # filled first because the employee list below returns early when it cannot load
+    with tab3:
+        workload_view()
+
     with tab1:
-        employees = api_call("GET", "/users")
+        employees = api_call("GET", "/users", records=UserRecord)
 
         if employees is None:
             st.error("Unable to load team members. Please ensure you have proper permissions.")
@@ -944,57 +2073,7 @@ def employees_page():
 
         if employees:
             st.markdown("#### Employees")
-
-            # If a delete is pending confirmation, show a prominent confirmation block
-            if st.session_state.get('confirm_delete'):
-                cid = st.session_state.confirm_delete
-                cname = st.session_state.confirm_delete_name or ''
-                st.warning(f"Confirm deletion of user: {cname} (id: {cid})")
-                ccol1, ccol2 = st.columns([1,1])
-                with ccol1:
-                    if st.button("Confirm Delete", key="confirm-delete-yes"):
-                        res = api_call("DELETE", f"/users/{cid}")
-                        # clear confirmation state
-                        st.session_state.confirm_delete = None
-                        st.session_state.confirm_delete_name = None
-                        if res is not None:
-                            st.success("User deleted successfully")
-                            st.rerun()
-                        else:
-                            st.error("Failed to delete user. Check permissions or backend status.")
-                with ccol2:
-                    if st.button("Cancel", key="confirm-delete-no"):
-                        st.session_state.confirm_delete = None
-                        st.session_state.confirm_delete_name = None
-                        st.info("Delete cancelled")
-
-            for emp in employees:
-                with st.container(border=True):
-                    cols = st.columns([3, 3, 2, 1])
-                    with cols[0]:
-                        st.markdown(f"**{emp.get('fullName', '')}**")
-                        st.caption(emp.get('email', ''))
-                    with cols[1]:
-                        st.markdown(get_role_badge(emp.get('role', 'EMPLOYEE')), unsafe_allow_html=True)
-                    with cols[2]:
-                        eid = emp.get('id', '') or ''
-                        st.caption(eid[:8] + '...' if len(eid) > 8 else eid)
-                    with cols[3]:
-                        # Determine if current user can delete this employee (frontend guard; backend enforces rules too)
-                        can_delete = False
-                        if role == 'ADMIN':
-                            can_delete = True
-                        elif role == 'MANAGER' and emp.get('role') == 'EMPLOYEE':
-                            can_delete = True
-
-                        if can_delete:
-                            # two-step delete: set confirmation state first
-                            if st.button("Delete", key=f"delete-{emp.get('id', '')}", use_container_width=True):
-                                st.session_state.confirm_delete = emp.get('id')
-                                st.session_state.confirm_delete_name = emp.get('fullName')
-                                st.experimental_rerun()
-
-            st.caption(f"Total: {len(employees)} employee(s)")
+            employee_list_fragment(employees, role)
         else:
             st.info("No employees found")
 
@@ -1002,58 +2081,7 @@ def employees_page():
         if role == 'ADMIN':
             st.divider()
             with st.expander("Pending Signups (Local)", expanded=False):
-                import os as _os, json as _json
-                pending_path = _os.path.join('data', 'pending_signups.json')
-                if _os.path.exists(pending_path):
-                    try:
-                        with open(pending_path, 'r', encoding='utf-8') as f:
-                            pending = _json.load(f)
-                    except Exception:
-                        pending = []
-                else:
-                    pending = []
-
-                if pending:
-                    for idx, entry in enumerate(list(pending)):
-                        pcols = st.columns([3, 3, 1, 1])
-                        with pcols[0]:
-                            st.markdown(f"**{entry.get('fullName', '')}**")
-                            st.caption(entry.get('email', ''))
-                        with pcols[1]:
-                            st.caption(entry.get('requestedAt', ''))
-                        with pcols[2]:
-                            if st.button("Approve", key=f"approve-{idx}"):
-                                payload = {
-                                    "fullName": entry.get('fullName'),
-                                    "email": entry.get('email'),
-                                    "role": "EMPLOYEE",
-                                    "password": "TaskFlow@123"
-                                }
-                                created = api_call("POST", "/users", payload)
-                                if created is not None:
-                                    # remove the approved entry
-                                    try:
-                                        pending.remove(entry)
-                                        with open(pending_path, 'w', encoding='utf-8') as f:
-                                            _json.dump(pending, f, indent=2)
-                                    except Exception:
-                                        pass
-                                    st.success("Account created and removed from pending list")
-                                    st.rerun()
-                                else:
-                                    st.error("Failed to create account. Check backend or permissions.")
-                        with pcols[3]:
-                            if st.button("Reject", key=f"reject-{idx}"):
-                                try:
-                                    pending.remove(entry)
-                                    with open(pending_path, 'w', encoding='utf-8') as f:
-                                        _json.dump(pending, f, indent=2)
-                                except Exception:
-                                    pass
-                                st.info("Signup request rejected and removed")
-                                st.rerun()
-                else:
-                    st.info("No pending signups found")
+                pending_signups_fragment()
     
     with tab2:
         st.markdown("#### Add New Employee")
@@ -1082,8 +2110,156 @@ def employees_page():
             else:
                 st.error("Name and email are required")
 
+# Callbacks of buttons inside a fragment run before its body, and anything they draw is
+# dropped; they leave (kind, text) in session_state for the fragment body to show
+
+def _show_outcome(state_key):
+    outcome = st.session_state.pop(state_key, None)
+    if outcome:
+        kind, text = outcome
+        getattr(st, kind)(text)
+
+def _request_delete(user_id, name):
+    # two-step delete: set confirmation state first
+    st.session_state.confirm_delete = user_id
+    st.session_state.confirm_delete_name = name
+
+def _confirm_delete():
+    cid = st.session_state.confirm_delete
+    res = api_call("DELETE", f"/users/{cid}")
+    # clear confirmation state
+    st.session_state.confirm_delete = None
+    st.session_state.confirm_delete_name = None
+    if res is not None:
+        st.session_state.setdefault('deleted_user_ids', set()).add(cid)
+        st.session_state.employee_outcome = ("toast", "User deleted successfully")
+    else:
+        st.session_state.employee_outcome = ("error", "Failed to delete user. Check permissions or backend status.")
+
+def _cancel_delete():
+    st.session_state.confirm_delete = None
+    st.session_state.confirm_delete_name = None
+    st.session_state.employee_outcome = ("toast", "Delete cancelled")
+
+@st.fragment
+def employee_list_fragment(employees, role):
+    # Rows deleted here are hidden locally; the list is refetched on the next page load
+    deleted = st.session_state.get('deleted_user_ids', set())
+    employees = [emp for emp in employees if emp.id not in deleted]
+    _show_outcome('employee_outcome')
+
+    # If a delete is pending confirmation, show a prominent confirmation block
+    if st.session_state.get('confirm_delete'):
+        cid = st.session_state.confirm_delete
+        cname = st.session_state.confirm_delete_name or ''
+        st.warning(f"Confirm deletion of user: {cname} (id: {cid})")
+        ccol1, ccol2 = st.columns([1,1])
+        with ccol1:
+            st.button("Confirm Delete", key="confirm-delete-yes", on_click=_confirm_delete)
+        with ccol2:
+            st.button("Cancel", key="confirm-delete-no", on_click=_cancel_delete)
+
+    for emp in employees:
+        with st.container(border=True):
+            cols = st.columns([3, 3, 2, 1])
+            with cols[0]:
+                st.markdown(f"**{emp.fullName}**")
+                st.caption(emp.email)
+            with cols[1]:
+                st.markdown(get_role_badge(emp.role), unsafe_allow_html=True)
+            with cols[2]:
+                eid = emp.id
+                st.caption(eid[:8] + '...' if len(eid) > 8 else eid)
+            with cols[3]:
+                # Determine if current user can delete this employee (frontend guard; backend enforces rules too)
+                can_delete = False
+                if role == 'ADMIN':
+                    can_delete = True
+                elif role == 'MANAGER' and emp.role == 'EMPLOYEE':
+                    can_delete = True
+
+                if can_delete:
+                    st.button("Delete", key=f"delete-{emp.id}", use_container_width=True,
+                              on_click=_request_delete, args=(emp.id, emp.fullName))
+
+    st.caption(f"Total: {len(employees)} employee(s)")
+
+PENDING_SIGNUPS_PATH = os.path.join('data', 'pending_signups.json')
+
+def _load_pending_signups():
+    if os.path.exists(PENDING_SIGNUPS_PATH):
+        try:
+            with open(PENDING_SIGNUPS_PATH, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            return []
+    return []
+
+def _remove_pending_signup(entry):
+    pending = _load_pending_signups()
+    try:
+        pending.remove(entry)
+        with open(PENDING_SIGNUPS_PATH, 'w', encoding='utf-8') as f:
+            json.dump(pending, f, indent=2)
+    except Exception:
+        pass
+
+def _approve_pending_signup(entry):
+    payload = {
+        "fullName": entry.get('fullName'),
+        "email": entry.get('email'),
+        "role": "EMPLOYEE",
+        "password": "TaskFlow@123"
+    }
+    created = api_call("POST", "/users", payload)
+    if created is not None:
+        # remove the approved entry
+        _remove_pending_signup(entry)
+        st.session_state.signup_outcome = ("toast", "Account created and removed from pending list")
+    else:
+        st.session_state.signup_outcome = ("error", "Failed to create account. Check backend or permissions.")
+
+def _reject_pending_signup(entry):
+    _remove_pending_signup(entry)
+    st.session_state.signup_outcome = ("toast", "Signup request rejected and removed")
+
+@st.fragment
+def pending_signups_fragment():
+    pending = _load_pending_signups()
+    _show_outcome('signup_outcome')
+
+    if pending:
+        keys = set()
+        for idx, entry in enumerate(pending):
+            # keyed by the request, not its position, so a button keeps its entry when the list
+            # changes; a repeated request for the same email falls back to its position
+            signup_id = entry.get('email') or f"{entry.get('fullName', '')}-{entry.get('requestedAt', '')}"
+            if signup_id in keys:
+                signup_id = f"{signup_id}-{idx}"
+            keys.add(signup_id)
+            pcols = st.columns([3, 3, 1, 1])
+            with pcols[0]:
+                st.markdown(f"**{entry.get('fullName', '')}**")
+                st.caption(entry.get('email', ''))
+            with pcols[1]:
+                st.caption(entry.get('requestedAt', ''))
+            with pcols[2]:
+                st.button("Approve", key=f"approve-{signup_id}", on_click=_approve_pending_signup, args=(entry,))
+            with pcols[3]:
+                st.button("Reject", key=f"reject-{signup_id}", on_click=_reject_pending_signup, args=(entry,))
+    else:
+        st.info("No pending signups found")
+
 # AUDIT PAGE (Admin Only)
+AUDIT_DEFAULT_DAYS = 7
+AUDIT_PAGE_SIZES = [100, 500, 1000]
+
+def _reset_audit_paging():
+    st.session_state.audit_cursors = []
+
+@timed_page("audit")
 def audit_page():
+    pd = lazy_import("pandas")
     user = st.session_state.user
     
     if user.get('role') != 'ADMIN':
@@ -1091,28 +2267,209 @@ def audit_page():
         return
     
     st.markdown("### Audit Logs")
-    
-    logs = api_call("GET", "/audit")
+
+    # The backend answers from the hot segment plus only the archived segments overlapping the range
+    today = datetime.now().date()
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        date_range = st.date_input("Date range", value=(today - timedelta(days=AUDIT_DEFAULT_DAYS), today),
+                                   max_value=today, key="audit_range", on_change=_reset_audit_paging)
+    with col2:
+        limit = st.selectbox("Rows", AUDIT_PAGE_SIZES, key="audit_limit", on_change=_reset_audit_paging)
+    if not isinstance(date_range, (list, tuple)) or len(date_range) != 2:
+        st.info("Pick a start and end date")
+        return
+    start = datetime.combine(date_range[0], datetime.min.time())
+    end = datetime.combine(date_range[1], datetime.max.time())
+    query = f"/audit?from={int(start.timestamp() * 1000)}&to={int(end.timestamp() * 1000)}&limit={limit}"
+    cursors = st.session_state.setdefault('audit_cursors', [])
+    if cursors:
+        query += f"&before={cursors[-1]}"
+
+    page = {}
+    logs = api_call("GET", query, records=AuditRecord, headers=page)
+    # "<at>:<id>" of the last row shown, present only when older entries match
+    next_before = page.get("X-Audit-Next-Before")
     
     if logs:
+        names = resolve_user_names(
+            [log.by for log in logs] + [log.target for log in logs]
+        )
+        df = pd.DataFrame(audit_table_rows(logs, names))
+        st.dataframe(df, use_container_width=True)
+    else:
+        st.info("No audit logs available")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.button("Newer", disabled=not cursors, use_container_width=True, on_click=cursors.pop if cursors else None)
+    with col2:
+        st.button("Older", disabled=not next_before, use_container_width=True,
+                  on_click=cursors.append, args=(next_before,) if next_before else None)
+
+# PERFORMANCE PAGE (Admin Only)
+@timed_page("performance")
+def performance_page():
+    pd = lazy_import("pandas")
+    user = st.session_state.user
+
+    if user.get('role') != 'ADMIN':
+        st.error("Admin access only")
+        return
+
+    st.markdown("### Performance")
+
+    metrics = _metrics()
+    with metrics["lock"]:
+        request_samples = list(metrics["requests"])
+        page_samples = list(metrics["pages"])
+        request_counts = dict(metrics["request_counts"])
+        imports = dict(metrics["imports"])
+        started = metrics["started"]
+
+    errors = sum(1 for r in request_samples if not r['status'].isdigit() or int(r['status']) >= 400)
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("API Calls (recent)", len(request_samples))
+    with col2:
+        st.metric("Errors (recent)", errors)
+    with col3:
+        st.metric("p95 API Latency", f"{_percentile([r['total'] for r in request_samples], 95) * 1000:.0f} ms")
+    with col4:
+        st.metric("Collecting Since", datetime.fromtimestamp(started).strftime('%Y-%m-%d %H:%M'))
+
+    st.divider()
+    st.markdown("#### Endpoints")
+    by_endpoint = {}
+    for r in request_samples:
+        by_endpoint.setdefault((r['method'], r['endpoint']), []).append(r)
+    if by_endpoint:
         df = pd.DataFrame([
             {
-                "Action": log.get('action', ''),
-                "By": log.get('by', ''),
-                "Target": log.get('target', 'N/A'),
-                "Timestamp": datetime.fromtimestamp(log.get('at', 0)/1000).strftime('%Y-%m-%d %H:%M:%S'),
+                "Method": method,
+                "Endpoint": endpoint,
+                "Calls": len(rows),
+                "p50 (ms)": round(_percentile([r['total'] for r in rows], 50) * 1000, 1),
+                "p95 (ms)": round(_percentile([r['total'] for r in rows], 95) * 1000, 1),
+                "p99 (ms)": round(_percentile([r['total'] for r in rows], 99) * 1000, 1),
+                "Avg DNS+Connect (ms)": round(sum(r['dns_connect'] for r in rows) / len(rows) * 1000, 1),
+                "Avg TTFB (ms)": round(sum(r['ttfb'] for r in rows) / len(rows) * 1000, 1),
+                "Avg Parse (ms)": round(sum(r['parse'] for r in rows) / len(rows) * 1000, 2),
             }
-            for log in logs
-        ])
+            for (method, endpoint), rows in by_endpoint.items()
+        ]).sort_values("p95 (ms)", ascending=False)
         st.dataframe(df, use_container_width=True)
     else:
-        st.info("No audit logs available")
+        st.info("No API calls recorded yet")
+
+    st.markdown("#### Pages")
+    by_page = {}
+    for p in page_samples:
+        by_page.setdefault(p['page'], []).append(p['seconds'])
+    if by_page:
+        df = pd.DataFrame([
+            {
+                "Page": page,
+                "Renders": len(values),
+                "p50 (ms)": round(_percentile(values, 50) * 1000, 1),
+                "p95 (ms)": round(_percentile(values, 95) * 1000, 1),
+                "Max (ms)": round(max(values) * 1000, 1),
+            }
+            for page, values in by_page.items()
+        ]).sort_values("p95 (ms)", ascending=False)
+        st.dataframe(df, use_container_width=True)
+    else:
+        st.info("No page renders recorded yet")
+
+    if imports:
+        st.markdown("#### Lazy Imports")
+        st.dataframe(pd.DataFrame([
+            {"Module": module, "First Import (ms)": round(seconds * 1000, 1)}
+            for module, seconds in sorted(imports.items())
+        ]), use_container_width=True)
+
+    figures = _figure_cache()
+    with figures["lock"]:
+        figure_hits, figure_misses, figure_entries = figures["hits"], figures["misses"], len(figures["entries"])
+    st.caption(f"Chart figure cache: {figure_hits} hits, {figure_misses} misses, "
+               f"{figure_entries}/{FIGURE_CACHE_MAX_ENTRIES} figures held")
+    breaker = _breaker()
+    with breaker["lock"]:
+        circuit = dict(breaker)
+    st.caption(f"Backend circuit: {circuit['state'].replace('_', ' ')} · {circuit['retries']} GET retries, "
+               f"{circuit['short_circuited']} calls refused while open, {circuit['stale_served']} stale answers served")
+
+    st.markdown("#### Responses by Status")
+    if request_counts:
+        df = pd.DataFrame([
+            {"Method": m, "Endpoint": e, "Status": code, "Count": count}
+            for (m, e, code), count in sorted(request_counts.items())
+        ])
+        st.dataframe(df, use_container_width=True)
+
+    st.divider()
+    prom_text = metrics_prometheus_text()
+    st.download_button(
+        label="Export Prometheus Metrics",
+        data=prom_text,
+        file_name=f"taskflow_metrics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.prom",
+        mime="text/plain"
+    )
+    with st.expander("Prometheus Text", expanded=False):
+        st.code(prom_text, language="text")
 
 # MAIN APP
+# Global Search (sidebar)
+SEARCH_PAGE_SIZE = 8
+SEARCH_TYPE_LABELS = {"task": "Task", "message": "Message", "file": "File"}
+
+def _reset_search_page():
+    st.session_state.search_page = 1
+
+def _change_search_page(delta):
+    st.session_state.search_page = max(1, st.session_state.get('search_page', 1) + delta)
+
+@st.fragment
+@page_budget()
+def search_fragment():
+    # Typing a query or paging reruns only this box, not the page that is open
+    query = st.text_input("Search", key="global_search", placeholder="Tasks, messages, files",
+                          on_change=_reset_search_page).strip()
+    if not query:
+        return
+    page = st.session_state.get('search_page', 1)
+    result = api_call("GET", f"/search?q={quote(query)}&page={page}&pageSize={SEARCH_PAGE_SIZE}")
+    if not result:
+        return
+    total = result.get('total', 0)
+    if not total:
+        st.caption("No matches")
+        return
+
+    for hit in result.get('hits', []):
+        label = SEARCH_TYPE_LABELS.get(hit.get('type'), hit.get('type', ''))
+        status = f" · {hit['status']}" if hit.get('status') else ""
+        st.markdown(f"**{hit.get('title', '')}**  \n<span style='font-size: 11px; color: #aaa;'>{label}{status}</span>",
+                    unsafe_allow_html=True)
+        if hit.get('snippet'):
+            st.caption(hit['snippet'])
+
+    pages = (total + SEARCH_PAGE_SIZE - 1) // SEARCH_PAGE_SIZE
+    st.caption(f"{total} result{'s' if total != 1 else ''} · page {page} of {pages} · {result.get('tookMs', 0):.1f} ms")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.button("Prev", key="search_prev", disabled=page <= 1, use_container_width=True,
+                  on_click=_change_search_page, args=(-1,))
+    with col2:
+        st.button("Next", key="search_next", disabled=page >= pages, use_container_width=True,
+                  on_click=_change_search_page, args=(1,))
+
 def main():
     if not st.session_state.token:
         login_page()
     else:
+        st.markdown(APP_CSS, unsafe_allow_html=True)
+
         # Professional Sidebar Navigation
         with st.sidebar:
             st.markdown("""
@@ -1135,6 +2492,12 @@ def main():
                 <p style='margin: 4px 0 0 0; font-size: 12px; color: #ddd;'>{role}</p>
             </div>
             """, unsafe_allow_html=True)
+
+            search_fragment()
+            
+            # changes queued while the backend was unreachable go out once it answers again
+            flush_outbox()
+            outbox_status()
             
             st.divider()
             
@@ -1151,6 +2514,7 @@ def main():
             if role == 'ADMIN':
                 pages["Employees"] = "employees"
                 pages["Audit Logs"] = "audit"
+                pages["Performance"] = "performance"
             elif role == 'MANAGER':
                 pages["Team"] = "employees"
             
@@ -1170,6 +2534,7 @@ def main():
             
             # Logout button
             if st.button("Logout", use_container_width=True):
+                disk_cache_forget_user()
                 st.session_state.token = None
                 st.session_state.user = None
                 st.rerun()
@@ -1189,6 +2554,8 @@ def main():
             employees_page()
         elif st.session_state.page == "audit":
             audit_page()
+        elif st.session_state.page == "performance":
+            performance_page()
 
 if __name__ == "__main__":
     main()
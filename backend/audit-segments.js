@@ -0,0 +1,52 @@
+// backend/audit-segments.js — immutable gzip'd audit segments and their time index
+// Plain fs/zlib only (no db.js) so export workers can read the archive too.
+const fs = require('fs');
+const path = require('path');
+const zlib = require('zlib');
+const crypto = require('crypto');
+
+const MANIFEST = 'index.json';
+
+// archived segments live next to the data file
+function archiveDir(dbPath) {
+  return path.join(path.dirname(dbPath), 'audit-archive');
+}
+
+// segment list sorted by time: [{ file, from, to, count, bytes, sha256 }]
+function readManifest(dir) {
+  try {
+    return JSON.parse(fs.readFileSync(path.join(dir, MANIFEST), 'utf8'));
+  } catch (e) {
+    return [];
+  }
+}
+
+function writeAtomic(file, data) {
+  const tmp = `${file}.${process.pid}.tmp`;
+  fs.writeFileSync(tmp, data);
+  fs.renameSync(tmp, file);
+}
+
+function writeManifest(dir, segments) {
+  writeAtomic(path.join(dir, MANIFEST), JSON.stringify(segments, null, 2));
+}
+
+// entries must be sorted by `at`; returns the manifest record for the new segment
+function writeSegment(dir, entries) {
+  if (!fs.existsSync(dir)) fs.mkdirSync(dir, { recursive: true });
+  const from = entries[0].at;
+  const to = entries[entries.length - 1].at;
+  const body = zlib.gzipSync(JSON.stringify(entries));
+  const file = `audit-${from}-${to}-${crypto.randomBytes(3).toString('hex')}.json.gz`;
+  writeAtomic(path.join(dir, file), body);
+  return {
+    file, from, to, count: entries.length, bytes: body.length,
+    sha256: crypto.createHash('sha256').update(body).digest('hex')
+  };
+}
+
+function readSegment(dir, segment) {
+  return JSON.parse(zlib.gunzipSync(fs.readFileSync(path.join(dir, segment.file))).toString('utf8'));
+}
+
+module.exports = { archiveDir, readManifest, writeManifest, writeSegment, readSegment };
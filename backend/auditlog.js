@@ -0,0 +1,138 @@
+// backend/auditlog.js — hot audit segment (db.data.audit) rotated into archived segments
+const db = require('./db');
+const segments = require('./audit-segments');
+const coordinator = require('./coordinator');
+
+// the hot segment is archived once it holds this many entries or its oldest entry is this old
+const SEGMENT_ENTRIES = parseInt(process.env.AUDIT_SEGMENT_ENTRIES, 10) || 5000;
+const SEGMENT_MS = parseInt(process.env.AUDIT_SEGMENT_MS, 10) || 24 * 60 * 60 * 1000;
+const ROTATE_CHECK_MS = 60 * 1000;
+const CACHED_SEGMENTS = 4;  // decompressed segments kept for repeated range queries
+const archiveDir = segments.archiveDir(db.path);
+
+// newest first; entries with the same timestamp by id, descending
+function newestFirst(a, b) {
+  if (a.at !== b.at) return b.at - a.at;
+  const x = a.id || '';
+  const y = b.id || '';
+  return x < y ? 1 : x > y ? -1 : 0;
+}
+
+const auditlog = {
+  manifest: null,
+  cache: new Map(),  // segment file -> entries, least recently used first
+  timer: null,
+  segments() {
+    if (!this.manifest) this.manifest = segments.readManifest(archiveDir);
+    return this.manifest;
+  },
+  load(segment) {
+    let entries = this.cache.get(segment.file);
+    if (entries) {
+      this.cache.delete(segment.file);
+    } else {
+      entries = segments.readSegment(archiveDir, segment);
+    }
+    this.cache.set(segment.file, entries);
+    if (this.cache.size > CACHED_SEGMENTS) this.cache.delete(this.cache.keys().next().value);
+    return entries;
+  },
+  // Move the whole hot segment into new archived segments when it is due. The segment files
+  // and the index are written before the entries leave db.json, so a crash in between can only
+  // duplicate entries (removed by reconcile()), never lose them.
+  rotate(now = Date.now()) {
+    db.read();
+    const hot = db.data.audit;
+    if (!hot.length) return 0;
+    const oldest = hot.reduce((min, e) => Math.min(min, e.at || 0), Infinity);
+    if (hot.length < SEGMENT_ENTRIES && now - oldest < SEGMENT_MS) return 0;
+    const sorted = [...hot].sort((a, b) => (a.at || 0) - (b.at || 0));
+    const manifest = this.segments().slice();
+    for (let i = 0; i < sorted.length; i += SEGMENT_ENTRIES) {
+      manifest.push(segments.writeSegment(archiveDir, sorted.slice(i, i + SEGMENT_ENTRIES)));
+    }
+    segments.writeManifest(archiveDir, manifest);
+    this.manifest = manifest;
+    db.data.audit = [];
+    db.write('audit');
+    return sorted.length;
+  },
+  // drop hot entries that already made it into an archived segment
+  reconcile() {
+    db.read();
+    const hot = db.data.audit;
+    const manifest = this.segments();
+    if (!hot.length || !manifest.length) return 0;
+    const oldest = hot.reduce((min, e) => Math.min(min, e.at || 0), Infinity);
+    const archived = new Set();
+    manifest.filter(s => s.to >= oldest).forEach(s => this.load(s).forEach(e => archived.add(e.id)));
+    const kept = hot.filter(e => !archived.has(e.id));
+    if (kept.length === hot.length) return 0;
+    db.data.audit = kept;
+    db.write('audit');
+    return hot.length - kept.length;
+  },
+  // Entries with from <= at <= to, newest first, ordered by (at, id) so entries sharing a
+  // timestamp (a due-date sweep writes many) still have a stable order. `before` is the
+  // { at, id } cursor of the previous page; only entries after it in that order match. Hot
+  // entries are always newer than archived ones, so segments are visited newest first and
+  // only while they can still change the page; segments outside the range are skipped
+  // using the index alone.
+  query({ from = 0, to = Infinity, before = { at: Infinity, id: '' }, limit = 500 } = {}) {
+    db.read();
+    const match = e => e.at >= from && e.at <= to &&
+      (e.at < before.at || (e.at === before.at && (e.id || '') < before.id));
+    const out = db.data.audit.filter(match).sort(newestFirst);
+    let scanned = 0;
+    const overlapping = this.segments()
+      .filter(s => s.to >= from && s.from <= to && s.from <= before.at)
+      .sort((a, b) => b.to - a.to);
+    for (const segment of overlapping) {
+      // every entry of this segment (and the older ones) sorts after the row past the page
+      if (out.length > limit && segment.to < out[limit].at) break;
+      scanned += 1;
+      const entries = this.load(segment);
+      for (let i = entries.length - 1; i >= 0; i--) {
+        if (match(entries[i])) out.push(entries[i]);
+      }
+      out.sort(newestFirst);
+    }
+    const page = out.slice(0, limit);
+    const last = page[page.length - 1];
+    return {
+      entries: page,
+      next: out.length > limit ? { at: last.at, id: last.id || '' } : null,
+      scannedSegments: scanned
+    };
+  },
+  summary() {
+    db.read();
+    const hot = db.data.audit;
+    return {
+      hot: {
+        count: hot.length,
+        from: hot.length ? hot.reduce((m, e) => Math.min(m, e.at), Infinity) : null,
+        to: hot.length ? hot.reduce((m, e) => Math.max(m, e.at), 0) : null
+      },
+      segments: this.segments().map(({ sha256, ...s }) => s)
+    };
+  },
+  // run by one process only (coordinator.isLeader); rotation writes, so it takes the write lock
+  start() {
+    if (this.timer) return;
+    const run = first => coordinator.withWriteLock(() => {
+      if (first) this.reconcile();
+      this.rotate();
+    }).catch(e => console.error('audit rotation failed:', e.message));
+    run(true);
+    this.timer = setInterval(() => run(false), ROTATE_CHECK_MS);
+    this.timer.unref();
+  }
+};
+
+// another worker rotated: re-read the segment index on the next query
+coordinator.onInvalidate(collections => {
+  if (collections.includes('audit')) auditlog.manifest = null;
+});
+
+module.exports = auditlog;
@@ -0,0 +1,103 @@
+// backend/cluster.js — runs server.js as a cluster of workers sharing one port
+// The primary never loads db.json. It owns the write lock, relays invalidations
+// between workers, hosts the export job pool and restarts workers that die.
+const cluster = require('cluster');
+const os = require('os');
+const path = require('path');
+const jobs = require('./jobs');
+const serverpid = require('./serverpid');
+
+const CPUS = os.availableParallelism ? os.availableParallelism() : os.cpus().length;
+const WORKERS = parseInt(process.env.BACKEND_WORKERS, 10) || Math.min(CPUS, 4);
+const RESTART_DELAY_MS = 1000;
+// methods workers may call on the primary through coordinator.call()
+const RPC = {
+  'jobs.submit': (...args) => jobs.submit(...args),
+  'jobs.list': (...args) => jobs.list(...args),
+  'jobs.status': (...args) => jobs.status(...args),
+  'jobs.artifact': (...args) => jobs.artifact(...args)
+};
+
+// Single writer: at most one worker holds the lock, the rest wait in FIFO order
+const lock = { holder: null, waiting: [] };
+let leader = null;
+let shuttingDown = false;
+
+function send(worker, msg) {
+  if (worker.isConnected()) worker.send({ taskflow: true, ...msg });
+}
+
+function grantNext() {
+  while (!lock.holder && lock.waiting.length) {
+    const next = lock.waiting.shift();
+    if (next.worker.isDead()) continue;
+    lock.holder = next.worker;
+    send(next.worker, { type: 'reply', id: next.id, result: true });
+  }
+}
+
+// tell every other worker which collections changed so they drop their parsed copy
+function broadcast(from, collections) {
+  Object.values(cluster.workers).forEach(w => {
+    if (w !== from) send(w, { type: 'invalidate', collections });
+  });
+}
+
+function release(worker, collections) {
+  if (lock.holder !== worker) return;
+  lock.holder = null;
+  if (collections && collections.length) broadcast(worker, collections);
+  grantNext();
+}
+
+function onMessage(worker, msg) {
+  if (!msg || !msg.taskflow) return;
+  if (msg.type === 'lock') {
+    lock.waiting.push({ worker, id: msg.id });
+    grantNext();
+  } else if (msg.type === 'unlock') {
+    release(worker, msg.collections);
+  } else if (msg.type === 'rpc') {
+    const fn = RPC[msg.method];
+    try {
+      if (!fn) throw new Error(`unknown method ${msg.method}`);
+      send(worker, { type: 'reply', id: msg.id, result: fn(...msg.args) });
+    } catch (e) {
+      send(worker, { type: 'reply', id: msg.id, error: e.message });
+    }
+  }
+}
+
+// one worker is the leader and runs the background writers (due-date sweep, audit rotation)
+function fork(asLeader) {
+  const worker = cluster.fork({ TASKFLOW_LEADER: asLeader ? '1' : '0' });
+  if (asLeader) leader = worker;
+  return worker;
+}
+
+cluster.setupPrimary({ exec: path.join(__dirname, 'server.js') });
+cluster.on('message', onMessage);
+cluster.on('exit', (worker, code, signal) => {
+  lock.waiting = lock.waiting.filter(w => w.worker !== worker);
+  if (lock.holder === worker) {
+    // it may have written before dying; everyone re-checks the file
+    lock.holder = null;
+    broadcast(worker, ['users', 'tasks', 'files', 'messages', 'audit', 'rollups']);
+    grantNext();
+  }
+  if (shuttingDown) return;
+  console.error(`worker ${worker.process.pid} exited (${signal || code}), restarting`);
+  const wasLeader = worker === leader;
+  setTimeout(() => fork(wasLeader), RESTART_DELAY_MS);
+});
+
+['SIGINT', 'SIGTERM'].forEach(sig => process.on(sig, () => {
+  shuttingDown = true;
+  Object.values(cluster.workers).forEach(w => w.kill(sig));
+  process.exit(0);
+}));
+
+serverpid.claim();
+jobs.start();
+console.log(`Starting ${WORKERS} backend workers (primary ${process.pid})`);
+for (let i = 0; i < WORKERS; i++) fork(i === 0);
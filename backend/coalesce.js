@@ -0,0 +1,98 @@
+// backend/coalesce.js — single-flight and a per-version memo for identical GETs
+// Route handlers run synchronously, so requests only overlap while a large response is
+// being compressed after it is built. Identical requests arriving meanwhile (same URL,
+// response mode, encoding and role, and the same ETag, i.e. the same data versions) wait
+// for that response and get a copy of its bytes instead of building and compressing their own.
+// Requests arriving after it was sent are answered from the memo below, as long as the
+// collections behind the ETag have not changed; routes without an ETag only get the
+// single flight, which does nothing for responses sent without compressing.
+
+const MEMO_ENTRIES = parseInt(process.env.COALESCE_MEMO_ENTRIES, 10) || 64;
+const MEMO_BYTES = parseInt(process.env.COALESCE_MEMO_BYTES, 10) || 32 * 1024 * 1024;
+
+const flights = new Map();  // key -> [waiting joiner callbacks]
+const memo = new Map();     // key -> shared response, least recently used first
+let memoBytes = 0;
+
+function remember(key, shared) {
+  if (shared.body.length > MEMO_BYTES) return;
+  forget(key);
+  memo.set(key, shared);
+  memoBytes += shared.body.length;
+  for (const [oldest, entry] of memo) {
+    if (memo.size <= MEMO_ENTRIES && memoBytes <= MEMO_BYTES) break;
+    memo.delete(oldest);
+    memoBytes -= entry.body.length;
+  }
+}
+
+function forget(key) {
+  const entry = memo.get(key);
+  if (!entry) return;
+  memo.delete(key);
+  memoBytes -= entry.body.length;
+}
+
+function replay(res, shared) {
+  res.status(shared.status);
+  Object.entries(shared.headers).forEach(([name, value]) => res.setHeader(name, value));
+  res.setHeader('X-Coalesced', '1');
+  res.end(shared.body);
+}
+
+function flightKey(req, res) {
+  return [
+    req.user ? req.user.role : '',
+    req.originalUrl,
+    res.getHeader('ETag') || '',
+    req.headers['x-response-mode'] || '',
+    req.headers['accept-encoding'] || ''
+  ].join('|');
+}
+
+// Only for routes whose response depends on the caller's role alone, never on who they are.
+// Must come after authMiddleware/authorize and conditional() so the key sees both.
+function coalesce() {
+  return (req, res, next) => {
+    if (req.method !== 'GET') return next();
+    const key = flightKey(req, res);
+    const versioned = Boolean(res.getHeader('ETag'));
+    const known = versioned && memo.get(key);
+    if (known) {
+      memo.delete(key);  // move to the most recently used end
+      memo.set(key, known);
+      return replay(res, known);
+    }
+    const waiting = flights.get(key);
+    if (waiting) {
+      waiting.push(shared => {
+        if (!shared) return next();  // the first request failed or was aborted; build our own
+        replay(res, shared);
+      });
+      return;
+    }
+
+    const joiners = [];
+    flights.set(key, joiners);
+    let settled = false;
+    const settle = shared => {
+      if (settled) return;
+      settled = true;
+      flights.delete(key);
+      if (shared && versioned) remember(key, shared);
+      joiners.forEach(fn => fn(shared));
+    };
+    const end = res.end;
+    res.end = function (chunk, encoding, cb) {
+      res.end = end;
+      const body = chunk === undefined || typeof chunk === 'function' ? Buffer.alloc(0)
+        : Buffer.isBuffer(chunk) ? chunk : Buffer.from(chunk, typeof encoding === 'string' ? encoding : 'utf8');
+      settle(this.statusCode === 200 ? { status: 200, headers: this.getHeaders(), body } : null);
+      return end.call(this, chunk, encoding, cb);
+    };
+    res.on('close', () => settle(null));
+    next();
+  };
+}
+
+module.exports = { coalesce };
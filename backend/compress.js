@@ -0,0 +1,79 @@
+// backend/compress.js — negotiated gzip/brotli compression and compact JSON responses
+const zlib = require('zlib');
+
+// bodies smaller than this are sent as-is; compressing them costs more than it saves
+const THRESHOLD = parseInt(process.env.COMPRESS_THRESHOLD || '1024', 10);
+
+// choose br or gzip from Accept-Encoding, honouring q-values (q=0 disables an encoding)
+function negotiate(header) {
+  let best = null;
+  let bestQ = 0;
+  (header || '').split(',').forEach(part => {
+    const [name, ...params] = part.trim().toLowerCase().split(';');
+    const qParam = params.find(p => p.trim().startsWith('q='));
+    const q = qParam ? parseFloat(qParam.trim().slice(2)) : 1;
+    if ((name === 'br' || name === 'gzip') && q > bestQ) {
+      best = name;
+      bestQ = q;
+    } else if (name === 'br' && q === bestQ && best === 'gzip') {
+      best = 'br'; // prefer brotli on a tie
+    }
+  });
+  return best;
+}
+
+// a strong ETag names one exact body, so each encoding gets its own: "<tag>-br", "<tag>-gzip"
+function encodedTag(tag, encoding) {
+  return /^".*"$/.test(tag) ? `${tag.slice(0, -1)}-${encoding}"` : tag;
+}
+
+function compression() {
+  return (req, res, next) => {
+    const send = res.send;
+    res.send = function (body) {
+      this.vary('Accept-Encoding');
+      const encoding = negotiate(req.headers['accept-encoding']);
+      const compressible = typeof body === 'string' || Buffer.isBuffer(body);
+      if (!encoding || !compressible || req.method === 'HEAD' || this.statusCode === 204 ||
+          this.statusCode === 304 || this.getHeader('Content-Encoding')) {
+        return send.call(this, body);
+      }
+      const buf = typeof body === 'string' ? Buffer.from(body, 'utf8') : body;
+      if (buf.length < THRESHOLD) return send.call(this, body);
+      if (typeof body === 'string') {
+        const type = this.get('Content-Type') || 'text/html';
+        if (!/charset=/i.test(type)) this.set('Content-Type', `${type}; charset=utf-8`);
+      }
+      const done = (err, out) => {
+        if (err) return send.call(this, body);
+        this.setHeader('Content-Encoding', encoding);
+        const etag = this.getHeader('ETag');
+        if (etag) this.setHeader('ETag', encodedTag(String(etag), encoding));
+        send.call(this, out);
+      };
+      // async so a large report doesn't block other requests while it compresses
+      if (encoding === 'br') {
+        zlib.brotliCompress(buf, { params: { [zlib.constants.BROTLI_PARAM_QUALITY]: 4 } }, done);
+      } else {
+        zlib.gzip(buf, { level: 6 }, done);
+      }
+      return this;
+    };
+    next();
+  };
+}
+
+// X-Response-Mode: compact drops null fields from JSON bodies
+function compact() {
+  return (req, res, next) => {
+    if ((req.headers['x-response-mode'] || '').toLowerCase() !== 'compact') return next();
+    res.vary('X-Response-Mode');
+    res.json = function (obj) {
+      if (!this.get('Content-Type')) this.set('Content-Type', 'application/json');
+      return this.send(JSON.stringify(obj, (key, value) => (value === null ? undefined : value)));
+    };
+    next();
+  };
+}
+
+module.exports = { compression, compact, encodedTag };
@@ -0,0 +1,95 @@
+// backend/coordinator.js — worker side of the cluster: write lock, invalidations and RPC
+// to the primary (cluster.js). Without a cluster everything runs in this process.
+const cluster = require('cluster');
+const db = require('./db');
+
+const clustered = cluster.isWorker;
+const SAFE_METHODS = new Set(['GET', 'HEAD', 'OPTIONS']);
+const WARM_DELAY_MS = 50;
+
+const pending = new Map();  // request id -> { resolve, reject }
+const listeners = [];       // called with the collections another worker changed
+const local = {};           // RPC targets when there is no primary to ask
+let nextId = 1;
+let queue = Promise.resolve();  // serializes lock holders inside this process
+let warmTimer = null;
+
+function request(type, payload = {}) {
+  const id = nextId++;
+  return new Promise((resolve, reject) => {
+    pending.set(id, { resolve, reject });
+    process.send({ taskflow: true, type, id, ...payload });
+  });
+}
+
+if (clustered) {
+  process.on('message', msg => {
+    if (!msg || !msg.taskflow) return;
+    if (msg.type === 'reply') {
+      const p = pending.get(msg.id);
+      if (!p) return;
+      pending.delete(msg.id);
+      if (msg.error) p.reject(new Error(msg.error)); else p.resolve(msg.result);
+    } else if (msg.type === 'invalidate') {
+      listeners.forEach(fn => fn(msg.collections));
+      // re-read the file shortly, off the request path, so the next request finds it parsed
+      if (!warmTimer) {
+        warmTimer = setTimeout(() => {
+          warmTimer = null;
+          db.read();
+        }, WARM_DELAY_MS);
+      }
+    }
+  });
+}
+
+const coordinator = {
+  clustered,
+  // background jobs (due-date sweep, audit rotation) run in exactly one process
+  isLeader: !clustered || process.env.TASKFLOW_LEADER === '1',
+  // Run fn while holding the cluster-wide write lock, on fresh data. Collections written
+  // meanwhile are broadcast to the other workers when the lock is released.
+  withWriteLock(fn) {
+    const run = async () => {
+      if (clustered) await request('lock');
+      const changed = new Set();
+      db.onWrite = collections => collections.forEach(c => changed.add(c));
+      try {
+        db.read();
+        return await fn();
+      } finally {
+        db.onWrite = null;
+        if (clustered) process.send({ taskflow: true, type: 'unlock', collections: [...changed] });
+      }
+    };
+    const result = queue.then(run, run);
+    queue = result.catch(() => {});
+    return result;
+  },
+  // express middleware: requests that may write hold the lock until their response is done
+  serializeWrites(exemptPaths = []) {
+    return (req, res, next) => {
+      if (SAFE_METHODS.has(req.method) || exemptPaths.includes(req.path)) return next();
+      this.withWriteLock(() => new Promise(resolve => {
+        res.on('finish', resolve);
+        res.on('close', resolve);
+        next();
+      })).catch(next);
+    };
+  },
+  onInvalidate(fn) {
+    listeners.push(fn);
+  },
+  // register RPC targets served by this process when it is not clustered
+  expose(name, target) {
+    local[name] = target;
+  },
+  // call "<name>.<method>" on the primary, or locally when not clustered
+  async call(method, ...args) {
+    if (clustered) return request('rpc', { method, args });
+    const [name, fn] = method.split('.');
+    return local[name][fn](...args);
+  }
+};
+
+module.exports = coordinator;
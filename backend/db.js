@@ -1,11 +1,15 @@
 // backend/db.js — tiny, reliable JSON file DB (no lowdb)
 const fs = require('fs');
 const path = require('path');
+const crypto = require('crypto');
 
-const dataDir = path.join(__dirname, 'data');
-if (!fs.existsSync(dataDir)) fs.mkdirSync(dataDir);
+const dbPath = require('./dbpath');
+const dataDir = path.dirname(dbPath);
+if (!fs.existsSync(dataDir)) fs.mkdirSync(dataDir, { recursive: true });
 
-const dbPath = path.join(dataDir, 'db.json');
+const COLLECTIONS = ['users', 'tasks', 'files', 'messages', 'audit', 'rollups'];
+// writes remembered in _meta.log, so a process that re-reads the file can patch its indexes
+const CHANGE_LOG_ENTRIES = 256;
 
 function initFile() {
   if (!fs.existsSync(dbPath)) {
@@ -14,11 +18,30 @@ function initFile() {
   }
 }
 
+// identity of the file on disk; when unchanged, the parsed copy in memory is still current
+function fileStamp() {
+  try {
+    const st = fs.statSync(dbPath);
+    return `${st.ino}:${st.size}:${st.mtimeMs}`;
+  } catch (e) {
+    return null;
+  }
+}
+
 const db = {
+  path: dbPath,
   data: null,
+  stamp: null,
+  onWrite: null,  // optional hook called with the collections each write() bumped
+  touched: new Map(),  // collection -> ids of records changed since the last write()
   read() {
     initFile();
+    const stamp = fileStamp();
+    if (this.data !== null && stamp !== null && stamp === this.stamp) return this.data;
     const raw = fs.readFileSync(dbPath, 'utf8') || '{}';
+    // the stamp taken before reading: if another process replaced the file since, the
+    // next read() sees a different stamp and parses again
+    this.stamp = stamp;
     try {
       this.data = JSON.parse(raw);
     } catch (e) {
@@ -32,11 +55,66 @@ const db = {
     this.data.files = this.data.files || [];
     this.data.messages = this.data.messages || [];
     this.data.audit = this.data.audit || [];
+    if (!this.data._meta) {
+      // epoch changes whenever the file is recreated, so old ETags can never match new data
+      this.data._meta = { epoch: crypto.randomBytes(6).toString('hex'), versions: {} };
+      this.write();
+    }
     return this.data;
   },
-  write() {
+  // write(...collections) bumps the version of the named collections (all of them when none are given)
+  write(...collections) {
     if (this.data === null) this.data = { users: [], tasks: [] };
-    fs.writeFileSync(dbPath, JSON.stringify(this.data, null, 2), 'utf8');
+    const meta = this.data._meta || (this.data._meta = { epoch: crypto.randomBytes(6).toString('hex'), versions: {} });
+    const bumped = collections.length ? collections : COLLECTIONS;
+    bumped.forEach(c => {
+      meta.versions[c] = (meta.versions[c] || 0) + 1;
+    });
+    // which records changed; null for a collection written without touch(), i.e. "anything"
+    const ids = {};
+    bumped.forEach(c => {
+      ids[c] = this.touched.has(c) ? [...this.touched.get(c)] : null;
+    });
+    this.touched = new Map();
+    meta.seq = (meta.seq || 0) + 1;
+    meta.log = [...(meta.log || []), { seq: meta.seq, ids }].slice(-CHANGE_LOG_ENTRIES);
+    // write-then-rename so other processes reading the file never see it half written
+    const tmp = `${dbPath}.${process.pid}.tmp`;
+    fs.writeFileSync(tmp, JSON.stringify(this.data, null, 2), 'utf8');
+    fs.renameSync(tmp, dbPath);
+    this.stamp = fileStamp();
+    if (this.onWrite) this.onWrite(bumped);
+  },
+  // touch('tasks', id, ...) before write() names the records a write changed
+  touch(collection, ...ids) {
+    if (!this.touched.has(collection)) this.touched.set(collection, new Set());
+    ids.forEach(id => this.touched.get(collection).add(id));
+  },
+  // where the data read last stands in the write log; pass it to changesSince() later
+  position() {
+    const meta = this.data._meta;
+    return { epoch: meta.epoch, seq: meta.seq || 0 };
+  },
+  // Ids of `collection` records written since `since` (an earlier position()), or null when
+  // that is unknown: the file was recreated, the log no longer reaches back that far, or a
+  // write did not touch() the records it changed.
+  changesSince(since, collection) {
+    const meta = this.data._meta;
+    if (!since || since.epoch !== meta.epoch || since.seq > (meta.seq || 0)) return null;
+    const log = (meta.log || []).filter(e => e.seq > since.seq);
+    if (log.length !== (meta.seq || 0) - since.seq) return null;
+    const ids = new Set();
+    for (const entry of log) {
+      if (!(collection in entry.ids)) continue;
+      if (entry.ids[collection] === null) return null;
+      entry.ids[collection].forEach(id => ids.add(id));
+    }
+    return ids;
+  },
+  // version tag covering the given collections, e.g. "3f9a1c-12.4"
+  version(...collections) {
+    const meta = this.data._meta;
+    return `${meta.epoch}-${collections.map(c => meta.versions[c] || 0).join('.')}`;
   }
 };
 
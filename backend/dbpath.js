@@ -0,0 +1,5 @@
+// backend/dbpath.js — location of the JSON data file, without loading it
+const path = require('path');
+
+// DB_PATH points the server at another data file (e.g. a generated benchmark dataset)
+module.exports = process.env.DB_PATH ? path.resolve(process.env.DB_PATH) : path.join(__dirname, 'data', 'db.json');
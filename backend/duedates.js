@@ -0,0 +1,136 @@
+// backend/duedates.js — sorted due-date index of open tasks plus the overdue sweep
+const { nanoid } = require('nanoid');
+const db = require('./db');
+const coordinator = require('./coordinator');
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+const SWEEP_INTERVAL_MS = parseInt(process.env.DUE_SWEEP_MS, 10) || 60 * 1000;
+
+// entries are ordered by (dueDate, id); returns the first position not before (dueDate, id)
+function position(entries, dueDate, id = '') {
+  let lo = 0, hi = entries.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    const e = entries[mid];
+    if (e.dueDate < dueDate || (e.dueDate === dueDate && e.id < id)) lo = mid + 1; else hi = mid;
+  }
+  return lo;
+}
+
+function indexed(task) {
+  return task && task.dueDate && task.status !== 'DONE';
+}
+
+function summary(task) {
+  return {
+    id: task.id, title: task.title, status: task.status, priority: task.priority,
+    assigneeId: task.assigneeId, dueDate: task.dueDate, overdueAt: task.overdueAt || null
+  };
+}
+
+// Like workload.js the index is memory-only: patched through apply() by the task routes and,
+// after db.read() loads a new copy of the data file, for the tasks its write log names.
+// Entries hold a summary of the task rather than the task itself, so they never pin an old
+// copy of the data.
+const duedates = {
+  source: null,
+  at: null,        // db.position() the index reflects
+  entries: [],
+  due: new Map(),  // task id -> dueDate of its entry
+  sweptUntil: 0,   // every entry due before this has been considered by sweep()
+  late: [],        // entries added with a due date already behind sweptUntil
+  timer: null,
+  ensure() {
+    db.read();
+    if (this.source !== db.data) {
+      const changed = db.changesSince(this.at, 'tasks');
+      if (changed) {
+        changed.forEach(id => this.forget(id));
+        if (changed.size) db.data.tasks.forEach(t => changed.has(t.id) && this.add(t));
+      } else {
+        this.entries = db.data.tasks.filter(indexed)
+          .map(t => ({ dueDate: t.dueDate, id: t.id, task: summary(t) }))
+          .sort((a, b) => a.dueDate - b.dueDate || (a.id < b.id ? -1 : a.id > b.id ? 1 : 0));
+        this.due = new Map(this.entries.map(e => [e.id, e.dueDate]));
+        this.sweptUntil = 0;
+        this.late = [];
+      }
+      this.source = db.data;
+    }
+    this.at = db.position();
+    return this.entries;
+  },
+  add(task) {
+    this.forget(task.id);
+    if (!indexed(task)) return;
+    const entry = { dueDate: task.dueDate, id: task.id, task: summary(task) };
+    this.entries.splice(position(this.entries, task.dueDate, task.id), 0, entry);
+    this.due.set(task.id, task.dueDate);
+    if (task.dueDate < this.sweptUntil && !task.overdueAt) this.late.push(entry);
+  },
+  forget(id) {
+    const dueDate = this.due.get(id);
+    if (dueDate === undefined) return;
+    this.due.delete(id);
+    const i = position(this.entries, dueDate, id);
+    if (this.entries[i] && this.entries[i].id === id) this.entries.splice(i, 1);
+  },
+  // Call after changing db.data.tasks in memory; before/after as in workload.apply()
+  apply(before, after) {
+    this.ensure();
+    if (before) this.forget(before.id);
+    if (after) this.add(after);
+  },
+  // oldest-due first; only the first `limit` entries are touched
+  overdue(now = Date.now(), limit = 10) {
+    const entries = this.ensure();
+    const end = position(entries, now);
+    return { count: end, tasks: entries.slice(0, Math.min(end, limit)).map(e => ({ ...e.task })) };
+  },
+  dueBetween(from, to, limit = 10) {
+    const entries = this.ensure();
+    const start = position(entries, from);
+    const end = position(entries, to);
+    return { count: end - start, tasks: entries.slice(start, Math.min(end, start + limit)).map(e => ({ ...e.task })) };
+  },
+  dueThisWeek(now = Date.now(), limit = 10) {
+    return this.dueBetween(now, now + 7 * DAY_MS, limit);
+  },
+  // Flag tasks whose due date passed since the last sweep: sets task.overdueAt and writes a
+  // TASK_OVERDUE audit entry. Only the newly crossed slice of the index is visited.
+  sweep(now = Date.now()) {
+    const entries = this.ensure();
+    const start = position(entries, this.sweptUntil);
+    const end = position(entries, now);
+    const crossed = entries.slice(start, end);
+    // late entries still count only while they are in the index
+    this.late.forEach(e => { if (e.dueDate < now && this.due.get(e.id) === e.dueDate) crossed.push(e); });
+    this.late = [];
+    this.sweptUntil = now;
+    const flagged = new Map(crossed.filter(e => !e.task.overdueAt).map(e => [e.id, e]));
+    if (!flagged.size) return 0;
+    let count = 0;
+    db.data.tasks.forEach(t => {
+      const entry = flagged.get(t.id);
+      if (!entry || t.overdueAt) return;
+      t.overdueAt = now;
+      entry.task.overdueAt = now;
+      db.data.audit.push({ id: nanoid(), action: 'TASK_OVERDUE', by: null, target: t.id, at: now });
+      db.touch('tasks', t.id);
+      count += 1;
+    });
+    if (count) db.write('tasks', 'audit');
+    return count;
+  },
+  // run by one process only (coordinator.isLeader); sweeps write, so they take the write lock
+  start(intervalMs = SWEEP_INTERVAL_MS) {
+    if (this.timer) return;
+    const run = () => coordinator.withWriteLock(() => this.sweep())
+      .catch(e => console.error('due-date sweep failed:', e.message));
+    run();
+    this.timer = setInterval(run, intervalMs);
+    this.timer.unref();
+  }
+};
+
+module.exports = duedates;
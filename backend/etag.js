@@ -0,0 +1,41 @@
+// backend/etag.js — strong ETags derived from collection versions
+const crypto = require('crypto');
+const db = require('./db');
+const { encodedTag } = require('./compress');
+
+function check(collections, scopeOf) {
+  return (req, res, next) => {
+    db.read();
+    const scope = crypto.createHash('sha1').update(scopeOf(req)).digest('base64url').slice(0, 10);
+    const tag = `"${db.version(...collections)}-${scope}"`;
+    res.setHeader('ETag', tag);
+    const inm = req.headers['if-none-match'];
+    if (inm) {
+      // the client may hold the compressed variant of the same version
+      const variants = [tag, encodedTag(tag, 'br'), encodedTag(tag, 'gzip')];
+      const matched = inm.split(',').map(t => t.trim()).find(t => variants.includes(t));
+      if (matched) {
+        res.setHeader('ETag', matched);
+        return res.status(304).end();
+      }
+    }
+    next();
+  };
+}
+
+function requestScope(req) {
+  return `${req.originalUrl}|${req.headers['x-response-mode'] || ''}`;
+}
+
+// conditional('tasks', 'users') answers 304 when the client's copy matches the current
+// collection versions, before the route does any filtering or serialization
+function conditional(...collections) {
+  return check(collections, requestScope);
+}
+
+// the same for responses shaped by the caller's role (after authMiddleware)
+function conditionalByRole(...collections) {
+  return check(collections, req => `${requestScope(req)}|${req.user.role}`);
+}
+
+module.exports = { conditional, conditionalByRole };
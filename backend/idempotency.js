@@ -0,0 +1,104 @@
+// backend/idempotency.js — replay-safe mutations keyed by the Idempotency-Key header
+// A mutation sent again with a key the backend has already answered (say the first answer
+// was lost on the way back) gets the stored answer instead of being applied twice.
+// Answers live in a small file next to db.json so every cluster worker and restarts see
+// them; it is only read and written while the write lock is held.
+const fs = require('fs');
+const path = require('path');
+const dbPath = require('./dbpath');
+const { verifyToken } = require('./auth');
+
+const FILE = path.join(path.dirname(dbPath), 'idempotency.json');
+const MAX_ENTRIES = parseInt(process.env.IDEMPOTENCY_MAX_ENTRIES, 10) || 5000;
+const TTL_MS = parseInt(process.env.IDEMPOTENCY_TTL_MS, 10) || 24 * 60 * 60 * 1000;
+const SAFE_METHODS = new Set(['GET', 'HEAD', 'OPTIONS']);
+
+const store = { stamp: null, entries: {} };  // "<user id>:<key>" -> { method, path, status, body, at }
+
+function stampOf() {
+  try {
+    const st = fs.statSync(FILE);
+    return `${st.ino}:${st.size}:${st.mtimeMs}`;
+  } catch (e) {
+    return null;
+  }
+}
+
+function load() {
+  const stamp = stampOf();
+  if (stamp === store.stamp) return store.entries;
+  try {
+    store.entries = JSON.parse(fs.readFileSync(FILE, 'utf8'));
+  } catch (e) {
+    store.entries = {};
+  }
+  store.stamp = stamp;
+  return store.entries;
+}
+
+// drop expired answers, then the oldest ones over MAX_ENTRIES
+function prune(entries, now) {
+  let keys = Object.keys(entries).filter(k => {
+    if (now - entries[k].at <= TTL_MS) return true;
+    delete entries[k];
+    return false;
+  });
+  if (keys.length > MAX_ENTRIES) {
+    keys.sort((a, b) => entries[a].at - entries[b].at);
+    keys.slice(0, keys.length - MAX_ENTRIES).forEach(k => delete entries[k]);
+  }
+}
+
+function save(entries) {
+  const tmp = `${FILE}.${process.pid}.tmp`;
+  fs.writeFileSync(tmp, JSON.stringify(entries), 'utf8');
+  fs.renameSync(tmp, FILE);
+  store.stamp = stampOf();
+}
+
+// keys are scoped to the caller so one user can never read another's stored answer
+function callerId(req) {
+  const parts = (req.headers.authorization || '').split(' ');
+  if (parts.length !== 2 || parts[0] !== 'Bearer') return null;
+  try {
+    return verifyToken(parts[1]).id;
+  } catch (e) {
+    return null;
+  }
+}
+
+// express middleware; must run under coordinator.serializeWrites so check-then-store is atomic,
+// given the same exemptPaths so requests running without the lock are passed straight through
+function idempotent(exemptPaths = []) {
+  return (req, res, next) => {
+    const key = req.headers['idempotency-key'];
+    if (!key || SAFE_METHODS.has(req.method) || exemptPaths.includes(req.path)) return next();
+    const userId = callerId(req);
+    if (!userId) return next();  // the route answers 401 itself
+    const id = `${userId}:${key}`;
+    const seen = load()[id];
+    if (seen) {
+      if (seen.method !== req.method || seen.path !== req.originalUrl) {
+        return res.status(422).json({ error: 'Idempotency-Key was already used for a different request' });
+      }
+      res.setHeader('Idempotent-Replayed', 'true');
+      return res.status(seen.status).json(seen.body);
+    }
+    const json = res.json;
+    res.json = function (body) {
+      res.json = json;
+      // server errors are not remembered, so the client may retry them
+      if (this.statusCode < 500) {
+        const entries = load();
+        const now = Date.now();
+        entries[id] = { method: req.method, path: req.originalUrl, status: this.statusCode, body, at: now };
+        prune(entries, now);
+        save(entries);
+      }
+      return json.call(this, body);
+    };
+    next();
+  };
+}
+
+module.exports = { idempotent, storeFile: FILE };
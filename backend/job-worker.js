@@ -0,0 +1,74 @@
+// backend/job-worker.js — builds one report/export artifact off the server's main thread
+const fs = require('fs');
+const { parentPort, workerData } = require('worker_threads');
+const segments = require('./audit-segments');
+
+const PROGRESS_EVERY = 5000; // rows between progress messages
+
+// db.write() replaces the file with a rename, but the file may be missing or replaced
+// mid-read on some filesystems; retry a few times before giving up.
+function loadData(dbPath) {
+  let lastError;
+  for (let attempt = 0; attempt < 5; attempt++) {
+    try {
+      return JSON.parse(fs.readFileSync(dbPath, 'utf8'));
+    } catch (e) {
+      lastError = e;
+      Atomics.wait(new Int32Array(new SharedArrayBuffer(4)), 0, 0, 200);
+    }
+  }
+  throw lastError;
+}
+
+function csvCell(value) {
+  if (value === null || value === undefined) return '';
+  const s = String(value);
+  return /[",\n]/.test(s) ? `"${s.replace(/"/g, '""')}"` : s;
+}
+
+// kind -> { columns, rows(data) }
+const KINDS = {
+  tasks: {
+    columns: ['id', 'title', 'status', 'priority', 'assigneeId', 'dueDate', 'createdAt', 'updatedAt'],
+    rows: data => data.tasks || []
+  },
+  audit: {
+    columns: ['id', 'action', 'by', 'target', 'at'],
+    // archived segments (oldest first) followed by the hot segment still in db.json
+    rows: (data, dbPath) => {
+      const dir = segments.archiveDir(dbPath);
+      const archived = segments.readManifest(dir).map(s => segments.readSegment(dir, s));
+      return [].concat(...archived, data.audit || []);
+    }
+  }
+};
+
+function build({ kind, format, dbPath, outPath }) {
+  const spec = KINDS[kind];
+  const rows = spec.rows(loadData(dbPath), dbPath);
+  const out = fs.openSync(outPath, 'w');
+  let buffer = format === 'csv' ? spec.columns.join(',') + '\n' : '[';
+  try {
+    rows.forEach((row, i) => {
+      if (format === 'csv') {
+        buffer += spec.columns.map(c => csvCell(row[c])).join(',') + '\n';
+      } else {
+        const picked = {};
+        spec.columns.forEach(c => { picked[c] = row[c] === undefined ? null : row[c]; });
+        buffer += (i ? ',' : '') + JSON.stringify(picked);
+      }
+      if ((i + 1) % PROGRESS_EVERY === 0) {
+        fs.writeSync(out, buffer);
+        buffer = '';
+        parentPort.postMessage({ progress: (i + 1) / rows.length });
+      }
+    });
+    if (format === 'json') buffer += ']';
+    fs.writeSync(out, buffer);
+  } finally {
+    fs.closeSync(out);
+  }
+  return { rows: rows.length, size: fs.statSync(outPath).size };
+}
+
+parentPort.postMessage({ done: true, ...build(workerData) });
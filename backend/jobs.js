@@ -0,0 +1,123 @@
+// backend/jobs.js — queued report/export jobs run by a bounded pool of worker threads
+const fs = require('fs');
+const path = require('path');
+const { Worker } = require('worker_threads');
+const { nanoid } = require('nanoid');
+const dbPath = require('./dbpath');
+
+const CONCURRENCY = parseInt(process.env.JOB_CONCURRENCY, 10) || 2;
+const QUEUE_LIMIT = parseInt(process.env.JOB_QUEUE_LIMIT, 10) || 20;
+const RETENTION_MS = parseInt(process.env.JOB_RETENTION_MS, 10) || 60 * 60 * 1000;
+const jobsDir = path.join(path.dirname(dbPath), 'report-jobs');
+
+// kind -> roles allowed to run it and the formats the worker can produce
+const KINDS = {
+  tasks: { roles: ['ADMIN', 'MANAGER', 'EMPLOYEE'], formats: ['csv', 'json'] },
+  audit: { roles: ['ADMIN'], formats: ['csv', 'json'] }
+};
+const CONTENT_TYPES = { csv: 'text/csv', json: 'application/json' };
+
+// public view of a job (no file paths)
+function describe(job) {
+  const { outPath, ...rest } = job;
+  return rest;
+}
+
+const jobs = {
+  all: new Map(),  // id -> job, insertion ordered
+  queue: [],       // ids waiting for a worker
+  running: 0,
+  timer: null,
+  // returns { job } or { error, status }
+  submit(user, kind, format) {
+    const spec = KINDS[kind];
+    if (!spec) return { status: 400, error: `unknown kind: ${kind}` };
+    if (!spec.roles.includes(user.role)) return { status: 403, error: 'Forbidden' };
+    if (!spec.formats.includes(format)) return { status: 400, error: `format must be one of ${spec.formats.join(', ')}` };
+    if (this.queue.length >= QUEUE_LIMIT) return { status: 429, error: 'Too many queued jobs, try again shortly' };
+    if (!fs.existsSync(jobsDir)) fs.mkdirSync(jobsDir, { recursive: true });
+    const id = nanoid();
+    const now = Date.now();
+    const job = {
+      id, kind, format, status: 'queued', progress: 0, rows: null, size: null, error: null,
+      fileName: `${kind}_report_${new Date(now).toISOString().slice(0, 10).replace(/-/g, '')}.${format}`,
+      contentType: CONTENT_TYPES[format], createdBy: user.id, createdAt: now, startedAt: null, finishedAt: null,
+      outPath: path.join(jobsDir, `${id}.${format}`)
+    };
+    this.all.set(id, job);
+    this.queue.push(id);
+    this.pump();
+    return { job: describe(job) };
+  },
+  // start queued jobs while fewer than CONCURRENCY workers are busy
+  pump() {
+    while (this.running < CONCURRENCY && this.queue.length) {
+      const job = this.all.get(this.queue.shift());
+      if (job) this.run(job);
+    }
+  },
+  run(job) {
+    this.running += 1;
+    job.status = 'running';
+    job.startedAt = Date.now();
+    let settled = false;
+    const finish = (status, fields) => {
+      if (settled) return;
+      settled = true;
+      Object.assign(job, fields, { status, finishedAt: Date.now() });
+      if (status === 'failed') fs.rm(job.outPath, { force: true }, () => {});
+      this.running -= 1;
+      this.pump();
+    };
+    const worker = new Worker(path.join(__dirname, 'job-worker.js'), {
+      workerData: { kind: job.kind, format: job.format, dbPath, outPath: job.outPath }
+    });
+    worker.on('message', msg => {
+      if (msg.done) finish('done', { progress: 1, rows: msg.rows, size: msg.size });
+      else if (msg.progress !== undefined) job.progress = msg.progress;
+    });
+    worker.on('error', err => finish('failed', { error: err.message }));
+    worker.on('exit', code => {
+      if (code !== 0) finish('failed', { error: `worker exited with code ${code}` });
+    });
+  },
+  // owners see their own jobs; admins see everyone's
+  visible(user, job) {
+    return job && (job.createdBy === user.id || user.role === 'ADMIN');
+  },
+  status(user, id) {
+    const job = this.all.get(id);
+    return this.visible(user, job) ? describe(job) : null;
+  },
+  // what the download route needs to serve a job's file
+  artifact(user, id) {
+    const job = this.all.get(id);
+    if (!this.visible(user, job)) return null;
+    return { status: job.status, outPath: job.outPath, fileName: job.fileName, contentType: job.contentType };
+  },
+  list(user) {
+    return [...this.all.values()].filter(j => this.visible(user, j)).reverse().map(describe);
+  },
+  // drop finished jobs (and their files) once they are older than RETENTION_MS
+  expire(now = Date.now()) {
+    this.all.forEach((job, id) => {
+      if (job.finishedAt && now - job.finishedAt > RETENTION_MS) {
+        fs.rm(job.outPath, { force: true }, () => {});
+        this.all.delete(id);
+      }
+    });
+  },
+  start() {
+    if (this.timer) return;
+    // artifacts left over from a previous run have no job record any more
+    if (fs.existsSync(jobsDir)) {
+      fs.readdirSync(jobsDir)
+        .filter(name => /^[\w-]+\.(csv|json)$/.test(name))
+        .forEach(name => fs.rmSync(path.join(jobsDir, name), { force: true }));
+    }
+    this.timer = setInterval(() => this.expire(), Math.min(RETENTION_MS, 60 * 1000));
+    this.timer.unref();
+  }
+};
+
+module.exports = jobs;
@@ -0,0 +1,165 @@
+// backend/rollups.js — daily task throughput buckets, kept up to date from task writes
+const db = require('./db');
+const coordinator = require('./coordinator');
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+// buckets are keyed by UTC day, e.g. "2024-05-31"
+function dayKey(ms) {
+  return new Date(ms).toISOString().slice(0, 10);
+}
+
+function bucketFor(rollups, at) {
+  const key = dayKey(at);
+  if (!rollups.days[key]) rollups.days[key] = { created: 0, completed: 0, leadTimeMs: 0, byStatus: {}, byAssignee: {} };
+  return rollups.days[key];
+}
+
+function assigneeEntry(bucket, assigneeId) {
+  const key = assigneeId || 'unassigned';
+  if (!bucket.byAssignee[key]) bucket.byAssignee[key] = { created: 0, completed: 0, leadTimeMs: 0 };
+  return bucket.byAssignee[key];
+}
+
+// byStatus counts the status changes made on a day (creation counts as TODO); they stay
+// counted when the task changes again or is deleted
+function addStatus(rollups, status, at) {
+  const bucket = bucketFor(rollups, at);
+  bucket.byStatus[status] = (bucket.byStatus[status] || 0) + 1;
+}
+
+// Add (sign 1) or take back (sign -1) what one task counts for: its creation, and its completion
+// while it is DONE. Tasks completed before completedAt existed count as done at their last update.
+function contribute(rollups, task, sign) {
+  if (!task.createdAt) return;
+  const created = bucketFor(rollups, task.createdAt);
+  created.created += sign;
+  assigneeEntry(created, task.assigneeId).created += sign;
+  if (task.status !== 'DONE') return;
+  const at = task.completedAt || task.updatedAt || task.createdAt;
+  const leadTime = Math.max(0, at - task.createdAt);
+  const bucket = bucketFor(rollups, at);
+  const entry = assigneeEntry(bucket, task.assigneeId);
+  bucket.completed += sign;
+  bucket.leadTimeMs += sign * leadTime;
+  entry.completed += sign;
+  entry.leadTimeMs += sign * leadTime;
+}
+
+// One pass over existing tasks for data files written before rollups existed. Only the current
+// status is known, so it is counted as one change at the task's last update.
+function rebuild(tasks) {
+  const rollups = { days: {} };
+  tasks.forEach(t => {
+    if (!t.createdAt) return;
+    contribute(rollups, t, 1);
+    addStatus(rollups, 'TODO', t.createdAt);
+    if (t.status && t.status !== 'TODO') addStatus(rollups, t.status, t.updatedAt || t.createdAt);
+  });
+  return rollups;
+}
+
+// backfills built by ensure() that are not in the data file yet
+const unsaved = new WeakSet();
+let saving = null;
+
+const rollups = {
+  // current rollups, built from the task list the first time they are needed
+  ensure() {
+    db.read();
+    if (!this.built()) {
+      db.data.rollups = rebuild(db.data.tasks);
+      unsaved.add(db.data.rollups);
+      this.saveBackfill();
+    }
+    return db.data.rollups;
+  },
+  // Write a backfill ensure() built. Reads may not hold the write lock, so this queues for it;
+  // on fresh data the backfill may already be saved (by a task write or another worker).
+  saveBackfill() {
+    if (saving) return saving;
+    saving = coordinator.withWriteLock(() => {
+      if (!this.built()) {
+        db.data.rollups = rebuild(db.data.tasks);
+        unsaved.add(db.data.rollups);
+      }
+      if (unsaved.has(db.data.rollups)) {
+        unsaved.delete(db.data.rollups);
+        db.write('rollups');
+      }
+    }).finally(() => { saving = null; });
+    return saving;
+  },
+  // The record* helpers only touch memory; callers persist with db.write('tasks', 'rollups').
+  // They run after the task itself changed, so a backfill built on this call already has it.
+  recordCreated(task) {
+    this.recordChange(null, task);
+  },
+  // before: a copy of the task as it was. Only a change into DONE counts as a completion,
+  // dated task.completedAt (set here); leaving DONE takes it back.
+  recordChange(before, task) {
+    if (task.status === 'DONE') {
+      task.completedAt = before && before.status === 'DONE'
+        ? before.completedAt || before.updatedAt
+        : task.updatedAt || Date.now();
+    } else {
+      delete task.completedAt;
+    }
+    const backfill = !this.built();
+    const store = this.ensure();
+    unsaved.delete(store);  // the caller's write saves it
+    if (backfill) return;
+    if (before) contribute(store, before, -1);
+    contribute(store, task, 1);
+    if (!before) addStatus(store, 'TODO', task.createdAt || Date.now());
+    else if (task.status !== before.status) addStatus(store, task.status, task.updatedAt || Date.now());
+  },
+  // the task was deleted (and is gone from db.data.tasks): take back its creation and any completion
+  recordDeleted(task) {
+    const backfill = !this.built();
+    const store = this.ensure();
+    unsaved.delete(store);
+    if (!backfill) contribute(store, task, -1);
+  },
+  built() {
+    return Boolean(db.data.rollups && db.data.rollups.days);
+  },
+  // daily series for the last `days` days (oldest first), optionally narrowed to one assignee
+  series(days, assigneeId) {
+    const store = this.ensure();
+    const today = Date.parse(dayKey(Date.now()));
+    const out = [];
+    for (let i = days - 1; i >= 0; i--) {
+      const date = dayKey(today - i * DAY_MS);
+      const bucket = store.days[date];
+      let row = { date, created: 0, completed: 0, leadTimeMs: 0, byStatus: {} };
+      if (bucket && assigneeId) {
+        const entry = bucket.byAssignee[assigneeId];
+        if (entry) row = { date, created: entry.created, completed: entry.completed, leadTimeMs: entry.leadTimeMs, byStatus: {} };
+      } else if (bucket) {
+        row = { date, created: bucket.created, completed: bucket.completed, leadTimeMs: bucket.leadTimeMs, byStatus: { ...bucket.byStatus } };
+      }
+      out.push(row);
+    }
+    return out;
+  },
+  // created/completed totals per assignee over the last `days` days
+  assignees(days) {
+    const store = this.ensure();
+    const today = Date.parse(dayKey(Date.now()));
+    const totals = {};
+    for (let i = 0; i < days; i++) {
+      const bucket = store.days[dayKey(today - i * DAY_MS)];
+      if (!bucket) continue;
+      Object.entries(bucket.byAssignee).forEach(([id, entry]) => {
+        const t = totals[id] || (totals[id] = { assigneeId: id, created: 0, completed: 0, leadTimeMs: 0 });
+        t.created += entry.created;
+        t.completed += entry.completed;
+        t.leadTimeMs += entry.leadTimeMs;
+      });
+    }
+    return Object.values(totals);
+  }
+};
+
+module.exports = rollups;
@@ -2,11 +2,43 @@ const express = require('express');
 const router = express.Router();
 const db = require('../db');
 const { authorize } = require('../auth');
+const { conditional } = require('../etag');
+const auditlog = require('../auditlog');
 
-// GET /api/audit - admin only
-router.get('/', authorize('ADMIN'), (req, res) => {
+const DEFAULT_LIMIT = 500;
+const MAX_LIMIT = 5000;
+
+function timeParam(value, fallback) {
+  const n = parseInt(value, 10);
+  return Number.isNaN(n) ? fallback : n;
+}
+
+// "<at>:<id>" from X-Audit-Next-Before; a bare timestamp means strictly older than it
+function cursorParam(value) {
+  const [at, id = ''] = String(value || '').split(':');
+  return { at: timeParam(at, Infinity), id };
+}
+
+// GET /api/audit?from=&to=&before=&limit= - admin only
+// Newest first; times are epoch ms. When more entries match, X-Audit-Next-Before holds the
+// cursor ("<at>:<id>" of the last entry returned) to pass as ?before= for the next page.
+router.get('/', authorize('ADMIN'), conditional('audit'), (req, res) => {
+  const limit = Math.min(Math.max(timeParam(req.query.limit, DEFAULT_LIMIT), 1), MAX_LIMIT);
+  const result = auditlog.query({
+    from: timeParam(req.query.from, 0),
+    to: timeParam(req.query.to, Infinity),
+    before: cursorParam(req.query.before),
+    limit
+  });
+  if (result.next !== null) res.setHeader('X-Audit-Next-Before', `${result.next.at}:${result.next.id}`);
+  res.setHeader('X-Audit-Segments-Scanned', String(result.scannedSegments));
+  res.json(result.entries);
+});
+
+// GET /api/audit/segments - hot segment size and the archived segment time index
+router.get('/segments', authorize('ADMIN'), (req, res) => {
   db.read();
-  res.json(db.data.audit || []);
+  res.json(auditlog.summary());
 });
 
 module.exports = router;
@@ -2,9 +2,23 @@
 const express = require('express');
 const router = express.Router();
 const db = require('../db');
-const { authMiddleware } = require('../auth');
+const { authMiddleware, authorize } = require('../auth');
+const { conditional, conditionalByRole } = require('../etag');
+const { coalesce } = require('../coalesce');
+const workload = require('../workload');
+const duedates = require('../duedates');
 
-router.get('/summary', authMiddleware, (req, res) => {
+// id -> fullName, rebuilt only when the users collection changes
+let userNames = { version: null, names: new Map() };
+function namesById() {
+  const version = db.version('users');
+  if (userNames.version !== version) {
+    userNames = { version, names: new Map(db.data.users.map(u => [u.id, u.fullName])) };
+  }
+  return userNames.names;
+}
+
+router.get('/summary', authMiddleware, conditional('tasks', 'users'), coalesce(), (req, res) => {
   db.read();
   const total = db.data.tasks.length;
   const users = db.data.users.length;
@@ -16,4 +30,81 @@ router.get('/summary', authMiddleware, (req, res) => {
   res.json({ totalTasks: total, byStatus, users });
 });
 
+// Dashboard view models: everything one role's dashboard shows except the due-date and
+// workload sections, so the page needs no whole collections
+const RECENT_TASKS = 10;
+const views = new Map();  // role -> { version, view }, rebuilt when tasks or users change
+
+// the n newest tasks without sorting the whole list
+function newestTasks(tasks, n) {
+  const newest = [];
+  tasks.forEach(t => {
+    if (newest.length === n && t.createdAt <= newest[n - 1].createdAt) return;
+    let i = newest.length;
+    while (i > 0 && newest[i - 1].createdAt < t.createdAt) i--;
+    newest.splice(i, 0, t);
+    if (newest.length > n) newest.pop();
+  });
+  return newest;
+}
+
+function countBy(items, field, key, fallback) {
+  const counts = new Map();
+  items.forEach(item => {
+    const value = item[field] || fallback;
+    counts.set(value, (counts.get(value) || 0) + 1);
+  });
+  return [...counts].map(([value, cnt]) => ({ [key]: value, cnt }));
+}
+
+function buildView(role) {
+  const tasks = db.data.tasks;
+  const view = {
+    role,
+    totalTasks: tasks.length,
+    byStatus: countBy(tasks, 'status', 'status', 'TODO'),
+    recentTasks: newestTasks(tasks, RECENT_TASKS)
+  };
+  if (role === 'ADMIN') {
+    view.users = db.data.users.length;
+    view.byRole = countBy(db.data.users, 'role', 'role', 'EMPLOYEE');
+  } else if (role === 'MANAGER') {
+    view.byPriority = countBy(tasks, 'priority', 'priority', 3).sort((a, b) => a.priority - b.priority);
+  }
+  return view;
+}
+
+// GET /api/dashboard/view
+// The caller's role decides the shape; cached per role until tasks or users change
+router.get('/view', authMiddleware, conditionalByRole('tasks', 'users'), coalesce(), (req, res) => {
+  db.read();
+  const role = req.user.role;
+  const version = db.version('tasks', 'users');
+  let entry = views.get(role);
+  if (!entry || entry.version !== version) {
+    entry = { version, view: buildView(role) };
+    views.set(role, entry);
+  }
+  res.json(entry.view);
+});
+
+// GET /api/dashboard/workload (Admin or Manager)
+// One row per assignee with open tasks, read from counters kept by the task routes
+router.get('/workload', authorize('ADMIN', 'MANAGER'), coalesce(), (req, res) => {
+  db.read();
+  const names = namesById();
+  const rows = workload.snapshot()
+    .map(r => ({ ...r, fullName: names.get(r.assigneeId) || null, avgAgeDays: Math.round(r.avgAgeDays * 10) / 10 }))
+    .sort((a, b) => b.open - a.open);
+  res.json({ generatedAt: Date.now(), assignees: rows });
+});
+
+// GET /api/dashboard/due?limit=10
+// Overdue and due-this-week tasks straight from the due-date index; only `limit` rows are read
+router.get('/due', authMiddleware, coalesce(), (req, res) => {
+  const limit = Math.min(Math.max(parseInt(req.query.limit, 10) || 10, 1), 100);
+  const now = Date.now();
+  res.json({ now, overdue: duedates.overdue(now, limit), dueThisWeek: duedates.dueThisWeek(now, limit) });
+});
+
 module.exports = router;
@@ -3,6 +3,9 @@ const router = express.Router();
 const db = require('../db');
 const { authMiddleware } = require('../auth');
 const { nanoid } = require('nanoid');
+const { conditional } = require('../etag');
+const { coalesce } = require('../coalesce');
+const search = require('../search');
 
 // POST /api/files  { name, contentBase64 }
 router.post('/', authMiddleware, (req, res) => {
@@ -13,13 +16,15 @@ router.post('/', authMiddleware, (req, res) => {
   const now = Date.now();
   const file = { id, name, contentBase64, versions: [{ ver:1, contentBase64, uploadedAt: now }], uploadedBy: req.user.id, createdAt: now };
   db.data.files.push(file);
+  search.upsert('file', file);
   db.data.audit.push({ id: nanoid(), action: 'UPLOAD_FILE', by: req.user.id, target: id, at: now });
-  db.write();
+  db.touch('files', id);
+  db.write('files', 'audit');
   res.json({ id, name, uploadedBy: req.user.id, createdAt: now });
 });
 
 // GET /api/files
-router.get('/', authMiddleware, (req, res) => {
+router.get('/', authMiddleware, conditional('files'), coalesce(), (req, res) => {
   db.read();
   res.json(db.data.files.map(f => ({ id: f.id, name: f.name, uploadedBy: f.uploadedBy, createdAt: f.createdAt, versions: f.versions.length })));
 });
@@ -0,0 +1,57 @@
+const express = require('express');
+const router = express.Router();
+const { authMiddleware } = require('../auth');
+const coordinator = require('../coordinator');
+
+// Jobs live in one process (the cluster primary, or this server when it runs alone), so
+// every call goes through coordinator.call().
+
+// POST /api/jobs { kind: "tasks"|"audit", format: "csv"|"json" } -> 202 with the queued job
+router.post('/', authMiddleware, async (req, res, next) => {
+  try {
+    const { kind, format } = req.body;
+    const user = { id: req.user.id, role: req.user.role };
+    const result = await coordinator.call('jobs.submit', user, kind, format || 'csv');
+    if (result.error) return res.status(result.status).json({ error: result.error });
+    res.status(202).json(result.job);
+  } catch (e) {
+    next(e);
+  }
+});
+
+// GET /api/jobs - the caller's jobs, newest first (admins see all)
+router.get('/', authMiddleware, async (req, res, next) => {
+  try {
+    res.json(await coordinator.call('jobs.list', { id: req.user.id, role: req.user.role }));
+  } catch (e) {
+    next(e);
+  }
+});
+
+// GET /api/jobs/:id - status and progress
+router.get('/:id', authMiddleware, async (req, res, next) => {
+  try {
+    const job = await coordinator.call('jobs.status', { id: req.user.id, role: req.user.role }, req.params.id);
+    if (!job) return res.status(404).json({ error: 'Not found' });
+    res.json(job);
+  } catch (e) {
+    next(e);
+  }
+});
+
+// GET /api/jobs/:id/download - the finished artifact
+router.get('/:id/download', authMiddleware, async (req, res, next) => {
+  try {
+    const job = await coordinator.call('jobs.artifact', { id: req.user.id, role: req.user.role }, req.params.id);
+    if (!job) return res.status(404).json({ error: 'Not found' });
+    if (job.status !== 'done') return res.status(409).json({ error: `job is ${job.status}` });
+    res.setHeader('Content-Type', job.contentType);
+    res.setHeader('Content-Disposition', `attachment; filename="${job.fileName}"`);
+    res.setHeader('Cache-Control', 'private, no-store');
+    res.sendFile(job.outPath, { cacheControl: false });
+  } catch (e) {
+    next(e);
+  }
+});
+
+module.exports = router;
@@ -3,26 +3,31 @@ const router = express.Router();
 const db = require('../db');
 const { authMiddleware } = require('../auth');
 const { nanoid } = require('nanoid');
+const { conditional } = require('../etag');
+const { coalesce } = require('../coalesce');
+const search = require('../search');
 
 // GET /api/messages?taskId=...
-router.get('/', authMiddleware, (req, res) => {
+router.get('/', authMiddleware, conditional('messages'), coalesce(), (req, res) => {
   const { taskId } = req.query;
   db.read();
   const msgs = taskId ? db.data.messages.filter(m => m.taskId === taskId) : db.data.messages;
   res.json(msgs);
 });
 
-// POST /api/messages { taskId, text }
+// POST /api/messages { taskId, text } (no taskId: a team channel message)
 router.post('/', authMiddleware, (req, res) => {
   const { taskId, text } = req.body;
-  if (!taskId || !text) return res.status(400).json({ error: 'taskId and text required' });
+  if (!text) return res.status(400).json({ error: 'text required' });
   db.read();
   const id = nanoid();
   const now = Date.now();
-  const msg = { id, taskId, text, userId: req.user.id, createdAt: now };
+  const msg = { id, taskId: taskId || null, text, userId: req.user.id, createdAt: now };
   db.data.messages.push(msg);
+  search.upsert('message', msg);
   db.data.audit.push({ id: nanoid(), action: 'CREATE_MESSAGE', by: req.user.id, target: id, at: now });
-  db.write();
+  db.touch('messages', id);
+  db.write('messages', 'audit');
   res.json(msg);
 });
 
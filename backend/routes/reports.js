@@ -1,8 +1,11 @@
 const express = require('express');
 const router = express.Router();
 const db = require('../db');
-const { authMiddleware } = require('../auth');
+const { authMiddleware, authorize } = require('../auth');
 const { nanoid } = require('nanoid');
+const rollups = require('../rollups');
+
+const MAX_TREND_DAYS = 366;
 
 // Simple tasks report: /api/reports/tasks returns JSON summary or CSV when ?format=csv
 router.get('/tasks', authMiddleware, (req, res) => {
@@ -19,4 +22,39 @@ router.get('/tasks', authMiddleware, (req, res) => {
   res.json({ total: rows.length, rows });
 });
 
+// GET /api/reports/trends?days=30&assigneeId= (Admin or Manager)
+// Reads only the daily rollup buckets, never the task list
+router.get('/trends', authorize('ADMIN', 'MANAGER'), (req, res) => {
+  const days = Math.min(Math.max(parseInt(req.query.days, 10) || 30, 1), MAX_TREND_DAYS);
+  const assigneeId = req.query.assigneeId || null;
+  const daily = rollups.series(days, assigneeId);
+
+  // weeks start on Monday (UTC)
+  const weeks = [];
+  daily.forEach(d => {
+    const date = new Date(d.date);
+    const monday = new Date(date.getTime() - ((date.getUTCDay() + 6) % 7) * 86400000).toISOString().slice(0, 10);
+    let week = weeks[weeks.length - 1];
+    if (!week || week.week !== monday) {
+      week = { week: monday, created: 0, completed: 0, leadTimeMs: 0 };
+      weeks.push(week);
+    }
+    week.created += d.created;
+    week.completed += d.completed;
+    week.leadTimeMs += d.leadTimeMs;
+  });
+  const avgHours = r => (r.completed ? r.leadTimeMs / r.completed / 3600000 : null);
+
+  const created = daily.reduce((n, d) => n + d.created, 0);
+  const completed = daily.reduce((n, d) => n + d.completed, 0);
+  const leadTimeMs = daily.reduce((n, d) => n + d.leadTimeMs, 0);
+  res.json({
+    days: daily.map(d => ({ date: d.date, created: d.created, completed: d.completed, byStatus: d.byStatus, avgLeadTimeHours: avgHours(d) })),
+    weeks: weeks.map(w => ({ week: w.week, created: w.created, completed: w.completed, avgLeadTimeHours: avgHours(w) })),
+    totals: { created, completed, avgLeadTimeHours: avgHours({ completed, leadTimeMs }) },
+    assignees: assigneeId ? [] : rollups.assignees(days)
+      .map(a => ({ assigneeId: a.assigneeId, created: a.created, completed: a.completed, avgLeadTimeHours: avgHours(a) }))
+  });
+});
+
 module.exports = router;
@@ -0,0 +1,21 @@
+const express = require('express');
+const router = express.Router();
+const { authMiddleware } = require('../auth');
+const search = require('../search');
+
+const TYPES = ['task', 'message', 'file'];
+
+// GET /api/search?q=...&page=1&pageSize=10&type=task|message|file
+router.get('/', authMiddleware, (req, res) => {
+  const q = (req.query.q || '').trim();
+  if (!q) return res.status(400).json({ error: 'q required' });
+  const type = TYPES.includes(req.query.type) ? req.query.type : null;
+  const page = Math.max(parseInt(req.query.page, 10) || 1, 1);
+  const pageSize = Math.min(Math.max(parseInt(req.query.pageSize, 10) || 10, 1), 50);
+  const started = process.hrtime.bigint();
+  const result = search.query(q, { page, pageSize, type });
+  result.tookMs = Number(process.hrtime.bigint() - started) / 1e6;
+  res.json(result);
+});
+
+module.exports = router;
@@ -3,9 +3,15 @@ const router = express.Router();
 const db = require("../db");
 const { nanoid } = require("nanoid");
 const { authMiddleware, authorize } = require("../auth");
+const { conditional } = require("../etag");
+const { coalesce } = require("../coalesce");
+const rollups = require("../rollups");
+const workload = require("../workload");
+const duedates = require("../duedates");
+const search = require("../search");
 
 // GET /api/tasks
-router.get("/", authMiddleware, (req, res) => {
+router.get("/", authMiddleware, conditional("tasks"), coalesce(), (req, res) => {
   db.read();
   // All users can see all tasks (employees see their assigned tasks highlighted)
   const tasks = [...db.data.tasks].sort((a,b)=>b.createdAt - a.createdAt);
@@ -25,7 +31,12 @@ router.post("/", authorize("ADMIN", "MANAGER"), (req, res) => {
     createdBy: req.user.id, createdAt: now, updatedAt: now
   };
   db.data.tasks.push(task);
-  db.write();
+  rollups.recordCreated(task);
+  workload.apply(null, task);
+  duedates.apply(null, task);
+  search.upsert("task", task);
+  db.touch("tasks", id);
+  db.write("tasks", "rollups");
   res.json(task);
 });
 
@@ -36,13 +47,23 @@ router.patch("/:id", authMiddleware, (req, res) => {
   const idx = db.data.tasks.findIndex(t => t.id === id);
   if (idx === -1) return res.status(404).json({ error: "Not found" });
   const task = db.data.tasks[idx];
+  // baseUpdatedAt: the updatedAt the client's change was based on; a newer task means
+  // someone else changed it meanwhile (e.g. while the change waited in an offline outbox)
+  if (req.body.baseUpdatedAt !== undefined && task.updatedAt > req.body.baseUpdatedAt) {
+    return res.status(409).json({ error: "Task was changed by someone else", task });
+  }
+  const before = { ...task };
 
   if (req.user.role === "EMPLOYEE") {
     // Employees can update only status (for all tasks they can see)
     if (!req.body.status) return res.status(400).json({ error: "Employee can update only status" });
     task.status = req.body.status;
     task.updatedAt = Date.now();
-    db.data.tasks[idx] = task; db.write();
+    rollups.recordChange(before, task);
+    workload.apply(before, task);
+    duedates.apply(before, task);
+    search.upsert("task", task);
+    db.data.tasks[idx] = task; db.touch("tasks", id); db.write("tasks", "rollups");
     return res.json(task);
   }
 
@@ -52,8 +73,13 @@ router.patch("/:id", authMiddleware, (req, res) => {
       task[f] = f === "dueDate" ? (req.body.dueDate ? Date.parse(req.body.dueDate) : null) : req.body[f];
     }
   });
+  if (req.body.dueDate !== undefined) delete task.overdueAt; // re-dated tasks are flagged again when they cross
   task.updatedAt = Date.now();
-  db.data.tasks[idx] = task; db.write();
+  rollups.recordChange(before, task);
+  workload.apply(before, task);
+  duedates.apply(before, task);
+  search.upsert("task", task);
+  db.data.tasks[idx] = task; db.touch("tasks", id); db.write("tasks", "rollups");
   res.json(task);
 });
 
@@ -61,8 +87,16 @@ router.patch("/:id", authMiddleware, (req, res) => {
 router.delete("/:id", authorize("ADMIN"), (req, res) => {
   const id = req.params.id;
   db.read();
+  const removed = db.data.tasks.find(t => t.id === id);
   db.data.tasks = db.data.tasks.filter(t => t.id !== id);
-  db.write();
+  if (removed) {
+    rollups.recordDeleted(removed);
+    workload.apply(removed, null);
+    duedates.apply(removed, null);
+    search.remove("task", id);
+  }
+  db.touch("tasks", id);
+  db.write("tasks", "rollups");
   res.json({ ok: true });
 });
 
@@ -2,17 +2,30 @@ const express = require('express');
 const router = express.Router();
 const db = require('../db');
 const { authorize, authMiddleware } = require('../auth');
+const { conditional } = require('../etag');
+const { coalesce } = require('../coalesce');
 const { nanoid } = require('nanoid');
 
 // GET /api/users - admin and manager can view users
-router.get('/', authMiddleware, (req, res) => {
+router.get('/', authMiddleware, (req, res, next) => {
   if (req.user.role !== 'ADMIN' && req.user.role !== 'MANAGER') {
     return res.status(403).json({ error: 'Forbidden' });
   }
+  next();
+}, conditional('users'), coalesce(), (req, res) => {
   db.read();
   res.json(db.data.users.map(u => ({ id: u.id, email: u.email, fullName: u.fullName, role: u.role, createdAt: u.createdAt })));
 });
 
+// POST /api/users/lookup { ids } - resolve user ids to display names (any authenticated user)
+router.post('/lookup', authMiddleware, (req, res) => {
+  const ids = Array.isArray(req.body.ids) ? req.body.ids : [];
+  if (ids.length === 0) return res.json([]);
+  db.read();
+  const wanted = new Set(ids);
+  res.json(db.data.users.filter(u => wanted.has(u.id)).map(u => ({ id: u.id, fullName: u.fullName || u.email })));
+});
+
 // POST /api/users/signup - public employee self-registration (no auth required)
 router.post('/signup', (req, res) => {
   const { email, fullName, password, role } = req.body;
@@ -29,12 +42,12 @@ router.post('/signup', (req, res) => {
   
   // Force role to EMPLOYEE for self-registration
   db.data.users.push({ id, email, fullName, role: 'EMPLOYEE', password: hash, createdAt: now });
-  db.write();
+  db.write('users');
   
   // audit
   db.read(); 
   db.data.audit.push({ id: nanoid(), action: 'EMPLOYEE_SIGNUP', by: null, target: id, at: Date.now() }); 
-  db.write();
+  db.write('audit');
   
   res.status(201).json({ id, email, fullName, role: 'EMPLOYEE', createdAt: now });
 });
@@ -50,9 +63,9 @@ router.post('/', authorize('ADMIN'), (req, res) => {
   const hash = bcrypt.hashSync(password, 8);
   const now = Date.now();
   db.data.users.push({ id, email, fullName: fullName || email, role, password: hash, createdAt: now });
-  db.write();
+  db.write('users');
   // audit
-  db.read(); db.data.audit.push({ id: nanoid(), action: 'CREATE_USER', by: req.user?.id || null, target: id, at: Date.now() }); db.write();
+  db.read(); db.data.audit.push({ id: nanoid(), action: 'CREATE_USER', by: req.user?.id || null, target: id, at: Date.now() }); db.write('audit');
   res.json({ id, email, fullName, role });
 });
 
@@ -77,7 +90,7 @@ router.delete('/:id', authMiddleware, (req, res) => {
 
   db.data.users = db.data.users.filter(u => u.id !== id);
   db.data.audit.push({ id: nanoid(), action: 'DELETE_USER', by: req.user.id, target: id, at: Date.now() });
-  db.write();
+  db.write('users', 'audit');
   res.json({ ok: true });
 });
 
@@ -0,0 +1,210 @@
+// backend/search.js — in-memory inverted index over task, message and file text
+const db = require('./db');
+
+const MAX_PREFIX_TERMS = 64;   // expansions considered for one prefix token
+const SNIPPET_LENGTH = 120;
+const MAX_QUERY_TOKENS = 16;
+
+// lowercase words of letters/digits; single characters carry no signal and are dropped
+function tokenize(text) {
+  return String(text || '').toLowerCase().split(/[^\p{L}\p{N}]+/u).filter(t => t.length > 1);
+}
+
+// keeps the best k items seen so far; worst of them sits at the root
+function topK(k, better) {
+  const heap = [];
+  const swap = (i, j) => { const t = heap[i]; heap[i] = heap[j]; heap[j] = t; };
+  return {
+    push(item) {
+      if (heap.length < k) {
+        heap.push(item);
+        for (let i = heap.length - 1; i > 0;) {
+          const parent = (i - 1) >> 1;
+          if (!better(heap[parent], item)) break;
+          swap(i, parent); i = parent;
+        }
+      } else if (k > 0 && better(item, heap[0])) {
+        heap[0] = item;
+        for (let i = 0; ;) {
+          const l = 2 * i + 1, r = l + 1;
+          let worst = i;
+          if (l < heap.length && better(heap[worst], heap[l])) worst = l;
+          if (r < heap.length && better(heap[worst], heap[r])) worst = r;
+          if (worst === i) break;
+          swap(i, worst); i = worst;
+        }
+      }
+    },
+    sorted() {
+      return heap.slice().sort((x, y) => (better(x, y) ? -1 : better(y, x) ? 1 : 0));
+    }
+  };
+}
+
+// first index in the sorted term list that is >= term
+function lowerBound(arr, term) {
+  let lo = 0, hi = arr.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (arr[mid] < term) lo = mid + 1; else hi = mid;
+  }
+  return lo;
+}
+
+// searchable fields per record type: [text, weight]
+const SOURCES = {
+  task: {
+    collection: 'tasks',
+    fields: t => [[t.title, 3], [t.description, 1]],
+    hit: t => ({ title: t.title || 'Untitled', snippet: t.description || '', status: t.status, createdAt: t.createdAt })
+  },
+  message: {
+    collection: 'messages',
+    fields: m => [[m.text, 1]],
+    hit: m => ({ title: (m.text || '').slice(0, SNIPPET_LENGTH), snippet: '', taskId: m.taskId, createdAt: m.createdAt })
+  },
+  file: {
+    collection: 'files',
+    fields: f => [[f.name, 3]],
+    hit: f => ({ title: f.name, snippet: '', createdAt: f.createdAt })
+  }
+};
+
+// Kept current by the write routes with upsert()/remove(). When db.read() loads a new copy
+// of the data file, the records its write log names are re-indexed; the index is rebuilt in
+// one pass when the log can't say (like workload.js). Documents get small integer ids so
+// queries can accumulate scores in typed arrays instead of per-query maps.
+const search = {
+  source: null,
+  at: null,             // db.position() the index reflects
+  postings: new Map(),  // term -> Map(docId -> weight)
+  terms: [],            // sorted keys of postings, for prefix ranges
+  docs: [],             // docId -> { type, id, terms, hit } (null once removed)
+  ids: new Map(),       // "type:id" -> docId
+  free: [],             // docIds of removed documents, reused by add()
+  ensure() {
+    db.read();
+    if (this.source !== db.data) {
+      const changes = Object.entries(SOURCES).map(([type, src]) => [type, src, db.changesSince(this.at, src.collection)]);
+      this.source = db.data;
+      if (changes.every(([, , changed]) => changed)) {
+        changes.forEach(([type, src, changed]) => {
+          changed.forEach(id => this.remove(type, id));
+          if (changed.size) (db.data[src.collection] || []).forEach(r => changed.has(r.id) && this.add(type, r, true));
+        });
+      } else {
+        this.postings = new Map();
+        this.docs = [];
+        this.ids = new Map();
+        this.free = [];
+        Object.entries(SOURCES).forEach(([type, src]) => {
+          (db.data[src.collection] || []).forEach(record => this.add(type, record));
+        });
+        this.terms = [...this.postings.keys()].sort();
+      }
+    }
+    this.at = db.position();
+    return this;
+  },
+  add(type, record, keepSorted = false) {
+    const src = SOURCES[type];
+    const docId = this.free.length ? this.free.pop() : this.docs.length;
+    const weights = new Map();
+    src.fields(record).forEach(([text, weight]) => {
+      tokenize(text).forEach(term => weights.set(term, (weights.get(term) || 0) + weight));
+    });
+    weights.forEach((weight, term) => {
+      let posting = this.postings.get(term);
+      if (!posting) {
+        posting = new Map();
+        this.postings.set(term, posting);
+        if (keepSorted) this.terms.splice(lowerBound(this.terms, term), 0, term);
+      }
+      posting.set(docId, weight);
+    });
+    const hit = src.hit(record);
+    if (hit.snippet) hit.snippet = hit.snippet.slice(0, SNIPPET_LENGTH);
+    this.docs[docId] = { type, id: record.id, terms: [...weights.keys()], hit };
+    this.ids.set(`${type}:${record.id}`, docId);
+  },
+  // index a new or changed record; safe to call after the record is already in db.data
+  upsert(type, record) {
+    this.ensure();
+    this.remove(type, record.id);
+    this.add(type, record, true);
+  },
+  remove(type, id) {
+    this.ensure();
+    const key = `${type}:${id}`;
+    const docId = this.ids.get(key);
+    if (docId === undefined) return;
+    this.docs[docId].terms.forEach(term => {
+      const posting = this.postings.get(term);
+      if (!posting) return;
+      posting.delete(docId);
+      if (!posting.size) {
+        this.postings.delete(term);
+        const i = lowerBound(this.terms, term);
+        if (this.terms[i] === term) this.terms.splice(i, 1);
+      }
+    });
+    this.docs[docId] = null;
+    this.ids.delete(key);
+    this.free.push(docId);
+  },
+  // Every query token must match (exactly or as a prefix of an indexed term). Score is
+  // field weight x idf, with prefix matches counting half; ties go to the newest record.
+  // Only the top page * pageSize matches are ordered.
+  query(text, { page = 1, pageSize = 10, type = null } = {}) {
+    this.ensure();
+    const tokens = [...new Set(tokenize(text))].slice(0, MAX_QUERY_TOKENS);
+    if (!tokens.length) return { total: 0, page, pageSize, hits: [] };
+    const docCount = this.ids.size || 1;
+    const scores = new Float64Array(this.docs.length);
+    const matched = new Uint8Array(this.docs.length);  // number of tokens each doc has matched
+    let candidates = [];
+    for (let t = 0; t < tokens.length; t++) {
+      const token = tokens[t];
+      const next = [];
+      const start = lowerBound(this.terms, token);
+      for (let i = start; i < this.terms.length && i < start + MAX_PREFIX_TERMS && this.terms[i].startsWith(token); i++) {
+        const term = this.terms[i];
+        const posting = this.postings.get(term);
+        const factor = (term === token ? 1 : 0.5) * Math.log(1 + docCount / posting.size);
+        posting.forEach((weight, docId) => {
+          if (matched[docId] === t) {
+            matched[docId] = t + 1;
+            next.push(docId);
+          } else if (matched[docId] !== t + 1) {
+            return;
+          }
+          scores[docId] += weight * factor;
+        });
+      }
+      candidates = next;
+      if (!candidates.length) break;
+    }
+
+    const docs = this.docs;
+    const better = (a, b) => scores[a] > scores[b] ||
+      (scores[a] === scores[b] && (docs[a].hit.createdAt || 0) > (docs[b].hit.createdAt || 0));
+    const offset = (page - 1) * pageSize;
+    const best = topK(offset + pageSize, better);
+    let total = 0;
+    candidates.forEach(docId => {
+      if (type && docs[docId].type !== type) return;
+      total += 1;
+      best.push(docId);
+    });
+    return {
+      total,
+      page,
+      pageSize,
+      hits: best.sorted().slice(offset).map(docId => ({
+        type: docs[docId].type, id: docs[docId].id, score: Math.round(scores[docId] * 1000) / 1000, ...docs[docId].hit
+      }))
+    };
+  }
+};
+
+module.exports = search;
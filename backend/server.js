@@ -5,6 +5,8 @@ const bodyParser = require('express').json;
 const db = require('./db');
 const bcrypt = require('bcryptjs');
 const { sign } = require('./auth');
+const { compression, compact } = require('./compress');
+const duedates = require('./duedates');
 const tasksRouter = require('./routes/tasks');
 const dashboardRouter = require('./routes/dashboard');
 const usersRouter = require('./routes/users');
@@ -12,10 +14,25 @@ const filesRouter = require('./routes/files');
 const messagesRouter = require('./routes/messages');
 const reportsRouter = require('./routes/reports');
 const auditRouter = require('./routes/audit');
+const searchRouter = require('./routes/search');
+const jobsRouter = require('./routes/jobs');
+const search = require('./search');
+const jobs = require('./jobs');
+const auditlog = require('./auditlog');
+const coordinator = require('./coordinator');
+const serverpid = require('./serverpid');
+const { idempotent } = require('./idempotency');
 
 const app = express();
 app.use(cors());
+app.use(compression());
+app.use(compact());
 app.use(bodyParser());
+// Requests that may write hold the cluster-wide write lock; these POSTs only read
+const READ_ONLY_POSTS = ['/api/auth/login', '/api/users/lookup', '/api/jobs'];
+app.use(coordinator.serializeWrites(READ_ONLY_POSTS));
+// Idempotency-Key answers are only stored for requests holding the lock (never login tokens)
+app.use(idempotent(READ_ONLY_POSTS));
 
 // Auth routes: login (using lowdb)
 app.post('/api/auth/login', (req, res) => {
@@ -36,8 +53,23 @@ app.use('/api/files', filesRouter);
 app.use('/api/messages', messagesRouter);
 app.use('/api/reports', reportsRouter);
 app.use('/api/audit', auditRouter);
+app.use('/api/search', searchRouter);
+app.use('/api/jobs', jobsRouter);
 
 app.get('/api/me', (req, res) => res.json({ ok: true }));
 
 const port = process.env.PORT || 4000;
-app.listen(port, () => console.log(`Backend listening on http://localhost:${port}`));
+app.listen(port, () => {
+  console.log(`Backend listening on http://localhost:${port}${coordinator.clustered ? ` (worker ${process.pid})` : ''}`);
+  if (!coordinator.clustered) {
+    // in a cluster the primary (cluster.js) runs the job pool and owns the pid file
+    serverpid.claim();
+    coordinator.expose('jobs', jobs);
+    jobs.start();
+  }
+  if (coordinator.isLeader) {
+    duedates.start();
+    auditlog.start();
+  }
+  search.ensure(); // build the index now rather than on the first query
+});
@@ -0,0 +1,44 @@
+// backend/serverpid.js — marks a data file as in use by a running backend ("<db.json>.pid")
+// so offline tools (snapshot.js restore) can refuse to replace it underneath the server.
+const fs = require('fs');
+const dbPath = require('./dbpath');
+
+function pidFile(target) {
+  return `${target}.pid`;
+}
+
+function alive(pid) {
+  try {
+    process.kill(pid, 0);
+    return true;
+  } catch (e) {
+    return e.code === 'EPERM';  // exists, owned by someone else
+  }
+}
+
+module.exports = {
+  alive,
+  // called once by the process that owns the data file: the cluster primary, or server.js alone
+  claim() {
+    const file = pidFile(dbPath);
+    fs.writeFileSync(file, String(process.pid));
+    process.on('exit', () => {
+      try {
+        if (fs.readFileSync(file, 'utf8') === String(process.pid)) fs.rmSync(file, { force: true });
+      } catch (e) {
+        // already gone
+      }
+    });
+  },
+  // pid of the backend serving `target`, or null. A file left by a killed backend names a
+  // process that no longer exists and is ignored.
+  running(target = dbPath) {
+    let pid;
+    try {
+      pid = parseInt(fs.readFileSync(pidFile(target), 'utf8'), 10);
+    } catch (e) {
+      return null;
+    }
+    return pid && pid !== process.pid && alive(pid) ? pid : null;
+  }
+};
@@ -0,0 +1,301 @@
+// backend/snapshot.js — online point-in-time snapshots of the data file, and restore
+// Plain fs/zlib only (no db.js), so it can run next to a live backend without taking the
+// write lock: writers replace db.json with a rename, so one read of it is one complete version.
+//
+//   node snapshot.js create [note]            take a snapshot (npm run snapshot)
+//   node snapshot.js list
+//   node snapshot.js verify [id]              check every blob of one snapshot (or all of them)
+//   node snapshot.js restore <id> [--to file] restore into the data file (npm run restore -- <id>)
+//   node snapshot.js prune [keep]
+//
+// Each collection is stored as a gzip'd blob named after the sha256 of its JSON, so a snapshot
+// only writes the collections that changed since any earlier one. Archived audit segments are
+// immutable and are copied once, under their own sha256. A snapshot is its manifest
+// (<id>.json), written last, so a snapshot that failed halfway never shows up. create and
+// prune take a lock file in the snapshot directory, so a prune never removes blobs that a
+// create running in another process has written but not listed in a manifest yet.
+const fs = require('fs');
+const path = require('path');
+const zlib = require('zlib');
+const crypto = require('crypto');
+const dbPath = require('./dbpath');
+const segments = require('./audit-segments');
+const serverpid = require('./serverpid');
+
+const SNAPSHOT_DIR = process.env.SNAPSHOT_DIR ? path.resolve(process.env.SNAPSHOT_DIR) : path.join(path.dirname(dbPath), 'snapshots');
+const SNAPSHOT_KEEP = parseInt(process.env.SNAPSHOT_KEEP, 10) || 20;
+const blobDir = path.join(SNAPSHOT_DIR, 'blobs');
+const lockFile = path.join(SNAPSHOT_DIR, '.lock');
+const LOCK_WAIT_MS = 60 * 1000;
+
+function sha256(buf) {
+  return crypto.createHash('sha256').update(buf).digest('hex');
+}
+
+function writeAtomic(file, data) {
+  const tmp = `${file}.${process.pid}.tmp`;
+  fs.writeFileSync(tmp, data);
+  fs.renameSync(tmp, file);
+}
+
+function manifestPath(id) {
+  if (!/^[\w-]+$/.test(id)) throw new Error(`bad snapshot id: ${id}`);
+  return path.join(SNAPSHOT_DIR, `${id}.json`);
+}
+
+function readManifest(id) {
+  const file = manifestPath(id);
+  if (!fs.existsSync(file)) throw new Error(`no snapshot ${id}`);
+  return JSON.parse(fs.readFileSync(file, 'utf8'));
+}
+
+// run fn holding the snapshot directory lock; a lock left by a process that died is taken over
+function withLock(fn) {
+  fs.mkdirSync(SNAPSHOT_DIR, { recursive: true });
+  const giveUp = Date.now() + LOCK_WAIT_MS;
+  for (;;) {
+    try {
+      fs.writeFileSync(lockFile, String(process.pid), { flag: 'wx' });
+      break;
+    } catch (e) {
+      if (e.code !== 'EEXIST') throw e;
+    }
+    let holder = null;
+    try {
+      holder = parseInt(fs.readFileSync(lockFile, 'utf8'), 10);
+    } catch (e) {
+      continue;  // released meanwhile
+    }
+    if (!holder || !serverpid.alive(holder)) {
+      fs.rmSync(lockFile, { force: true });
+      continue;
+    }
+    if (Date.now() > giveUp) throw new Error(`snapshots are locked by process ${holder}`);
+    Atomics.wait(new Int32Array(new SharedArrayBuffer(4)), 0, 0, 100);
+  }
+  try {
+    return fn();
+  } finally {
+    fs.rmSync(lockFile, { force: true });
+  }
+}
+
+// sortable ids, e.g. "20240531T101500123Z-3f9a1c"
+function newId(now) {
+  return `${new Date(now).toISOString().replace(/[-:.]/g, '')}-${crypto.randomBytes(3).toString('hex')}`;
+}
+
+// store one collection unless a blob with the same content already exists
+function storeCollection(value, written) {
+  const json = Buffer.from(JSON.stringify(value), 'utf8');
+  const hash = sha256(json);
+  const file = path.join(blobDir, `${hash}.json.gz`);
+  if (!fs.existsSync(file)) {
+    const body = zlib.gzipSync(json);
+    writeAtomic(file, body);
+    written.blobs += 1;
+    written.bytes += body.length;
+  }
+  return { sha256: hash, bytes: json.length, count: Array.isArray(value) ? value.length : null };
+}
+
+function storeSegment(archiveDir, segment, written) {
+  const file = path.join(blobDir, `${segment.sha256}.seg.gz`);
+  if (fs.existsSync(file)) return;
+  const body = fs.readFileSync(path.join(archiveDir, segment.file));
+  if (sha256(body) !== segment.sha256) throw new Error(`audit segment ${segment.file} does not match its checksum`);
+  writeAtomic(file, body);
+  written.blobs += 1;
+  written.bytes += body.length;
+}
+
+// read a collection blob back, checking it against its name
+function loadCollection(entry) {
+  const json = zlib.gunzipSync(fs.readFileSync(path.join(blobDir, `${entry.sha256}.json.gz`)));
+  if (sha256(json) !== entry.sha256) throw new Error(`blob ${entry.sha256} is corrupt`);
+  const value = JSON.parse(json.toString('utf8'));
+  if (entry.count !== null && (!Array.isArray(value) || value.length !== entry.count)) {
+    throw new Error(`blob ${entry.sha256} holds the wrong number of records`);
+  }
+  return value;
+}
+
+function loadSegment(segment) {
+  const body = fs.readFileSync(path.join(blobDir, `${segment.sha256}.seg.gz`));
+  if (sha256(body) !== segment.sha256) throw new Error(`audit segment ${segment.file} is corrupt`);
+  return body;
+}
+
+const snapshot = {
+  dir: SNAPSHOT_DIR,
+  create(note = null, source = dbPath) {
+    return withLock(() => this.createLocked(note, source));
+  },
+  createLocked(note, source) {
+    const started = Date.now();
+    fs.mkdirSync(blobDir, { recursive: true });
+    const data = JSON.parse(fs.readFileSync(source, 'utf8') || '{}');
+    // Read after the data file: an audit rotation in between leaves entries both in the hot
+    // segment and in an archived one, which auditlog.reconcile() drops again on startup.
+    const archiveDir = segments.archiveDir(source);
+    const archive = segments.readManifest(archiveDir);
+
+    const written = { blobs: 0, bytes: 0 };
+    const collections = {};
+    Object.keys(data).filter(k => k !== '_meta').forEach(k => {
+      collections[k] = storeCollection(data[k], written);
+    });
+    archive.forEach(s => storeSegment(archiveDir, s, written));
+
+    const manifest = {
+      id: newId(started), createdAt: started, note, source,
+      meta: data._meta || null, collections, auditArchive: archive,
+      written, tookMs: Date.now() - started
+    };
+    writeAtomic(manifestPath(manifest.id), JSON.stringify(manifest, null, 2));
+    return manifest;
+  },
+  // manifests, oldest first
+  list() {
+    if (!fs.existsSync(SNAPSHOT_DIR)) return [];
+    return fs.readdirSync(SNAPSHOT_DIR)
+      .filter(name => /^[\w-]+\.json$/.test(name))
+      .sort()
+      .map(name => readManifest(name.slice(0, -'.json'.length)));
+  },
+  // returns the problems found, [] when every blob is intact
+  verify(id) {
+    const manifest = readManifest(id);
+    const problems = [];
+    Object.entries(manifest.collections).forEach(([name, entry]) => {
+      try {
+        loadCollection(entry);
+      } catch (e) {
+        problems.push(`${name}: ${e.message}`);
+      }
+    });
+    manifest.auditArchive.forEach(s => {
+      try {
+        loadSegment(s);
+      } catch (e) {
+        problems.push(`audit archive: ${e.message}`);
+      }
+    });
+    return problems;
+  },
+  // Everything is read and checked before anything is replaced. A data file a running backend
+  // serves is refused: the server keeps its parsed copy and would write it back over the
+  // restore. Restoring over the live data file first snapshots it (returned as `backup`),
+  // gives the data a new epoch so no ETag or client cache from before can match, and forgets
+  // stored Idempotency-Key answers, which may describe changes the restore undid.
+  restore(id, target = dbPath) {
+    const pid = serverpid.running(path.resolve(target));
+    if (pid) throw new Error(`the backend (pid ${pid}) is serving ${target}; stop it before restoring, or restore --to another file`);
+    const manifest = readManifest(id);
+    const data = {};
+    Object.entries(manifest.collections).forEach(([name, entry]) => {
+      data[name] = loadCollection(entry);
+    });
+    data._meta = {
+      epoch: crypto.randomBytes(6).toString('hex'),
+      versions: manifest.meta ? manifest.meta.versions : {}
+    };
+    const archive = manifest.auditArchive.map(s => ({ segment: s, body: loadSegment(s) }));
+
+    const live = path.resolve(target) === dbPath;
+    const backup = live && fs.existsSync(target) ? this.create(`before restoring ${id}`, target) : null;
+    fs.mkdirSync(path.dirname(target), { recursive: true });
+    const archiveDir = segments.archiveDir(target);
+    if (archive.length || fs.existsSync(archiveDir)) {
+      fs.mkdirSync(archiveDir, { recursive: true });
+      archive.forEach(({ segment, body }) => {
+        const file = path.join(archiveDir, segment.file);
+        if (!fs.existsSync(file) || sha256(fs.readFileSync(file)) !== segment.sha256) writeAtomic(file, body);
+      });
+      segments.writeManifest(archiveDir, manifest.auditArchive);
+      // segments archived after the snapshot was taken are not part of it
+      const keep = new Set(manifest.auditArchive.map(s => s.file));
+      fs.readdirSync(archiveDir)
+        .filter(name => name.endsWith('.json.gz') && !keep.has(name))
+        .forEach(name => fs.rmSync(path.join(archiveDir, name), { force: true }));
+    }
+    writeAtomic(target, JSON.stringify(data, null, 2));
+    if (live) fs.rmSync(require('./idempotency').storeFile, { force: true });
+    return { id, target, backup: backup && backup.id };
+  },
+  // keep the newest `keep` snapshots and drop blobs none of them uses
+  prune(keep = SNAPSHOT_KEEP) {
+    return withLock(() => this.pruneLocked(keep));
+  },
+  pruneLocked(keep) {
+    const all = this.list();
+    const removed = all.slice(0, Math.max(0, all.length - keep));
+    removed.forEach(m => fs.rmSync(manifestPath(m.id), { force: true }));
+    const used = new Set();
+    all.slice(removed.length).forEach(m => {
+      Object.values(m.collections).forEach(e => used.add(`${e.sha256}.json.gz`));
+      m.auditArchive.forEach(s => used.add(`${s.sha256}.seg.gz`));
+    });
+    let blobs = 0;
+    if (fs.existsSync(blobDir)) {
+      fs.readdirSync(blobDir).filter(name => !used.has(name)).forEach(name => {
+        fs.rmSync(path.join(blobDir, name), { force: true });
+        blobs += 1;
+      });
+    }
+    return { snapshots: removed.length, blobs };
+  }
+};
+
+function kb(bytes) {
+  return `${(bytes / 1024).toFixed(1)} KB`;
+}
+
+function main(args) {
+  const [command, ...rest] = args;
+  if (command === 'create') {
+    const m = snapshot.create(rest.join(' ') || null);
+    const pruned = snapshot.prune();
+    console.log(`snapshot ${m.id}: ${Object.keys(m.collections).length} collections, ${m.auditArchive.length} audit segments, ` +
+      `${m.written.blobs} new blobs (${kb(m.written.bytes)}) in ${m.tookMs} ms`);
+    if (pruned.snapshots) console.log(`pruned ${pruned.snapshots} old snapshots, ${pruned.blobs} blobs`);
+  } else if (command === 'list') {
+    snapshot.list().forEach(m => {
+      const size = Object.values(m.collections).reduce((sum, e) => sum + e.bytes, 0);
+      console.log(`${m.id}  ${new Date(m.createdAt).toISOString()}  ${kb(size)} of JSON  ${m.note || ''}`);
+    });
+  } else if (command === 'verify') {
+    const ids = rest[0] ? [rest[0]] : snapshot.list().map(m => m.id);
+    let failed = 0;
+    ids.forEach(id => {
+      const problems = snapshot.verify(id);
+      if (problems.length) failed += 1;
+      console.log(problems.length ? `${id}: FAILED\n  ${problems.join('\n  ')}` : `${id}: ok`);
+    });
+    if (failed) process.exitCode = 1;
+  } else if (command === 'restore' && rest[0]) {
+    const toIndex = rest.indexOf('--to');
+    const target = toIndex >= 0 && rest[toIndex + 1] ? path.resolve(rest[toIndex + 1]) : dbPath;
+    const started = Date.now();
+    const result = snapshot.restore(rest[0], target);
+    console.log(`restored ${result.id} into ${result.target} in ${Date.now() - started} ms`);
+    if (result.backup) console.log(`the data it replaced is snapshot ${result.backup}`);
+  } else if (command === 'prune') {
+    const pruned = snapshot.prune(parseInt(rest[0], 10) || SNAPSHOT_KEEP);
+    console.log(`pruned ${pruned.snapshots} snapshots, ${pruned.blobs} blobs`);
+  } else {
+    console.error('usage: node snapshot.js create [note] | list | verify [id] | restore <id> [--to file] | prune [keep]');
+    process.exitCode = 2;
+  }
+}
+
+if (require.main === module) {
+  try {
+    main(process.argv.slice(2));
+  } catch (e) {
+    console.error(e.message);
+    process.exitCode = 1;
+  }
+}
+
+module.exports = snapshot;
@@ -0,0 +1,58 @@
+// backend/test/auditlog.test.js — paging the audit log with the (at, id) cursor
+const test = require('node:test');
+const assert = require('node:assert');
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+
+process.env.DB_PATH = path.join(fs.mkdtempSync(path.join(os.tmpdir(), 'auditlog-')), 'db.json');
+process.env.AUDIT_SEGMENT_ENTRIES = '4';
+const db = require('../db');
+const auditlog = require('../auditlog');
+
+// 10 archived entries and 5 hot ones; a due-date sweep writes many entries with one timestamp
+function seed() {
+  const at = [1000, 1000, 1000, 2000, 2000, 3000, 3000, 3000, 3000, 4000];
+  db.data.audit = at.map((t, i) => ({ id: `a${String(i).padStart(2, '0')}`, action: 'x', at: t }));
+  db.write('audit');
+  auditlog.rotate();
+  db.data.audit = [5000, 5000, 5000, 6000, 7000].map((t, i) => ({ id: `h${i}`, action: 'x', at: t }));
+  db.write('audit');
+}
+
+function pages(query, limit) {
+  const seen = [];
+  let before;
+  for (let n = 0; n < 50; n++) {
+    const result = auditlog.query({ ...query, limit, ...(before ? { before } : {}) });
+    seen.push(...result.entries.map(e => e.id));
+    if (!result.next) return seen;
+    before = result.next;
+  }
+  throw new Error('cursor never ran out');
+}
+
+test.before(seed);
+
+test('every entry is returned once, newest first, across hot and archived segments', () => {
+  assert.ok(auditlog.segments().length >= 2);
+  for (const limit of [1, 2, 3, 4, 7, 100]) {
+    const ids = pages({}, limit);
+    assert.strictEqual(ids.length, 15, `limit ${limit}`);
+    assert.strictEqual(new Set(ids).size, 15, `limit ${limit}`);
+    assert.deepStrictEqual(ids.slice(0, 5), ['h4', 'h3', 'h2', 'h1', 'h0']);
+    assert.deepStrictEqual(ids.slice(-3), ['a02', 'a01', 'a00']);
+  }
+});
+
+test('a page boundary inside a run of equal timestamps neither repeats nor skips', () => {
+  const first = auditlog.query({ limit: 7 });
+  assert.deepStrictEqual(first.next, { at: 3000, id: 'a08' });
+  const second = auditlog.query({ limit: 3, before: first.next });
+  assert.deepStrictEqual(second.entries.map(e => e.id), ['a07', 'a06', 'a05']);
+});
+
+test('the range bounds apply to every page', () => {
+  const ids = pages({ from: 2000, to: 5000 }, 2);
+  assert.deepStrictEqual(ids, ['h2', 'h1', 'h0', 'a09', 'a08', 'a07', 'a06', 'a05', 'a04', 'a03']);
+});
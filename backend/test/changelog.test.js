@@ -0,0 +1,61 @@
+// backend/test/changelog.test.js — the _meta write log, and indexes patched from it after
+// another process wrote the data file
+const test = require('node:test');
+const assert = require('node:assert');
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const { execFileSync } = require('child_process');
+
+process.env.DB_PATH = path.join(fs.mkdtempSync(path.join(os.tmpdir(), 'changelog-')), 'db.json');
+const db = require('../db');
+const workload = require('../workload');
+
+// a write made by another backend process
+function writeElsewhere(code) {
+  execFileSync(process.execPath, ['-e', `const db = require(${JSON.stringify(require.resolve('../db'))}); db.read(); ${code}`],
+    { env: process.env });
+}
+
+function counters() {
+  return JSON.stringify([...workload.ensure()].sort());
+}
+
+test.before(() => {
+  db.data.tasks = ['u1', 'u1', 'u2'].map((assigneeId, i) => (
+    { id: `t${i}`, assigneeId, status: 'TODO', createdAt: 1000 + i, dueDate: 5000 + i }
+  ));
+  db.write('tasks');
+});
+
+test('changesSince names the touched ids, or null when it cannot tell', () => {
+  const start = db.position();
+  db.touch('tasks', 't1');
+  db.write('tasks');
+  assert.deepStrictEqual([...db.changesSince(start, 'tasks')], ['t1']);
+  assert.deepStrictEqual([...db.changesSince(start, 'users')], []);
+
+  db.write('tasks');  // no touch(): any task may have changed
+  assert.strictEqual(db.changesSince(start, 'tasks'), null);
+  assert.strictEqual(db.changesSince({ ...db.position(), epoch: 'other' }, 'tasks'), null);
+  assert.strictEqual(db.changesSince({ ...start, seq: start.seq - 1000 }, 'tasks'), null);
+});
+
+test('workload patches the tasks another process changed and matches a rebuild', () => {
+  workload.ensure();
+  writeElsewhere(`
+    const t = db.data.tasks.find(t => t.id === 't0');
+    t.status = 'IN_PROGRESS'; t.assigneeId = 'u2';
+    db.data.tasks = db.data.tasks.filter(t => t.id !== 't2');
+    db.data.tasks.push({ id: 't9', assigneeId: 'u3', status: 'TODO', createdAt: 1009, dueDate: 5009 });
+    db.touch('tasks', 't0', 't2', 't9');
+    db.write('tasks');
+  `);
+  const patched = counters();
+  assert.deepStrictEqual(JSON.parse(patched).map(([id, c]) => [id, c.open, c.inProgress]),
+    [['u1', 1, 0], ['u2', 1, 1], ['u3', 1, 0]]);
+
+  workload.at = null;  // forces a full rebuild
+  workload.source = null;
+  assert.strictEqual(counters(), patched);
+});
@@ -0,0 +1,58 @@
+// backend/test/coalesce.test.js — repeated GETs of one data version share the first response
+const test = require('node:test');
+const assert = require('node:assert');
+const express = require('express');
+const { coalesce } = require('../coalesce');
+
+function serve(route) {
+  const app = express();
+  let version = 1;
+  let built = 0;
+  const tag = (req, res, next) => {
+    if (route === '/versioned') res.setHeader('ETag', `"v${version}"`);
+    next();
+  };
+  app.get(route, tag, coalesce(), (req, res) => {
+    built += 1;
+    res.json({ version, built });
+  });
+  return new Promise(resolve => {
+    const server = app.listen(0, () => resolve({
+      url: `http://127.0.0.1:${server.address().port}${route}`,
+      bump: () => { version += 1; },
+      built: () => built,
+      close: () => server.close()
+    }));
+  });
+}
+
+test('a later request for the same version is answered from the memo', async () => {
+  const s = await serve('/versioned');
+  try {
+    const first = await fetch(s.url);
+    assert.strictEqual(first.headers.get('x-coalesced'), null);
+    const again = await fetch(s.url);
+    assert.strictEqual(again.headers.get('x-coalesced'), '1');
+    assert.deepStrictEqual(await again.json(), await first.json());
+    assert.strictEqual(s.built(), 1);
+
+    s.bump();
+    const changed = await fetch(s.url);
+    assert.strictEqual(changed.headers.get('x-coalesced'), null);
+    assert.strictEqual((await changed.json()).version, 2);
+  } finally {
+    s.close();
+  }
+});
+
+test('responses without an ETag are not memoized', async () => {
+  const s = await serve('/plain');
+  try {
+    await fetch(s.url);
+    const again = await fetch(s.url);
+    assert.strictEqual(again.headers.get('x-coalesced'), null);
+    assert.strictEqual(s.built(), 2);
+  } finally {
+    s.close();
+  }
+});
@@ -0,0 +1,97 @@
+// backend/test/rollups.test.js — rollup buckets follow task status transitions and deletes
+const test = require('node:test');
+const assert = require('node:assert');
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+
+process.env.DB_PATH = path.join(fs.mkdtempSync(path.join(os.tmpdir(), 'rollups-')), 'db.json');
+const db = require('../db');
+const rollups = require('../rollups');
+
+function today() {
+  return rollups.series(1)[0];
+}
+
+function patch(task, changes) {
+  const before = { ...task };
+  Object.assign(task, changes, { updatedAt: Date.now() });
+  rollups.recordChange(before, task);
+}
+
+test.beforeEach(() => {
+  db.data.tasks = [];
+  db.data.rollups = { days: {} };
+  db.write('tasks', 'rollups');
+});
+
+test('a completion counts once, on the move into DONE', () => {
+  const task = { id: 't1', status: 'TODO', assigneeId: 'u1', createdAt: Date.now() - 3600000, updatedAt: Date.now() };
+  db.data.tasks.push(task);
+  rollups.recordCreated(task);
+  assert.deepStrictEqual([today().created, today().completed], [1, 0]);
+
+  patch(task, { status: 'DONE' });
+  const completedAt = task.completedAt;
+  assert.ok(completedAt);
+  assert.strictEqual(today().completed, 1);
+
+  // edits while DONE neither count it again nor move the completion
+  patch(task, { title: 'renamed' });
+  patch(task, { status: 'DONE' });
+  assert.strictEqual(today().completed, 1);
+  assert.strictEqual(task.completedAt, completedAt);
+  assert.strictEqual(rollups.assignees(1)[0].completed, 1);
+});
+
+test('leaving DONE takes the completion back', () => {
+  const task = { id: 't2', status: 'TODO', createdAt: Date.now() - 7200000, updatedAt: Date.now() };
+  db.data.tasks.push(task);
+  rollups.recordCreated(task);
+  patch(task, { status: 'DONE' });
+  patch(task, { status: 'IN_PROGRESS' });
+  assert.strictEqual(today().completed, 0);
+  assert.strictEqual(today().leadTimeMs, 0);
+  assert.strictEqual(task.completedAt, undefined);
+
+  patch(task, { status: 'DONE' });
+  assert.strictEqual(today().completed, 1);
+  assert.strictEqual(today().byStatus.DONE, 2);
+});
+
+test('reassigning a done task moves its counts to the new assignee', () => {
+  const task = { id: 't3', status: 'TODO', assigneeId: 'u1', createdAt: Date.now(), updatedAt: Date.now() };
+  db.data.tasks.push(task);
+  rollups.recordCreated(task);
+  patch(task, { status: 'DONE' });
+  patch(task, { assigneeId: 'u2' });
+  const byId = Object.fromEntries(rollups.assignees(1).map(a => [a.assigneeId, a]));
+  assert.deepStrictEqual([byId.u1.created, byId.u1.completed], [0, 0]);
+  assert.deepStrictEqual([byId.u2.created, byId.u2.completed], [1, 1]);
+});
+
+test('deleting a task takes back its creation and completion', () => {
+  const task = { id: 't4', status: 'TODO', createdAt: Date.now(), updatedAt: Date.now() };
+  db.data.tasks.push(task);
+  rollups.recordCreated(task);
+  patch(task, { status: 'DONE' });
+  db.data.tasks = db.data.tasks.filter(t => t.id !== task.id);
+  rollups.recordDeleted(task);
+  assert.deepStrictEqual([today().created, today().completed, today().leadTimeMs], [0, 0, 0]);
+});
+
+test('a backfill is written to the data file', async () => {
+  const now = Date.now();
+  db.data.tasks = [
+    { id: 'a', status: 'TODO', createdAt: now, updatedAt: now },
+    { id: 'b', status: 'DONE', createdAt: now - 1000, updatedAt: now }
+  ];
+  delete db.data.rollups;
+  db.write('tasks', 'rollups');
+
+  assert.deepStrictEqual([today().created, today().completed], [2, 1]);
+  await rollups.saveBackfill();
+  const saved = JSON.parse(fs.readFileSync(db.path, 'utf8'));
+  assert.ok(saved.rollups && saved.rollups.days);
+  assert.strictEqual(Object.values(saved.rollups.days).reduce((n, d) => n + d.created, 0), 2);
+});
@@ -0,0 +1,41 @@
+// backend/test/snapshot.test.js — snapshot locking and restore safety
+const test = require('node:test');
+const assert = require('node:assert');
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+
+const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'snapshot-'));
+process.env.DB_PATH = path.join(dir, 'db.json');
+process.env.SNAPSHOT_DIR = path.join(dir, 'snapshots');
+fs.writeFileSync(process.env.DB_PATH, JSON.stringify({ users: [], tasks: [{ id: 't1' }] }));
+const snapshot = require('../snapshot');
+
+test('a live backend on the target file blocks restore', () => {
+  const m = snapshot.create('first');
+  fs.writeFileSync(`${process.env.DB_PATH}.pid`, String(process.ppid));
+  try {
+    assert.throws(() => snapshot.restore(m.id), /stop it before restoring/);
+    const other = path.join(dir, 'copy.json');
+    assert.strictEqual(snapshot.restore(m.id, other).target, other);
+  } finally {
+    fs.rmSync(`${process.env.DB_PATH}.pid`, { force: true });
+  }
+  // a pid file left by a backend that is gone does not count
+  fs.writeFileSync(`${process.env.DB_PATH}.pid`, '999999');
+  try {
+    assert.ok(snapshot.restore(m.id).backup);
+  } finally {
+    fs.rmSync(`${process.env.DB_PATH}.pid`, { force: true });
+  }
+});
+
+test('prune takes over a lock left by a dead process and keeps used blobs', () => {
+  fs.writeFileSync(path.join(snapshot.dir, '.lock'), '999999');
+  fs.writeFileSync(path.join(snapshot.dir, 'blobs', 'orphan.json.gz'), '');
+  const result = snapshot.prune(1);
+  assert.ok(result.blobs >= 1);
+  assert.ok(!fs.existsSync(path.join(snapshot.dir, '.lock')));
+  const [kept] = snapshot.list();
+  assert.deepStrictEqual(snapshot.verify(kept.id), []);
+});
@@ -0,0 +1,109 @@
+// backend/workload.js — per-assignee open-task counters, updated as tasks change
+const db = require('./db');
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+// first index in a sorted array whose value is >= x
+function lowerBound(arr, x) {
+  let lo = 0, hi = arr.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (arr[mid] < x) lo = mid + 1; else hi = mid;
+  }
+  return lo;
+}
+
+function isOpen(task) {
+  return task && task.status !== 'DONE';
+}
+
+// Counters live in memory only and are kept current by apply(). When db.read() loads a
+// new copy of the data file (another process wrote it), only the tasks its write log
+// names are re-counted; they are rebuilt in one pass when the log can't say.
+const workload = {
+  source: null,
+  at: null,              // db.position() the counters reflect
+  counters: new Map(),
+  counted: new Map(),    // task id -> the fields it was counted with
+  ensure() {
+    db.read();
+    if (this.source !== db.data) {
+      const changed = db.changesSince(this.at, 'tasks');
+      if (changed) {
+        changed.forEach(id => this.forget(id));
+        if (changed.size) db.data.tasks.forEach(t => changed.has(t.id) && this.add(t));
+      } else {
+        this.counters = new Map();
+        this.counted = new Map();
+        db.data.tasks.forEach(t => this.add(t));
+      }
+      this.source = db.data;
+    }
+    this.at = db.position();
+    return this.counters;
+  },
+  entry(assigneeId) {
+    const key = assigneeId || 'unassigned';
+    let c = this.counters.get(key);
+    if (!c) {
+      // createdSum lets avg age be computed as now - createdSum / open; dueDates stays sorted
+      c = { open: 0, inProgress: 0, createdSum: 0, dueDates: [] };
+      this.counters.set(key, c);
+    }
+    return c;
+  },
+  add(task) {
+    this.forget(task.id);
+    if (!isOpen(task)) return;
+    this.counted.set(task.id, {
+      assigneeId: task.assigneeId, status: task.status, createdAt: task.createdAt, dueDate: task.dueDate
+    });
+    const c = this.entry(task.assigneeId);
+    c.open += 1;
+    if (task.status === 'IN_PROGRESS') c.inProgress += 1;
+    c.createdSum += task.createdAt || 0;
+    if (task.dueDate) c.dueDates.splice(lowerBound(c.dueDates, task.dueDate), 0, task.dueDate);
+  },
+  // take a task out of the counters, using the fields it was counted with
+  forget(id) {
+    const task = this.counted.get(id);
+    if (!task) return;
+    this.counted.delete(id);
+    const key = task.assigneeId || 'unassigned';
+    const c = this.counters.get(key);
+    if (!c) return;
+    c.open -= 1;
+    if (task.status === 'IN_PROGRESS') c.inProgress -= 1;
+    c.createdSum -= task.createdAt || 0;
+    if (task.dueDate) {
+      const i = lowerBound(c.dueDates, task.dueDate);
+      if (c.dueDates[i] === task.dueDate) c.dueDates.splice(i, 1);
+    }
+    if (c.open <= 0) this.counters.delete(key);
+  },
+  // Call after changing db.data.tasks in memory. before/after are copies of the task around
+  // the change; either may be null (create/delete). Safe to repeat for the same task.
+  apply(before, after) {
+    this.ensure();
+    if (before) this.forget(before.id);
+    if (after) this.add(after);
+  },
+  // one row per assignee with open work; overdue and age are evaluated at `now`
+  snapshot(now = Date.now()) {
+    const rows = [];
+    this.ensure().forEach((c, assigneeId) => {
+      rows.push({
+        assigneeId,
+        open: c.open,
+        todo: c.open - c.inProgress,
+        inProgress: c.inProgress,
+        overdue: lowerBound(c.dueDates, now),
+        dueThisWeek: lowerBound(c.dueDates, now + 7 * DAY_MS) - lowerBound(c.dueDates, now),
+        avgAgeDays: c.open ? (now - c.createdSum / c.open) / DAY_MS : 0
+      });
+    });
+    return rows;
+  }
+};
+
+module.exports = workload;
@@ -0,0 +1,4 @@
+"""TaskFlow benchmark suite: synthetic datasets, API load tests and offline page transform timings.
+
+Run ``python -m bench --help`` from the repository root.
+"""
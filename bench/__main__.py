@@ -0,0 +1,133 @@
+"""Command line entry point: python -m bench {generate,load,transforms,startup,all,compare}."""
+import argparse
+import json
+import os
+import shutil
+import sys
+
+from . import datagen, loadtest, startup, stats, transforms
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def _dataset_path(tier):
+    return os.path.join(DATA_DIR, f"{tier}.json")
+
+
+def cmd_generate(args):
+    os.makedirs(os.path.dirname(os.path.abspath(args.out or _dataset_path(args.tier))), exist_ok=True)
+    path = args.out or _dataset_path(args.tier)
+    counts = datagen.write_dataset(args.tier, path, args.seed)
+    print(f"wrote {path}: " + ", ".join(f"{n} {name}" for name, n in counts.items()))
+    return path
+
+
+def _run_load(args):
+    if args.api:
+        return loadtest.run(args.api, args.users, args.duration, args.seed)
+    dataset = args.dataset or _dataset_path(args.tier)
+    if not os.path.exists(dataset):
+        datagen.write_dataset(args.tier, dataset, args.seed)
+    proc, scratch = loadtest.start_backend(dataset, args.port, args.workers)
+    try:
+        result = loadtest.run(f"http://localhost:{args.port}/api", args.users, args.duration, args.seed, proc.pid)
+        result["config"]["tier"] = args.tier
+        result["config"]["workers"] = args.workers
+        return result
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def cmd_load(args):
+    stats.write_baseline({"load": _run_load(args)}, args.out)
+
+
+def cmd_transforms(args):
+    stats.write_baseline(transforms.run(args.tier, args.repeat, args.seed), args.out)
+
+
+def cmd_startup(args):
+    stats.write_baseline(startup.run(args.repeat), args.out)
+
+
+def cmd_all(args):
+    os.makedirs(DATA_DIR, exist_ok=True)
+    result = {"tier": args.tier, "load": _run_load(args)}
+    result.update(transforms.run(args.tier, args.repeat, args.seed))
+    result.update(startup.run(args.repeat))
+    stats.write_baseline(result, args.out)
+
+
+def cmd_compare(args):
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+    rows, regressions = stats.compare(baseline, current, args.threshold)
+    print(f"{'measurement':<48} {'base p95':>10} {'cur p95':>10} {'change':>8}")
+    for name, before, after, change in rows:
+        flag = "  <-- regression" if (name, before, after, change) in regressions else ""
+        print(f"{name:<48} {before:>10.2f} {after:>10.2f} {change:>7.1f}%{flag}")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench", description=__doc__)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def common(p, out=True):
+        p.add_argument("--tier", choices=sorted(datagen.TIERS), default="1k")
+        p.add_argument("--seed", type=int, default=42)
+        if out:
+            p.add_argument("--out", default="-", help="result JSON path ('-' for stdout)")
+
+    def load_opts(p):
+        p.add_argument("--api", help="benchmark an already running backend instead of starting one")
+        p.add_argument("--dataset", help="db.json to serve (default: bench/data/<tier>.json, generated if missing)")
+        p.add_argument("--port", type=int, default=4400)
+        p.add_argument("--users", type=int, default=20, help="concurrent simulated users")
+        p.add_argument("--duration", type=float, default=30, help="seconds of load")
+        p.add_argument("--workers", type=int, default=0,
+                       help="run cluster.js with this many worker processes (default: single-process server.js)")
+
+    p = sub.add_parser("generate", help="write a synthetic db.json for a tier")
+    common(p, out=False)
+    p.add_argument("--out", help="output path (default: bench/data/<tier>.json)")
+    p.set_defaults(func=cmd_generate)
+
+    p = sub.add_parser("load", help="concurrent API load test")
+    common(p)
+    load_opts(p)
+    p.set_defaults(func=cmd_load)
+
+    p = sub.add_parser("transforms", help="time app.py page data transforms offline")
+    common(p)
+    p.add_argument("--repeat", type=int, default=5)
+    p.set_defaults(func=cmd_transforms)
+
+    p = sub.add_parser("startup", help="cold import times of app.py and its dependencies")
+    p.add_argument("--out", default="-", help="result JSON path ('-' for stdout)")
+    p.add_argument("--repeat", type=int, default=5)
+    p.set_defaults(func=cmd_startup)
+
+    p = sub.add_parser("all", help="load test, transforms and startup timings for one tier in a single baseline")
+    common(p)
+    load_opts(p)
+    p.add_argument("--repeat", type=int, default=5)
+    p.set_defaults(func=cmd_all)
+
+    p = sub.add_parser("compare", help="compare p95 latencies of two result files")
+    p.add_argument("baseline")
+    p.add_argument("current")
+    p.add_argument("--threshold", type=float, default=10.0, help="allowed p95 increase in percent")
+    p.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args(argv)
+    status = args.func(args)
+    return status if isinstance(status, int) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
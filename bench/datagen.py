@@ -0,0 +1,126 @@
+"""Synthetic db.json datasets at fixed scale tiers.
+
+Output is deterministic for a given tier and seed, so two benchmark runs on the
+same tier see identical data. Every generated user can log in with
+BENCH_PASSWORD.
+"""
+import json
+import random
+import string
+
+BENCH_PASSWORD = "Bench@123"
+# bcryptjs hash (cost 8) of BENCH_PASSWORD, shared by all users so generation stays fast
+BENCH_PASSWORD_HASH = "$2a$08$gFt1bBTLG0eITl8K9d4eGu0RR2wXnTolbYCfjmTpBIVUNXCN8s3Du"
+
+TIERS = {
+    "1k": {"users": 50, "tasks": 1_000, "messages": 500, "audit": 2_000, "files": 20},
+    "100k": {"users": 2_000, "tasks": 100_000, "messages": 50_000, "audit": 200_000, "files": 500},
+    "1m": {"users": 10_000, "tasks": 1_000_000, "messages": 250_000, "audit": 1_000_000, "files": 1_000},
+}
+
+STATUSES = ("TODO", "IN_PROGRESS", "DONE")
+AUDIT_ACTIONS = ("CREATE_MESSAGE", "UPLOAD_FILE", "CREATE_USER", "DELETE_USER", "EMPLOYEE_SIGNUP")
+WORDS = ("review", "deploy", "design", "schema", "report", "fix", "update", "client", "invoice",
+         "release", "audit", "meeting", "draft", "migrate", "test", "backend", "frontend", "budget")
+DAY_MS = 24 * 60 * 60 * 1000
+HISTORY_DAYS = 180
+
+
+def _id(rng):
+    return "".join(rng.choice(string.ascii_letters + string.digits + "_-") for _ in range(21))
+
+
+def _text(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def admin_email():
+    return "bench-admin@local"
+
+
+def manager_email(i=0):
+    return f"bench-manager{i}@local"
+
+
+def employee_email(i=0):
+    return f"bench-employee{i}@local"
+
+
+def generate(tier, seed=42, now_ms=1_760_000_000_000):
+    """Yield (collection, records) pairs for the tier; records is a generator to keep memory flat"""
+    sizes = TIERS[tier]
+    rng = random.Random(seed)
+    users = []
+    n_managers = max(1, sizes["users"] // 20)
+    for i in range(sizes["users"]):
+        if i == 0:
+            role, email = "ADMIN", admin_email()
+        elif i <= n_managers:
+            role, email = "MANAGER", manager_email(i - 1)
+        else:
+            role, email = "EMPLOYEE", employee_email(i - 1 - n_managers)
+        users.append({"id": _id(rng), "email": email, "password": BENCH_PASSWORD_HASH,
+                      "fullName": f"{role.title()} {i}", "role": role,
+                      "createdAt": now_ms - rng.randint(0, HISTORY_DAYS) * DAY_MS})
+    user_ids = [u["id"] for u in users]
+    manager_ids = [u["id"] for u in users if u["role"] != "EMPLOYEE"]
+
+    def tasks():
+        for _ in range(sizes["tasks"]):
+            created = now_ms - rng.randint(0, HISTORY_DAYS * DAY_MS)
+            status = rng.choice(STATUSES)
+            yield {"id": _id(rng), "title": _text(rng, 3), "description": _text(rng, 12),
+                   "assigneeId": rng.choice(user_ids) if rng.random() < 0.9 else None,
+                   "status": status, "priority": rng.randint(1, 5),
+                   "dueDate": created + rng.randint(1, 30) * DAY_MS if rng.random() < 0.7 else None,
+                   "createdBy": rng.choice(manager_ids), "createdAt": created,
+                   "updatedAt": created + (rng.randint(0, 10) * DAY_MS if status != "TODO" else 0)}
+
+    def messages():
+        for _ in range(sizes["messages"]):
+            yield {"id": _id(rng), "taskId": "", "text": _text(rng, 15),
+                   "userId": rng.choice(user_ids), "createdAt": now_ms - rng.randint(0, HISTORY_DAYS * DAY_MS)}
+
+    def files():
+        for _ in range(sizes["files"]):
+            created = now_ms - rng.randint(0, HISTORY_DAYS * DAY_MS)
+            content = "QmVuY2htYXJrIGZpbGUgY29udGVudA=="
+            yield {"id": _id(rng), "name": f"{rng.choice(WORDS)}-{rng.randint(1, 999)}.txt",
+                   "contentBase64": content, "versions": [{"ver": 1, "contentBase64": content, "uploadedAt": created}],
+                   "uploadedBy": rng.choice(user_ids), "createdAt": created}
+
+    def audit():
+        start = now_ms - HISTORY_DAYS * DAY_MS
+        step = max(1, (HISTORY_DAYS * DAY_MS) // max(1, sizes["audit"]))
+        for i in range(sizes["audit"]):
+            yield {"id": _id(rng), "action": rng.choice(AUDIT_ACTIONS), "by": rng.choice(user_ids),
+                   "target": rng.choice(user_ids), "at": start + i * step}
+
+    yield "users", iter(users)
+    yield "tasks", tasks()
+    yield "files", files()
+    yield "messages", messages()
+    yield "audit", audit()
+
+
+def load_in_memory(tier, seed=42):
+    """Return the tier as a plain dict of lists (for offline transform benchmarks)"""
+    return {name: list(records) for name, records in generate(tier, seed)}
+
+
+def write_dataset(tier, path, seed=42):
+    """Stream the tier to path as db.json; returns per-collection record counts"""
+    counts = {}
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("{")
+        for i, (name, records) in enumerate(generate(tier, seed)):
+            f.write(("," if i else "") + json.dumps(name) + ":[")
+            n = 0
+            for record in records:
+                f.write(("," if n else "") + json.dumps(record, separators=(",", ":")))
+                n += 1
+            f.write("]")
+            counts[name] = n
+        f.write(',"_meta":' + json.dumps({"epoch": f"bench{tier}{seed}", "versions": {}}))
+        f.write("}")
+    return counts
@@ -0,0 +1,272 @@
+"""Concurrent simulated users driving the API endpoints app.py uses.
+
+Each virtual user logs in once and then repeatedly "opens" a page, issuing the
+same requests the Streamlit page would (including If-None-Match revalidation
+and compact, compressed responses). Latencies are recorded per endpoint and per
+page load.
+"""
+import os
+import random
+import resource
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+import requests
+
+from . import datagen
+from .stats import summarize
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+
+# page -> (roles allowed, requests issued); mirrors the *_page functions in app.py
+PAGES = {
+    "dashboard": (("ADMIN", "MANAGER", "EMPLOYEE"), [("GET", "/dashboard/view"), ("GET", "/dashboard/workload"),
+                                                   ("GET", "/dashboard/due?limit=10"), ("LOOKUP", "/users/lookup")]),
+    "tasks": (("ADMIN", "MANAGER", "EMPLOYEE"), [("GET", "/tasks"), ("LOOKUP", "/users/lookup")]),
+    "files": (("ADMIN", "MANAGER", "EMPLOYEE"), [("GET", "/files")]),
+    "messages": (("ADMIN", "MANAGER", "EMPLOYEE"), [("GET", "/messages"), ("LOOKUP", "/users/lookup")]),
+    "reports": (("ADMIN", "MANAGER", "EMPLOYEE"), [("GET", "/reports/trends?days=30"), ("GET", "/tasks"),
+                                                 ("GET", "/dashboard/summary")]),
+    # the Export Reports buttons: queue a CSV job, poll the job list until it is done, fetch the file
+    "export": (("ADMIN", "MANAGER", "EMPLOYEE"), [("EXPORT", "/jobs")]),
+    "employees": (("ADMIN", "MANAGER"), [("GET", "/users")]),
+    # the last AUDIT_DAYS at the default page size, then "Older" once when the page says there is more
+    "audit": (("ADMIN",), [("AUDIT", "/audit"), ("LOOKUP", "/users/lookup")]),
+    # the Start/Done buttons on the dashboard; the writes make workers re-read the data file
+    "task_status": (("ADMIN", "MANAGER", "EMPLOYEE"), [("STATUS", "/tasks/:id")]),
+}
+# requests a page only issues for some roles (the manager dashboard alone shows workload)
+REQUEST_ROLES = {"/dashboard/workload": ("MANAGER",), "/reports/trends?days=30": ("ADMIN", "MANAGER"),
+                 "/dashboard/summary": ("ADMIN", "MANAGER")}
+JOB_POLL_SECONDS = 2  # app.py polls running exports this often
+JOB_WAIT_SECONDS = 60
+AUDIT_DAYS = 7  # app.py's AUDIT_DEFAULT_DAYS
+AUDIT_LIMIT = 100
+PAGE_WEIGHTS = {"dashboard": 5, "tasks": 3, "files": 1, "messages": 2, "reports": 1, "employees": 1, "audit": 1,
+                "task_status": 1, "export": 1}
+
+
+class VirtualUser(threading.Thread):
+    def __init__(self, api, email, password, deadline, seed, samples, lock):
+        super().__init__(daemon=True)
+        self.api = api
+        self.email = email
+        self.password = password
+        self.deadline = deadline
+        self.rng = random.Random(seed)
+        self.samples = samples
+        self.lock = lock
+        self.session = requests.Session()
+        self.session.headers.update({"Accept-Encoding": "gzip", "X-Response-Mode": "compact"})
+        self.etags = {}
+        self.user_ids = []
+        self.task_ids = []
+        self.audit_next = None
+
+    def _record(self, name, status, seconds):
+        with self.lock:
+            self.samples["requests"].append((name, status, seconds))
+
+    def _timed(self, name, method, url, **kwargs):
+        start = time.perf_counter()
+        response = self.session.request(method, url, timeout=60, **kwargs)
+        self._record(name, response.status_code, time.perf_counter() - start)
+        return response
+
+    def _export(self):
+        response = self._timed("POST /jobs", "POST", self.api + "/jobs", json={"kind": "tasks", "format": "csv"})
+        if response.status_code != 202:
+            return
+        job_id = response.json()["id"]
+        give_up = time.time() + JOB_WAIT_SECONDS
+        while time.time() < min(give_up, self.deadline):
+            time.sleep(JOB_POLL_SECONDS)
+            jobs = self._timed("GET /jobs", "GET", self.api + "/jobs").json()
+            status = next((j.get("status") for j in jobs if j.get("id") == job_id), None)
+            if status == "done":
+                self._timed("GET /jobs/:id/download", "GET", f"{self.api}/jobs/{job_id}/download").content
+                return
+            if status not in ("queued", "running"):
+                return
+
+    def _audit(self):
+        today = datetime.now().date()
+        start = datetime.combine(today - timedelta(days=AUDIT_DAYS), datetime.min.time())
+        end = datetime.combine(today, datetime.max.time())
+        query = f"/audit?from={int(start.timestamp() * 1000)}&to={int(end.timestamp() * 1000)}&limit={AUDIT_LIMIT}"
+        headers = {"If-None-Match": self.etags[query]} if query in self.etags else {}
+        response = self._timed("GET /audit?from&to&limit", "GET", self.api + query, headers=headers)
+        if response.status_code == 200:
+            response.json()
+            # the range moves with the day, so only the current query's ETag is worth keeping
+            self.etags = {k: v for k, v in self.etags.items() if not k.startswith("/audit?")}
+            if response.headers.get("ETag"):
+                self.etags[query] = response.headers["ETag"]
+            self.audit_next = response.headers.get("X-Audit-Next-Before")
+        elif response.status_code != 304:
+            return
+        if self.audit_next:
+            self._timed("GET /audit?from&to&limit&before", "GET", f"{self.api}{query}&before={self.audit_next}").json()
+
+    def _request(self, method, endpoint):
+        if method == "EXPORT":
+            return self._export()
+        if method == "AUDIT":
+            return self._audit()
+        headers = {}
+        start = time.perf_counter()
+        if method == "LOOKUP":
+            ids = self.rng.sample(self.user_ids, min(len(self.user_ids), 50)) if self.user_ids else []
+            response = self.session.post(self.api + endpoint, json={"ids": ids}, timeout=60)
+        elif method == "STATUS":
+            if not self.task_ids:
+                return
+            task_id = self.rng.choice(self.task_ids)
+            response = self.session.patch(f"{self.api}/tasks/{task_id}", timeout=60,
+                                          json={"status": self.rng.choice(["TODO", "IN_PROGRESS", "DONE"])})
+        else:
+            if endpoint in self.etags:
+                headers["If-None-Match"] = self.etags[endpoint]
+            response = self.session.request(method, self.api + endpoint, headers=headers, timeout=60)
+            if response.status_code == 200 and response.headers.get("ETag"):
+                self.etags[endpoint] = response.headers["ETag"]
+                if endpoint == "/users":
+                    self.user_ids = [u["id"] for u in response.json()]
+                elif endpoint == "/dashboard/view":
+                    self.task_ids = [t["id"] for t in response.json().get("recentTasks", [])]
+            elif response.status_code == 200:
+                response.json()
+        label = {"LOOKUP": "POST", "STATUS": "PATCH"}.get(method, method)
+        self._record(f"{label} {endpoint}", response.status_code, time.perf_counter() - start)
+
+    def run(self):
+        response = self.session.post(self.api + "/auth/login",
+                                     json={"email": self.email, "password": self.password}, timeout=60)
+        response.raise_for_status()
+        login = response.json()
+        self.session.headers["Authorization"] = f"Bearer {login['token']}"
+        role = login["user"]["role"]
+        pages = [p for p, (roles, _) in PAGES.items() if role in roles]
+        weights = [PAGE_WEIGHTS[p] for p in pages]
+        while time.time() < self.deadline:
+            page = self.rng.choices(pages, weights)[0]
+            start = time.perf_counter()
+            try:
+                for method, endpoint in PAGES[page][1]:
+                    if role not in REQUEST_ROLES.get(endpoint, (role,)):
+                        continue
+                    self._request(method, endpoint)
+            except requests.RequestException:
+                with self.lock:
+                    self.samples["requests"].append((page, "error", time.perf_counter() - start))
+                continue
+            with self.lock:
+                self.samples["pages"].append((page, time.perf_counter() - start))
+
+
+def _rss_mb(pid, field="VmRSS"):
+    """Memory of pid plus its child processes (the workers of a clustered backend)"""
+    total = None
+    for p in [pid] + _children(pid):
+        try:
+            with open(f"/proc/{p}/status", encoding="utf-8") as f:
+                for line in f:
+                    if line.startswith(field + ":"):
+                        total = (total or 0.0) + int(line.split()[1]) / 1024
+        except OSError:
+            pass
+    return total
+
+
+def _children(pid):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children", encoding="utf-8") as f:
+            return [int(c) for c in f.read().split()]
+    except OSError:
+        return []
+
+
+def start_backend(dataset, port, workers=0):
+    """Run the backend on a scratch copy of dataset: backend/server.js, or cluster.js with
+    `workers` worker processes when workers > 0. Returns (process, scratch dir)."""
+    scratch = tempfile.mkdtemp(prefix="taskflow-bench-")
+    db_path = os.path.join(scratch, "db.json")
+    shutil.copyfile(dataset, db_path)
+    env = dict(os.environ, DB_PATH=db_path, PORT=str(port))
+    script = "server.js"
+    if workers > 0:
+        env["BACKEND_WORKERS"] = str(workers)
+        script = "cluster.js"
+    proc = subprocess.Popen(["node", script], cwd=BACKEND_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    api = f"http://localhost:{port}/api"
+    for _ in range(600):
+        try:
+            requests.get(api + "/me", timeout=1)
+            return proc, scratch
+        except requests.RequestException:
+            if proc.poll() is not None:
+                raise RuntimeError("backend exited during startup")
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("backend did not start within 60s")
+
+
+def run(api, users=20, duration=30, seed=42, backend_pid=None):
+    """Drive the API with concurrent virtual users and return the summarized results"""
+    n_managers = max(1, users // 5)
+    accounts = [(datagen.admin_email(), datagen.BENCH_PASSWORD)]
+    accounts += [(datagen.manager_email(i), datagen.BENCH_PASSWORD) for i in range(n_managers)]
+    accounts += [(datagen.employee_email(i), datagen.BENCH_PASSWORD) for i in range(users - len(accounts))]
+    accounts = accounts[:users]
+
+    samples = {"requests": [], "pages": []}
+    lock = threading.Lock()
+    peak_backend = [0.0]
+    stop = threading.Event()
+
+    def sample_backend_memory():
+        while not stop.wait(0.2):
+            rss = _rss_mb(backend_pid)
+            if rss:
+                peak_backend[0] = max(peak_backend[0], rss)
+
+    if backend_pid:
+        threading.Thread(target=sample_backend_memory, daemon=True).start()
+
+    deadline = time.time() + duration
+    workers = [VirtualUser(api, email, password, deadline, seed + i, samples, lock)
+               for i, (email, password) in enumerate(accounts)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    wall = time.perf_counter() - start
+    stop.set()
+
+    endpoints, statuses = {}, {}
+    for name, status, seconds in samples["requests"]:
+        endpoints.setdefault(name, []).append(seconds)
+        key = f"{name} {status}"
+        statuses[key] = statuses.get(key, 0) + 1
+    pages = {}
+    for page, seconds in samples["pages"]:
+        pages.setdefault(page, []).append(seconds)
+    errors = sum(count for key, count in statuses.items()
+                 if not key.rsplit(" ", 1)[1].isdigit() or int(key.rsplit(" ", 1)[1]) >= 400)
+    return {
+        "config": {"api": api, "users": len(accounts), "duration_s": duration, "seed": seed},
+        "throughput_rps": round(len(samples["requests"]) / wall, 2) if wall else 0.0,
+        "page_loads_per_s": round(len(samples["pages"]) / wall, 2) if wall else 0.0,
+        "errors": errors,
+        "endpoints": {name: summarize(values) for name, values in sorted(endpoints.items())},
+        "pages": {page: summarize(values) for page, values in sorted(pages.items())},
+        "statuses": dict(sorted(statuses.items())),
+        "backend_peak_rss_mb": round(max(peak_backend[0], _rss_mb(backend_pid, "VmHWM") or 0.0), 1) if backend_pid else None,
+        "client_peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
@@ -0,0 +1,31 @@
+"""Cold-start import costs, each measured in a fresh interpreter."""
+import os
+import subprocess
+import sys
+
+from .stats import summarize
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# what a fresh Streamlit server pays before the login page can render, and the
+# heavy libraries app.py now defers to the pages that chart or tabulate
+STATEMENTS = {
+    "import requests": "import requests",
+    "import streamlit": "import streamlit",
+    "import pandas": "import pandas",
+    "import plotly.express": "import plotly.express",
+    "import app": "import logging; logging.disable(logging.WARNING); import app",
+}
+
+
+def _time_statement(statement):
+    code = f"import time; t = time.perf_counter(); {statement}; print(time.perf_counter() - t)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True,
+                         timeout=300, check=True).stdout
+    return float(out.strip().splitlines()[-1])
+
+
+def run(repeat=5):
+    results = {name: summarize([_time_statement(stmt) for _ in range(repeat)])
+               for name, stmt in STATEMENTS.items()}
+    return {"startup": results}
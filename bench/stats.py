@@ -0,0 +1,75 @@
+"""Latency statistics, baseline files and run-to-run comparison."""
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def summarize(seconds):
+    """p50/p95/p99/mean/max in milliseconds for a list of durations in seconds"""
+    return {
+        "count": len(seconds),
+        "p50_ms": round(percentile(seconds, 50) * 1000, 3),
+        "p95_ms": round(percentile(seconds, 95) * 1000, 3),
+        "p99_ms": round(percentile(seconds, 99) * 1000, 3),
+        "mean_ms": round(sum(seconds) / len(seconds) * 1000, 3) if seconds else 0.0,
+        "max_ms": round(max(seconds) * 1000, 3) if seconds else 0.0,
+    }
+
+
+def environment():
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        rev = ""
+    return {"git": rev, "python": platform.python_version(), "platform": platform.platform(),
+            "cpus": os.cpu_count(), "timestamp": int(time.time())}
+
+
+def write_baseline(result, path):
+    result = dict(result, environment=environment())
+    if path == "-":
+        json.dump(result, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    return result
+
+
+def _latency_entries(result, prefix=""):
+    """Flatten every dict holding a p95_ms into {dotted.name: entry}"""
+    found = {}
+    for key, value in result.items():
+        if isinstance(value, dict):
+            name = f"{prefix}{key}"
+            if "p95_ms" in value:
+                found[name] = value
+            else:
+                found.update(_latency_entries(value, name + "."))
+    return found
+
+
+def compare(baseline, current, threshold_pct):
+    """Return (rows, regressions) comparing p95 latency of every shared measurement"""
+    base = _latency_entries(baseline)
+    cur = _latency_entries(current)
+    rows, regressions = [], []
+    for name in sorted(set(base) & set(cur)):
+        before, after = base[name]["p95_ms"], cur[name]["p95_ms"]
+        change = ((after - before) / before * 100) if before else 0.0
+        row = (name, before, after, change)
+        rows.append(row)
+        if change > threshold_pct:
+            regressions.append(row)
+    return rows, regressions
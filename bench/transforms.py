@@ -0,0 +1,74 @@
+"""Offline timings of the pure-Python page data transforms in app.py.
+
+No backend or Streamlit server is needed: app.py is imported in Streamlit's bare
+mode and its transform functions are fed a synthetic dataset.
+"""
+import gc
+import importlib
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+from . import datagen
+from .stats import summarize
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_app():
+    """Import app.py without running main(), with Streamlit's bare-mode warnings silenced"""
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    logging.disable(logging.WARNING)
+    try:
+        return importlib.import_module("app")
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def cases(app, data):
+    """(name, zero-argument callable) pairs covering the per-page transforms"""
+    files, messages = data["files"], data["messages"]
+    # api_call hands the pages typed records, parsed once per response
+    tasks = app.to_records(data["tasks"], app.TaskRecord)
+    users = app.to_records(data["users"], app.UserRecord)
+    logs = app.to_records(data["audit"], app.AuditRecord)
+    names = {u.id: u.fullName for u in users}
+    summary = {"totalTasks": len(tasks),
+               "byStatus": [{"status": s, "cnt": c} for s, c in app.count_by(tasks, "status").items()],
+               "users": len(users)}
+    return [
+        ("records.parse_tasks", lambda: app.to_records(data["tasks"], app.TaskRecord)),
+        ("dashboard.status_counts", lambda: app.status_counts_from_summary(summary)),
+        ("dashboard.role_counts", lambda: app.count_by(users, "role")),
+        ("dashboard.priority_counts", lambda: app.count_by(tasks, "priority")),
+        ("tasks.filter_and_rows", lambda: app.task_table_rows(
+            [t for t in tasks if t.status in ("TODO", "IN_PROGRESS")], names)),
+        ("reports.status_and_priority", lambda: (app.count_by(tasks, "status"),
+                                                 app.count_by(tasks, "priority"))),
+        ("files.rows", lambda: app.file_table_rows(files)),
+        ("messages.names", lambda: [app.display_name(m.get("userId"), names, "Unknown") for m in reversed(messages)]),
+        ("audit.rows", lambda: app.audit_table_rows(logs, names)),
+    ]
+
+
+def run(tier="1k", repeat=5, seed=42):
+    app = load_app()
+    data = datagen.load_in_memory(tier, seed)
+    results = {}
+    for name, fn in cases(app, data):
+        durations = []
+        gc.collect()
+        tracemalloc.start()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            durations.append(time.perf_counter() - start)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[name] = dict(summarize(durations), peak_alloc_mb=round(peak / (1024 * 1024), 2))
+    return {"config": {"tier": tier, "repeat": repeat, "seed": seed,
+                       "records": {k: len(v) for k, v in data.items()}},
+            "transforms": results}
@@ -0,0 +1,5 @@
+# Tests import app.py directly; outside `streamlit run` it loads in bare mode
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,77 @@
+import time
+
+import pytest
+
+import app
+
+
+@pytest.fixture(autouse=True)
+def closed_breaker():
+    breaker = app._breaker()
+    breaker.update(state="closed", failures=0, opened_at=0.0, probing=False)
+    yield breaker
+
+
+def fail(times):
+    for _ in range(times):
+        assert app.breaker_allow()
+        app.breaker_record(False)
+
+
+def half_open(breaker):
+    fail(app.BREAKER_FAILURE_THRESHOLD)
+    breaker["opened_at"] = time.time() - app.BREAKER_COOLDOWN
+    assert app.breaker_allow()  # the probe
+    assert breaker["state"] == "half_open"
+
+
+def test_opens_after_threshold_failures(closed_breaker):
+    fail(app.BREAKER_FAILURE_THRESHOLD - 1)
+    assert closed_breaker["state"] == "closed"
+    fail(1)
+    assert closed_breaker["state"] == "open"
+    assert not app.breaker_allow()
+
+
+def test_success_resets_failure_count(closed_breaker):
+    fail(app.BREAKER_FAILURE_THRESHOLD - 1)
+    app.breaker_record(app.breaker_succeeded(200))
+    fail(app.BREAKER_FAILURE_THRESHOLD - 1)
+    assert closed_breaker["state"] == "closed"
+
+
+def test_half_open_lets_one_probe_through(closed_breaker):
+    half_open(closed_breaker)
+    assert not app.breaker_allow()
+
+
+@pytest.mark.parametrize("status", [200, 204, 304])
+def test_probe_success_closes(closed_breaker, status):
+    half_open(closed_breaker)
+    app.breaker_record(app.breaker_succeeded(status))
+    assert closed_breaker["state"] == "closed"
+    assert app.breaker_allow()
+
+
+@pytest.mark.parametrize("status", [404, 500, 503])
+def test_probe_refused_reopens(closed_breaker, status):
+    half_open(closed_breaker)
+    app.breaker_record(app.breaker_succeeded(status))
+    assert closed_breaker["state"] == "open"
+    assert not app.breaker_allow()
+
+
+def test_client_errors_count_as_success_when_closed():
+    assert app.breaker_succeeded(404)
+    assert app.breaker_succeeded(409)
+    assert not app.breaker_succeeded(500)
+    assert not app.breaker_succeeded(502)
+
+
+def test_page_budget_nests():
+    with app.page_budget():
+        outer = app._budget_left()
+        with app.page_budget():
+            assert app._budget_left() <= outer
+        assert app._budget_left() is not None
+    assert app._budget_left() is None
@@ -0,0 +1,42 @@
+import os
+
+import pytest
+
+import app
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(app, "DISK_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(app, "DISK_CACHE_ENABLED", True)
+    app._disk_cache_usage().update(bytes=None, puts=0)
+    app.st.session_state.user = {"id": "u1"}
+    yield tmp_path
+    app._disk_cache_usage().update(bytes=None, puts=0)
+
+
+def test_scans_only_on_the_first_put_and_every_n(cache_dir, monkeypatch):
+    scans = []
+    evict = app._disk_cache_evict
+    monkeypatch.setattr(app, "_disk_cache_evict", lambda: scans.append(1) or evict())
+    for i in range(app.DISK_CACHE_SCAN_EVERY + 1):
+        app.disk_cache_put("/tasks", f'"v{i}"', [])
+    assert len(scans) == 2
+
+
+def test_evicts_once_the_tracked_size_crosses_the_cap(cache_dir, monkeypatch):
+    app.disk_cache_put("/tasks", '"v1"', ["x" * 100])
+    monkeypatch.setattr(app, "DISK_CACHE_MAX_BYTES", 300)
+    app.disk_cache_put("/users", '"v1"', ["y" * 100])
+    assert len(os.listdir(cache_dir)) == 1
+    assert app._disk_cache_usage()["bytes"] <= 300
+
+
+def test_logout_forgets_only_that_users_entries(cache_dir):
+    app.disk_cache_put("/tasks", '"v1"', [])
+    app.st.session_state.user = {"id": "u2"}
+    app.disk_cache_put("/tasks", '"v1"', [])
+    app.disk_cache_forget_user()
+    assert app.disk_cache_get("/tasks") is None
+    app.st.session_state.user = {"id": "u1"}
+    assert app.disk_cache_get("/tasks")["etag"] == '"v1"'
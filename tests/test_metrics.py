@@ -0,0 +1,18 @@
+import app
+
+
+def test_label_values_are_escaped():
+    labels = app._prom_labels(endpoint='/a\\b"c\nd', status=200)
+    assert labels == 'endpoint="/a\\\\b\\"c\\nd",status="200"'
+
+
+def test_exposition_keeps_one_sample_per_line():
+    app.record_request("GET", '/search?q=x', 'weird"\nstatus', {"dns_connect": 0.0, "ttfb": 0.01, "download": 0.0,
+                                                               "parse": 0.0, "total": 0.01})
+    text = app.metrics_prometheus_text()
+    sample = [line for line in text.splitlines() if 'status="weird' in line]
+    assert sample == ['taskflow_api_requests_total{method="GET",endpoint="/search",status="weird\\"\\nstatus"} 1']
+
+
+def test_endpoints_are_normalized():
+    assert app.normalize_endpoint("/tasks/abcdefghijklmnopqrstu?x=1") == "/tasks/:id"
@@ -0,0 +1,49 @@
+import pytest
+
+import app
+
+
+def patch(key, task_id, base, status):
+    return {"key": key, "method": "PATCH", "endpoint": f"/tasks/{task_id}", "label": "status",
+            "data": {"status": status, "baseUpdatedAt": base}, "queuedAt": 0}
+
+
+def test_rebase_moves_later_edits_of_the_same_version():
+    sent = patch("a", "t1", 100, "IN_PROGRESS")
+    later = [patch("b", "t1", 100, "DONE"), patch("c", "t2", 100, "DONE"), patch("d", "t1", 50, "TODO")]
+    app._rebase_queued(later, sent, {"id": "t1", "updatedAt": 200})
+    assert [op["data"]["baseUpdatedAt"] for op in later] == [200, 100, 50]
+
+
+def test_rebase_ignores_answers_without_a_version():
+    sent = patch("a", "t1", 100, "IN_PROGRESS")
+    later = [patch("b", "t1", 100, "DONE")]
+    app._rebase_queued(later, sent, None)
+    app._rebase_queued(later, dict(sent, method="POST"), {"updatedAt": 200})
+    assert later[0]["data"]["baseUpdatedAt"] == 100
+
+
+@pytest.fixture
+def outbox(tmp_path, monkeypatch):
+    monkeypatch.setattr(app, "OUTBOX_DIR", str(tmp_path))
+    app.st.session_state.user = {"id": "u1"}
+    sent = []
+
+    def send(op):
+        sent.append(dict(op["data"]))
+        if op["data"]["baseUpdatedAt"] != len(sent) * 100:
+            return "conflict", {"error": "changed"}
+        return "sent", {"updatedAt": (len(sent) + 1) * 100}
+
+    monkeypatch.setattr(app, "_send_queued", send)
+    yield sent
+
+
+def test_flush_replays_queued_edits_of_one_task_without_conflicts(outbox):
+    path = app._outbox_path()
+    app._outbox_save(path, {"ops": [patch("a", "t1", 100, "IN_PROGRESS"), patch("b", "t1", 100, "DONE")],
+                            "failed": []})
+    done = app.flush_outbox(force=True)
+    assert done == {"a": ("sent", {"updatedAt": 200}), "b": ("sent", {"updatedAt": 300})}
+    assert [d["baseUpdatedAt"] for d in outbox] == [100, 200]
+    assert app.outbox_state() == {"ops": [], "failed": []}
@@ -0,0 +1,18 @@
+import app
+
+
+BODY = [{"id": "t1", "title": "Write docs", "status": "TODO", "assigneeId": "u1", "createdAt": 1, "updatedAt": 2}]
+
+
+def test_records_are_shared_per_etag_and_class():
+    first = app.to_records(BODY, app.TaskRecord, "/tasks", '"v1"')
+    assert first is app.to_records(BODY, app.TaskRecord, "/tasks", '"v1"')
+    assert first is not app.to_records(BODY, app.TaskRecord, "/tasks", '"v2"')
+    assert first[0].title == "Write docs"
+
+
+def test_cached_body_stays_json():
+    app.st.session_state.user = {"id": "u1"}
+    app.response_cache_put("/tasks", '"v1"', BODY)
+    app.to_records(app.response_cache_get("/tasks")["body"], app.TaskRecord, "/tasks", '"v1"')
+    assert app.response_cache_get("/tasks")["body"][0] == BODY[0]